@@ -137,12 +137,12 @@ for (( i=0; i<$((NUM_NODES-1)); i++ )); do
     taskset -c $i $GETH_BINARY \
       --pprof \
       --networkid=${CHAIN_ID:-32382} \
-      --http --http.api=eth,net,web3 \
+      --http --http.api=eth,net,web3,txpool \
       --http.addr=0.0.0.0 --http.corsdomain="*" \
       --http.port=$((GETH_HTTP_PORT + i)) \
       --port=$((GETH_NETWORK_PORT + i)) \
       --metrics.port=$((GETH_METRICS_PORT + i)) \
-      --ws --ws.api=eth,net,web3 \
+      --ws --ws.api=eth,net,web3,txpool \
       --ws.addr=0.0.0.0 --ws.origins="*" \
       --ws.port=$((GETH_WS_PORT + i)) \
       --authrpc.vhosts="*" --authrpc.addr=0.0.0.0 \
@@ -227,12 +227,12 @@ for (( i=$((NUM_NODES-1)); i<$NUM_NODES; i++ )); do
     taskset -c $i $GETH_BINARY \
       --pprof \
       --networkid=${CHAIN_ID:-32382} \
-      --http --http.api=eth,net,web3 \
+      --http --http.api=eth,net,web3,txpool \
       --http.addr=0.0.0.0 --http.corsdomain="*" \
       --http.port=$((GETH_HTTP_PORT + i)) \
       --port=$((GETH_NETWORK_PORT + i)) \
       --metrics.port=$((GETH_METRICS_PORT + i)) \
-      --ws --ws.api=eth,net,web3 \
+      --ws --ws.api=eth,net,web3,txpool \
       --ws.addr=0.0.0.0 --ws.origins="*" \
       --ws.port=$((GETH_WS_PORT + i)) \
       --authrpc.vhosts="*" --authrpc.addr=0.0.0.0 \
@@ -1,14 +1,18 @@
 #!/usr/bin/env bash
 set -e
 
-BUILD_DIR="build"
-mkdir -p "${BUILD_DIR}"
-
 # ─── Configuration ───────────────────────────────────────────────────────────
-CIRCUIT="zk_circuit_1"
-PTAU_PREFIX="pot15"
-BUILD_DIR="build"
-CIRCUIT_PATH="circuits/${CIRCUIT}.circom"
+# Usage: ./create_zk_circuit.sh [circuit]
+# Overrides: CIRCUIT_PATH, CIRCUIT_BUILD_DIR, PTAU_POWER, PTAU_DIR, VERIFIER_SOL
+CIRCUIT="${1:-zk_circuit_1}"
+CIRCUIT_PATH="${CIRCUIT_PATH:-circuits/${CIRCUIT}.circom}"
+BUILD_DIR="${CIRCUIT_BUILD_DIR:-build}"
+PTAU_POWER="${PTAU_POWER:-15}"
+PTAU_PREFIX="pot${PTAU_POWER}"
+# Phase-1 output does not depend on the circuit; share it between builds
+PTAU_DIR="${PTAU_DIR:-${BUILD_DIR}}"
+VERIFIER_SOL="${VERIFIER_SOL:-contracts/Verifier.sol}"
+mkdir -p "${BUILD_DIR}" "${PTAU_DIR}"
 
 # ─── 1) Compile the circuit ─────────────────────────────────────────────────
 echo "📐 Compiling ${CIRCUIT_PATH}..."
@@ -18,24 +22,28 @@ circom ${CIRCUIT_PATH} \
   -l node_modules/
 
 # ─── 2) Phase-1: Powers of Tau ───────────────────────────────────────────────
-echo "🔑 Phase-1: Powers of Tau..."
-snarkjs powersoftau new bn128 15 \
-  ${BUILD_DIR}/${PTAU_PREFIX}_0000.ptau -v
+if [ -f "${PTAU_DIR}/${PTAU_PREFIX}_final.ptau" ]; then
+  echo "🔑 Phase-1: reusing ${PTAU_DIR}/${PTAU_PREFIX}_final.ptau"
+else
+  echo "🔑 Phase-1: Powers of Tau..."
+  snarkjs powersoftau new bn128 ${PTAU_POWER} \
+    ${PTAU_DIR}/${PTAU_PREFIX}_0000.ptau -v
 
-snarkjs powersoftau contribute \
-  ${BUILD_DIR}/${PTAU_PREFIX}_0000.ptau \
-  ${BUILD_DIR}/${PTAU_PREFIX}_0001.ptau \
-  --name="DebRC" -v
+  snarkjs powersoftau contribute \
+    ${PTAU_DIR}/${PTAU_PREFIX}_0000.ptau \
+    ${PTAU_DIR}/${PTAU_PREFIX}_0001.ptau \
+    --name="DebRC" -v
 
-snarkjs powersoftau prepare phase2 \
-  ${BUILD_DIR}/${PTAU_PREFIX}_0001.ptau \
-  ${BUILD_DIR}/${PTAU_PREFIX}_final.ptau -v
+  snarkjs powersoftau prepare phase2 \
+    ${PTAU_DIR}/${PTAU_PREFIX}_0001.ptau \
+    ${PTAU_DIR}/${PTAU_PREFIX}_final.ptau -v
+fi
 
 # ─── 3) Phase-2: Groth16 setup ────────────────────────────────────────────────
 echo "🔧 Phase-2: Circuit-specific Groth16 setup..."
 snarkjs groth16 setup \
   ${BUILD_DIR}/${CIRCUIT}.r1cs \
-  ${BUILD_DIR}/${PTAU_PREFIX}_final.ptau \
+  ${PTAU_DIR}/${PTAU_PREFIX}_final.ptau \
   ${BUILD_DIR}/${CIRCUIT}_0000.zkey
 
 snarkjs zkey contribute \
@@ -50,10 +58,10 @@ snarkjs zkey export verificationkey \
   ${BUILD_DIR}/verification_key.json
 
 # ─── 5) Generate Solidity Verifier ───────────────────────────────────────────
-echo "📜 Generating Verifier.sol..."
+echo "📜 Generating ${VERIFIER_SOL}..."
 snarkjs zkey export solidityverifier \
   ${BUILD_DIR}/${CIRCUIT}.zkey \
-  contracts/Verifier.sol
+  ${VERIFIER_SOL}
 
 echo "✅ Done! Artifacts in ${BUILD_DIR}/:"
-ls -1 ${BUILD_DIR}/${CIRCUIT}.* ${BUILD_DIR}/${PTAU_PREFIX}_* ${BUILD_DIR}/verification_key.json
\ No newline at end of file
+ls -1 ${BUILD_DIR}/${CIRCUIT}.* ${PTAU_DIR}/${PTAU_PREFIX}_* ${BUILD_DIR}/verification_key.json
\ No newline at end of file
@@ -0,0 +1,88 @@
+// Long-lived Groth16 prover.
+//
+// Loads the circuit wasm and zkey once, then reads newline-delimited JSON
+// requests from stdin and streams one JSON response per line to stdout:
+//
+//   request  {"id": 7, "input": {"x": "1007"}}      witness computed here
+//   request  {"id": 8, "wtns": "<base64 .wtns>"}     witness computed by caller
+//   response {"id": 7, "proof": {...}, "publicSignals": [...]}
+//   response {"id": 8, "error": "..."}
+//
+// Responses are written as proofs complete, so they may arrive out of order.
+// A single {"ready": true} line is written once the artifacts are loaded.
+//
+// Usage: node prover_daemon.js <circuit.wasm> <circuit.zkey> [concurrency]
+const fs = require('fs');
+const readline = require('readline');
+const snarkjs = require('snarkjs');
+
+const [WASM_PATH, ZKEY_PATH, CONCURRENCY_ARG] = process.argv.slice(2);
+const CONCURRENCY = parseInt(CONCURRENCY_ARG || "1", 10);
+
+if (!WASM_PATH || !ZKEY_PATH) {
+  console.error("Usage: node prover_daemon.js <circuit.wasm> <circuit.zkey> [concurrency]");
+  process.exit(1);
+}
+
+// stdout carries the protocol only, keep library logging off it
+console.log = console.error;
+
+const wasm = { type: "mem", data: new Uint8Array(fs.readFileSync(WASM_PATH)) };
+const zkey = { type: "mem", data: new Uint8Array(fs.readFileSync(ZKEY_PATH)) };
+
+const queue = [];
+let active = 0;
+let closed = false;
+
+function reply(msg) {
+  process.stdout.write(JSON.stringify(msg, (_, v) => typeof v === "bigint" ? v.toString() : v) + "\n");
+}
+
+async function prove(req) {
+  let wtns;
+  if (req.wtns !== undefined) {
+    wtns = { type: "mem", data: new Uint8Array(Buffer.from(req.wtns, "base64")) };
+  } else {
+    wtns = { type: "mem" };
+    await snarkjs.wtns.calculate(req.input, wasm, wtns);
+  }
+  return snarkjs.groth16.prove(zkey, wtns);
+}
+
+function pump() {
+  while (active < CONCURRENCY && queue.length > 0) {
+    const req = queue.shift();
+    active++;
+    prove(req)
+      .then(({ proof, publicSignals }) => reply({ id: req.id, proof, publicSignals }))
+      .catch((err) => reply({ id: req.id, error: err.message || String(err) }))
+      .finally(() => {
+        active--;
+        pump();
+      });
+  }
+  if (closed && active === 0 && queue.length === 0) {
+    process.exit(0);
+  }
+}
+
+const rl = readline.createInterface({ input: process.stdin, crlfDelay: Infinity });
+rl.on('line', (line) => {
+  if (!line.trim()) return;
+  let req;
+  try {
+    req = JSON.parse(line);
+  } catch (err) {
+    reply({ id: null, error: `bad request: ${err.message}` });
+    return;
+  }
+  queue.push(req);
+  pump();
+});
+rl.on('close', () => {
+  closed = true;
+  pump();
+});
+
+console.error(`[PROVER] Loaded ${WASM_PATH} and ${ZKEY_PATH} :: concurrency ${CONCURRENCY}`);
+reply({ ready: true });
@@ -9,7 +9,8 @@ const {
   AbiCoder,
   parseUnits
 } = require('ethers');
-const { execFile } = require('child_process');
+const { execFile, spawn } = require('child_process');
+const readline = require('readline');
 const { promisify } = require('util');
 const { error } = require('console');
 
@@ -17,13 +18,19 @@ const RPC_URL = process.env.RPC_URL;
 const PRIVATE_KEY = process.env.PRIVATE_KEY_2;
 const VORTEX_ADDRESS = process.env.VORTEX_CONTRACT_ADDRESS;
 const VORTEX_ABI = require("../artifacts/contracts/VortexStorage.sol/VortexStorage.json").abi;
-const VERIFICATION_KEY  = path.resolve(__dirname, "../build/verification_key.json");
+const VERIFICATION_KEY  = process.env.VERIFICATION_KEY || path.resolve(__dirname, "../build/verification_key.json");
 
 const FETCH_INTERVAL = 2000;  // ms
 const VERIFY_INTERVAL = 2000;  // ms
 const SUBMIT_INTERVAL = 2000;  // ms
 const DELAY_BLOCKS = 3;     // blocks to wait before submit
 
+// Set BATCH_VERIFY=1 to verify through test/groth16_batch.py (key loaded once,
+// randomized batch check) instead of one `snarkjs groth16 verify` per proof.
+const BATCH_VERIFY = process.env.BATCH_VERIFY === "1";
+const BATCH_VERIFY_SCRIPT = path.resolve(__dirname, "../test/groth16_batch.py");
+const VERIFY_WORKERS = process.env.VERIFY_WORKERS || "1";
+
 const proofs = new Map();
 
 const provider = new JsonRpcProvider(RPC_URL);
@@ -62,10 +69,80 @@ async function fetchProofs() {
   }
 }
 
+function startBatchVerifier() {
+  const proc = spawn(process.env.PYTHON || "python3",
+    [BATCH_VERIFY_SCRIPT, "daemon", VERIFICATION_KEY, "--workers", VERIFY_WORKERS],
+    { cwd: path.dirname(BATCH_VERIFY_SCRIPT), stdio: ["pipe", "pipe", "inherit"] });
+  const pending = new Map();
+  let nextId = 0;
+  let alive = true;
+  let ready, notReady;
+  const started = new Promise((resolve, reject) => { ready = resolve; notReady = reject; });
+  started.catch(() => {});  // awaited per batch; never an unhandled rejection
+  const stop = (reason) => {
+    if (!alive) return;
+    alive = false;
+    console.error("[VERIFY] Batch verifier unavailable ::", reason, ":: falling back to snarkjs");
+    notReady(new Error(reason));
+    for (const req of pending.values()) req.reject(new Error(reason));
+    pending.clear();
+  };
+  readline.createInterface({ input: proc.stdout }).on('line', (line) => {
+    let msg;
+    try {
+      msg = JSON.parse(line);
+    } catch {
+      console.error("[VERIFY] Batch verifier output ::", line);
+      return;
+    }
+    if (msg.ready) return ready();
+    const req = pending.get(msg.id);
+    if (!req) return;
+    pending.delete(msg.id);
+    msg.error ? req.reject(new Error(msg.error)) : req.resolve(msg.valid);
+  });
+  proc.on('error', (err) => stop(`failed to start (${err.message})`));
+  proc.on('exit', (code) => stop(`exited with code ${code}`));
+  proc.stdin.on('error', (err) => stop(`stdin closed (${err.message})`));
+  const verify = async (items) => {
+    await started;
+    const id = nextId++;
+    const proofs = items.map(p => ({ proof: { pi_a: p.a, pi_b: p.b, pi_c: p.c }, publicSignals: p.publicInputs }));
+    return new Promise((resolve, reject) => {
+      pending.set(id, { resolve, reject });
+      proc.stdin.write(JSON.stringify({ id, proofs }) + "\n");
+    });
+  };
+  verify.alive = () => alive;
+  return verify;
+}
+
+const batchVerify = BATCH_VERIFY ? startBatchVerifier() : null;
+
+async function verifyProofsBatched(batch) {
+  for (const [, p] of batch) p.status = "verifying";  // lock immediately
+  try {
+    const valid = await batchVerify(batch.map(([, p]) => p));
+    batch.forEach(([key, p], i) => {
+      p.status = valid[i] ? "verified" : "failed";
+      console.log(`[VERIFY] Proof ${key} ${valid[i] ? "OK" : "FAIL"}`);
+    });
+  } catch (err) {
+    console.error("[VERIFY] Batch Verify Error ::", err.message);
+    if (!batchVerify.alive()) return verifyProofsSnarkjs(batch);
+    for (const [, p] of batch) p.status = "pending";
+  }
+}
+
 async function verifyProofs() {
   const batch = Array.from(proofs.entries())
     .filter(([_, p]) => p.status === "pending");
-  
+  if (batch.length === 0) return;
+  if (batchVerify && batchVerify.alive()) return verifyProofsBatched(batch);
+  return verifyProofsSnarkjs(batch);
+}
+
+async function verifyProofsSnarkjs(batch) {
   await Promise.all(batch.map(async ([key,p]) => {
     p.status = "verifying";  // lock immediately
     const tmp = path.join(__dirname, "../cache/verify", key);
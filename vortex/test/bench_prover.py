@@ -0,0 +1,74 @@
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from generate_proof import BUILD_DIR, CIRCUIT_NAME, WASM_PATH, proof_input, prove_with_snarkjs
+from prover_client import AsyncProverClient, ProverClient
+from witness_calculator import WitnessCalculator
+
+def bench_subprocess(ids):
+    """Current path: one `node` and one `snarkjs` process per proof."""
+    with tempfile.TemporaryDirectory() as tmp:
+        t0 = time.perf_counter()
+        for i in ids:
+            prove_with_snarkjs(
+                proof_input(i), tmp,
+                os.path.join(tmp, "proof.json"), os.path.join(tmp, "public.json"),
+            )
+        return time.perf_counter() - t0
+
+def bench_daemon(ids, concurrency):
+    with ProverClient(BUILD_DIR, CIRCUIT_NAME, concurrency) as client:
+        # First proof warms up the curve and wasm instance, keep it out of the timing
+        client.prove(proof_input(ids[0]))
+        t0 = time.perf_counter()
+        for _ in client.prove_many([proof_input(i) for i in ids]):
+            pass
+        return time.perf_counter() - t0
+
+def bench_daemon_python_witness(ids, concurrency):
+    """Daemon proving with witnesses computed in-process from the circuit wasm."""
+    calc = WitnessCalculator(WASM_PATH)
+    with ProverClient(BUILD_DIR, CIRCUIT_NAME, concurrency) as client:
+        client.prove(wtns=calc.calculate_wtns_bin(proof_input(ids[0])))
+        t0 = time.perf_counter()
+        futures = [client.submit(wtns=calc.calculate_wtns_bin(proof_input(i))) for i in ids]
+        for fut in futures:
+            fut.result()
+        return time.perf_counter() - t0
+
+async def bench_daemon_async(ids, concurrency):
+    async with await AsyncProverClient.start(BUILD_DIR, CIRCUIT_NAME, concurrency) as client:
+        await client.prove(proof_input(ids[0]))
+        t0 = time.perf_counter()
+        await client.prove_many([proof_input(i) for i in ids])
+        return time.perf_counter() - t0
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare prover_daemon.js against per-process proving")
+    parser.add_argument("--count", type=int, default=50, help="proofs per mode")
+    parser.add_argument("--concurrency", type=int, default=1, help="in-flight proofs inside the daemon")
+    parser.add_argument("--skip-subprocess", action="store_true", help="only benchmark the daemon")
+    parser.add_argument("--python-witness", action="store_true", help="also benchmark in-process witness calculation")
+    args = parser.parse_args()
+
+    ids = list(range(args.count))
+    results = {}
+    if not args.skip_subprocess:
+        results["subprocess"] = bench_subprocess(ids)
+    results["daemon"] = bench_daemon(ids, args.concurrency)
+    results["daemon (async)"] = asyncio.run(bench_daemon_async(ids, args.concurrency))
+    if args.python_witness:
+        results["daemon + py wtns"] = bench_daemon_python_witness(ids, args.concurrency)
+
+    print(f"======== PROVER BENCHMARK ({CIRCUIT_NAME}, {args.count} proofs) ========")
+    for mode, elapsed in results.items():
+        print(f"{mode:<16} :: {elapsed:8.2f} sec, {args.count/elapsed:8.2f} proofs/sec")
+    if "subprocess" in results:
+        print(f"Daemon Speedup :: {results['subprocess']/results['daemon']:.2f}x")
+    print("======== END ========")
+
+if __name__ == "__main__":
+    main()
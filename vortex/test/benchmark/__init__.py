@@ -0,0 +1,10 @@
+"""Scenario-based benchmark harness for Vortex and on-chain proof verification.
+
+Run from vortex/test (so the sibling helper modules are importable):
+
+    python -m benchmark run transfer
+    python -m benchmark run verifyProof --repeat 5 --warmup 1
+    python -m benchmark run vortex --repeat 5 --warmup 1
+    python -m benchmark compare results_verifyProof.json results_vortex.json
+"""
+from .scenarios import SCENARIOS, Scenario, get_scenario, register
@@ -0,0 +1,92 @@
+"""Command line for the benchmark package.
+
+Usage: python -m benchmark list
+       python -m benchmark run verifyProof [--repeat 5 --warmup 1] [--out FILE]
+       python -m benchmark run verifyProof --backend local [--block-gas-limit N --block-interval SECS]
+       python -m benchmark run transfer --stream [--chunk-size 64 --max-outstanding 4096]
+       python -m benchmark run transfer --nodes 3 [--route sender|round_robin|random]
+       python -m benchmark run vortex --rate-control aimd --control-duration 300 [--target-latency-slots 2]
+       python -m benchmark compare BASE.json NEW.json [--threshold 0.05] [--fail-on-regression]
+"""
+import argparse
+import os
+import sys
+
+from .scenarios import SCENARIOS, get_scenario
+
+def add_run_args(parser):
+    parser.add_argument("scenario", choices=list(SCENARIOS))
+    parser.add_argument("--count", type=int, default=0, help="transactions per run (default: fill ESTIMATED_BLOCKS_TO_MONITOR blocks)")
+    parser.add_argument("--repeat", type=int, default=1, help="measured runs")
+    parser.add_argument("--warmup", type=int, default=0, help="unmeasured runs before the measured ones")
+    parser.add_argument("--out", default=None, help="result JSON (default READINGS_DIR/results_<scenario>.json)")
+    parser.add_argument("--no-profile", dest="profile", action="store_false", help="skip CPU profiling of the node")
+    parser.add_argument("--async-submit", action="store_true", help="submit through the asyncio JSON-RPC engine")
+    parser.add_argument("--batch-size", type=int, default=1, help="eth_sendRawTransaction calls per JSON-RPC batch")
+    parser.add_argument("--concurrency", type=int, default=256, help="in-flight requests for --async-submit")
+    parser.add_argument("--stream", action="store_true",
+                        help="sign, submit and confirm concurrently through bounded queues (see pipeline.py)")
+    parser.add_argument("--chunk-size", type=int, default=64, help="transactions per signing job with --stream")
+    parser.add_argument("--max-outstanding", type=int, default=4096,
+                        help="submitted but unconfirmed transactions before --stream pauses submission")
+    parser.add_argument("--rate-control", choices=["aimd", "pid"], default=None,
+                        help="pace submission with a closed-loop controller to find the sustainable rate (implies --stream)")
+    parser.add_argument("--target-latency-slots", type=float, default=2, help="inclusion latency the controller keeps under")
+    parser.add_argument("--initial-rate", type=float, default=0, help="starting txns/s (default: half a block per slot)")
+    parser.add_argument("--rate-step", type=float, default=0, help="AIMD additive increase in txns/s (default: initial rate / 10)")
+    parser.add_argument("--control-duration", type=float, default=0, metavar="SECS",
+                        help="stop offering load after SECS; with no --count the run lasts this long")
+    parser.add_argument("--ws", action="store_true", help="submit over WS_URL instead of RPC_URL")
+    parser.add_argument("--senders", type=int, default=0, help="spread load over N funded accounts from SENDER_MNEMONIC/SENDER_KEYFILE")
+    parser.add_argument("--nodes", type=int, default=0,
+                        help="spread submissions over the first N testnet nodes (GETH_HTTP_PORT + i, or RPC_URLS)")
+    parser.add_argument("--route", choices=["round_robin", "sender", "random"], default="sender",
+                        help="ingress node policy with --nodes")
+    parser.add_argument("--propagation-interval", type=float, default=0.5, metavar="SECS",
+                        help="poll every node's txpool every SECS with --nodes to measure propagation (0 disables)")
+    parser.add_argument("--assign", choices=["round_robin", "least_pending"], default="round_robin", help="sender assignment policy")
+    parser.add_argument("--txpool-interval", type=float, default=1.0, metavar="SECS",
+                        help="sample txpool_status/txpool_inspect every SECS during the run (0 disables)")
+    parser.add_argument("--proc-interval", type=float, default=0.25, metavar="SECS",
+                        help="sample CPU/RSS/IO of the geth, beacon-chain, validator and bootnode processes every SECS (0 disables)")
+    parser.add_argument("--slot-interval", type=float, default=0.25, metavar="SECS",
+                        help="poll every beacon node's head every SECS for slot timing, missed slots and head lag (0 disables)")
+    parser.add_argument("--progress-interval", type=float, default=2.0, metavar="SECS",
+                        help="console progress line every SECS; per-transaction events go to events.ndjson")
+    parser.add_argument("--slot-profile", type=int, default=0, metavar="N", help="rotate the CPU profile every N slots for a per-block CPU series")
+    parser.add_argument("--backend", choices=["testnet", "local"], default=os.getenv("BENCH_BACKEND", "testnet"),
+                        help="testnet: the testnet.sh nodes; local: in-process EVM (see local_chain.py)")
+    parser.add_argument("--block-gas-limit", type=int, default=0, help="local backend block gas limit (default GAS_LIMIT)")
+    parser.add_argument("--block-interval", type=float, default=1.0, help="local backend seconds between blocks")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="benchmark", description="Scenario-based Vortex / on-chain benchmark")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("list", help="list registered scenarios")
+    add_run_args(sub.add_parser("run", help="run a scenario"))
+    cmp = sub.add_parser("compare", help="compare two result files")
+    cmp.add_argument("base")
+    cmp.add_argument("new")
+    cmp.add_argument("--threshold", type=float, default=0.05, help="relative change that counts as a regression")
+    cmp.add_argument("--fail-on-regression", action="store_true", help="exit 1 if a regression is flagged")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.cmd == "list":
+        for name, cls in SCENARIOS.items():
+            print(f"{name:<12} {cls.description}")
+        return
+
+    if args.cmd == "compare":
+        from .compare import run_compare
+        regressed = run_compare(args.base, args.new, args.threshold)
+        if regressed and args.fail_on_regression:
+            sys.exit(1)
+        return
+
+    from .config import load_config
+    from .runner import run_benchmark, write_results
+    cfg = load_config()
+    doc = run_benchmark(cfg, get_scenario(args.scenario), args)
+    write_results(doc, args.out or os.path.join(cfg.readings_dir, f"results_{args.scenario}.json"))
@@ -0,0 +1,72 @@
+"""Compare two benchmark result files.
+
+Between scenarios (e.g. verifyProof vs vortex) it reports how Vortex mode
+scales against on-chain verification. Between two runs of the same
+scenario it flags regressions: a metric that moved the wrong way by more
+than the threshold, with non-overlapping 95% intervals when both files
+have repeated runs and on the threshold alone otherwise.
+"""
+import json
+
+from .stats import overlap
+
+# metric -> True if higher is better
+DIRECTION = {
+    "gasPerSec": True,
+    "tps": True,
+    "cpuUsage": False,
+    "execCpuSec": False,
+    "cpuPerTx": False,
+    "missRate": False,
+    "latencySecP50": False,
+    "latencySecP90": False,
+    "gasPerProof": False,
+    "capacityTps": True,
+    "fullPropagationSecP90": False,
+    "inclusionSecP90": False,
+    "nodeCpuSec": False,
+    "missedSlots": False,
+    "blockSeenSecP90": False,
+}
+
+def load_results(path):
+    with open(path) as f:
+        return json.load(f)
+
+def compare(base, new, threshold=0.05):
+    """[(metric, base summary, new summary, ratio new/base, flag)]; flag is "", "better" or "REGRESSION"."""
+    same = base["scenario"] == new["scenario"]
+    rows = []
+    for metric, higher_better in DIRECTION.items():
+        a, b = base["summary"].get(metric), new["summary"].get(metric)
+        if not a or not b or not a["n"] or not b["n"]:
+            continue
+        ratio = b["mean"] / a["mean"] if a["mean"] else float("inf")
+        change = ratio - 1 if higher_better else 1 - ratio
+        flag = ""
+        if abs(change) > threshold and not overlap(a, b):
+            flag = "better" if change > 0 else ("REGRESSION" if same else "worse")
+        rows.append((metric, a, b, ratio, flag))
+    return rows
+
+def fmt(s):
+    if s["n"] > 1:
+        return f"{s['mean']:.4g} ± {s['ci95']:.2g}"
+    return f"{s['mean']:.4g}"
+
+def print_comparison(base, new, rows):
+    if base["scenario"] == new["scenario"]:
+        print(f"======== {new['scenario']} :: {new['createdAt']} vs {base['createdAt']} ========")
+    else:
+        print(f"======== {new['scenario']} vs {base['scenario']} ========")
+    print(f"{'metric':<12} {'base':>20} {'new':>20} {'ratio':>8}  flag")
+    for metric, a, b, ratio, flag in rows:
+        print(f"{metric:<12} {fmt(a):>20} {fmt(b):>20} {ratio:>8.3f}  {flag}")
+    print("======== END ========")
+
+def run_compare(base_path, new_path, threshold=0.05):
+    """Print the comparison; returns True if any regression was flagged."""
+    base, new = load_results(base_path), load_results(new_path)
+    rows = compare(base, new, threshold)
+    print_comparison(base, new, rows)
+    return any(flag == "REGRESSION" for *_, flag in rows)
@@ -0,0 +1,87 @@
+"""Benchmark configuration, read once from ../.env and the environment."""
+import os
+from dataclasses import asdict, dataclass, field
+
+from node_endpoints import beacon_urls, geth_http_urls
+from proof_corpus import default_corpus_path
+
+def _int(name, default=None):
+    value = os.getenv(name)
+    return int(value) if value not in (None, "") else default
+
+@dataclass
+class Config:
+    rpc_url: str
+    ws_url: str
+    readings_dir: str
+    build_dir: str
+    proofs_dir: str
+    corpus_path: str
+    ipc_path: str
+    slot_duration: int
+    gas_limit: int
+    per_txn_gas: int
+    blocks_to_monitor: int
+    private_keys: list = field(repr=False)
+    verifier_address: str = None
+    verifier_abi_path: str = None
+    vortex_address: str = None
+    vortex_abi_path: str = None
+    sender_mnemonic: str = field(default=None, repr=False)
+    sender_keyfile: str = None
+    sender_funding_eth: float = 100.0
+    signing_workers: int = 1
+    submit_retries: int = 3
+    confirm_timeout: int = 300
+    block_cache: str = None
+    node_urls: list = field(default_factory=list)     # every testnet node, for --nodes
+    beacon_urls: list = field(default_factory=list)
+
+    @property
+    def default_count(self):
+        """Transactions that fill `blocks_to_monitor` blocks at PER_TXN_GAS each."""
+        if not (self.gas_limit and self.per_txn_gas and self.blocks_to_monitor):
+            raise SystemExit("Pass --count or set GAS_LIMIT, PER_TXN_GAS and ESTIMATED_BLOCKS_TO_MONITOR")
+        return (self.gas_limit // self.per_txn_gas) * self.blocks_to_monitor
+
+    def public(self):
+        """Settings recorded in result files (no keys or mnemonics)."""
+        out = asdict(self)
+        for secret in ("private_keys", "sender_mnemonic"):
+            out.pop(secret)
+        return out
+
+def load_config(env_file="../.env"):
+    from dotenv import load_dotenv
+    load_dotenv(env_file)
+
+    readings_dir = os.getenv("READINGS_DIR") or "readings"
+    build_dir = os.getenv("BUILD_DIR") or "../build"
+    os.makedirs(readings_dir, exist_ok=True)
+    return Config(
+        rpc_url=os.getenv("RPC_URL"),
+        ws_url=os.getenv("WS_URL"),
+        readings_dir=readings_dir,
+        build_dir=build_dir,
+        proofs_dir=os.path.join(build_dir, "proofs"),
+        corpus_path=default_corpus_path(build_dir),
+        ipc_path=os.getenv("PROFILING_NODE_IPC_PATH"),
+        slot_duration=_int("CPU_PROFILE_INTERVAL"),
+        gas_limit=_int("GAS_LIMIT"),
+        per_txn_gas=_int("PER_TXN_GAS"),
+        blocks_to_monitor=_int("ESTIMATED_BLOCKS_TO_MONITOR"),
+        private_keys=[os.getenv(f"PRIVATE_KEY_{i}") for i in (1, 2, 3)],
+        verifier_address=os.getenv("VERIFIER_CONTRACT_ADDRESS"),
+        verifier_abi_path=os.getenv("VERIFIER_ABI_PATH"),
+        vortex_address=os.getenv("VORTEX_CONTRACT_ADDRESS"),
+        vortex_abi_path=os.getenv("VORTEX_ABI_PATH"),
+        sender_mnemonic=os.getenv("SENDER_MNEMONIC"),
+        sender_keyfile=os.getenv("SENDER_KEYFILE"),
+        sender_funding_eth=float(os.getenv("SENDER_FUNDING_ETH", "100")),
+        signing_workers=_int("SIGNING_WORKERS", os.cpu_count() or 1),
+        submit_retries=_int("SUBMIT_RETRIES", 3),
+        confirm_timeout=_int("CONFIRM_TIMEOUT", 300),
+        block_cache=os.getenv("BLOCK_CACHE") or os.path.join(readings_dir, "block_cache.jsonl"),
+        node_urls=geth_http_urls(),
+        beacon_urls=beacon_urls(),
+    )
@@ -0,0 +1,302 @@
+"""Streaming sign -> submit -> confirm pipeline.
+
+Four stages run concurrently, connected by bounded queues:
+
+    read     pulls (tag, args, gas) items from the scenario in chunks
+    sign     turns chunks into signing jobs and signs them on one process pool
+    submit   sends signed transactions in JSON-RPC batches (asyncio)
+    confirm  follows blocks and matches receipts (ConfirmationTracker)
+
+A full queue blocks the stage that feeds it, and the submitter pauses while
+`max_outstanding` transactions await confirmation, so memory stays bounded by
+the queue sizes rather than the run length and the first transactions reach
+the node before the last ones are signed. Each stage reports its item count,
+throughput and the depth of the queue in front of it.
+"""
+import asyncio
+import queue
+import threading
+import time
+from collections import deque
+from itertools import islice
+
+from eth_utils import keccak
+
+from confirmation import ConfirmationResult, ConfirmationTracker
+from rpc_async import AsyncRpcClient
+from tx_signing import sign_stream
+
+SAMPLE_INTERVAL = 0.5   # seconds between queue-depth samples
+
+class StageStats:
+    def __init__(self, name, depth=None):
+        self.name = name
+        self.depth = depth          # callable returning the depth of the queue feeding this stage
+        self.items = 0
+        self.first = None
+        self.last = None
+        self.depth_max = 0
+        self.depth_sum = 0
+        self.depth_samples = 0
+
+    def add(self, n):
+        now = time.time()
+        self.first = self.first or now
+        self.last = now
+        self.items += n
+
+    def sample(self):
+        if self.depth is None:
+            return
+        d = self.depth()
+        self.depth_max = max(self.depth_max, d)
+        self.depth_sum += d
+        self.depth_samples += 1
+
+    def summary(self):
+        span = self.last - self.first if self.first and self.last else 0
+        return {
+            "items": self.items,
+            "perSec": self.items / span if span > 0 else None,
+            "queueMax": self.depth_max if self.depth is not None else None,
+            "queueMean": self.depth_sum / self.depth_samples if self.depth_samples else None,
+        }
+
+class Pipeline:
+    """Run items through sign, submit and confirm with backpressure between stages.
+
+    `make_jobs(chunk)` turns a list of (tag, args, gas) into signing jobs
+    (see tx_signing.sign_jobs); `on_sent([(tag, tx_hash)])` is called for
+    every accepted batch. With a `limiter` (rate_control.RateLimiter) the
+    submitter paces itself to the limiter's current rate. `url` may be a
+    list of nodes, in which case `route(tag)` picks each transaction's node.
+    `on_rejected(node, [(tag, error)])` and `on_inclusion(Inclusion)` report
+    refusals and inclusions as they happen.
+    """
+
+    def __init__(self, w3, url, make_jobs, workers=None, chunk_size=64, queue_size=8, batch_size=1,
+                 concurrency=256, max_outstanding=4096, confirm_timeout=300, on_sent=None, progress_interval=2.0,
+                 limiter=None, route=None, on_rejected=None, on_inclusion=None):
+        self.w3 = w3
+        self.urls = url if isinstance(url, list) else [url]
+        self.route = route or (lambda tag: 0)
+        self.on_rejected = on_rejected
+        self.on_inclusion = on_inclusion
+        self.make_jobs = make_jobs
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.batch_size = max(1, batch_size)
+        self.concurrency = concurrency
+        self.max_outstanding = max_outstanding
+        self.on_sent = on_sent
+        self.progress_interval = progress_interval
+        self.limiter = limiter
+        self.items_q = queue.Queue(queue_size)
+        self.signed_q = queue.Queue(queue_size)
+        self.tracker = ConfirmationTracker(w3, timeout=confirm_timeout,
+                                           on_inclusion=self._included)
+        self.stats = {
+            "read": StageStats("read"),
+            "sign": StageStats("sign", lambda: self.items_q.qsize() * self.chunk_size),
+            "submit": StageStats("submit", lambda: sum(len(c) for c in list(self.signed_q.queue) if c)),
+            "confirm": StageStats("confirm", lambda: len(self.tracker.outstanding)),
+        }
+        self.sent, self.failed = [], []
+        self.refused_raw = {}           # tag -> raw_tx of refused submissions, for resubmission
+        self.unsent = []                # [(tag, raw_tx)] signed but dropped by drain() or an abort
+        self.first_send = None
+        self.sent_at = {}               # tx_hash -> submit time, while outstanding
+        self.latencies = deque()        # (inclusion time, submit-to-inclusion seconds), drained by the rate controller
+        self.error = None
+        self._abort = threading.Event()
+        self._drain = threading.Event()
+        self.submit_done = threading.Event()
+
+    def drain(self):
+        """End the run now: nothing more is read, signed or sent, and only what was sent is confirmed.
+
+        Items are signed and sent in order, so what is dropped is a suffix of
+        every sender's nonces and leaves no gap; it is kept in `unsent`.
+        """
+        self._drain.set()
+
+    def _stopped(self):
+        return self._abort.is_set() or self._drain.is_set()
+
+    def _included(self, inc):
+        self.stats["confirm"].add(1)
+        sent_at = self.sent_at.pop(inc.tx_hash, None)
+        if sent_at is not None:
+            self.latencies.append((inc.seen_at, inc.seen_at - sent_at))
+        if self.on_inclusion is not None:
+            self.on_inclusion(inc)
+
+    def _put(self, q, item):
+        while not self._stopped():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _get(self, q):
+        while not self._stopped():
+            try:
+                return q.get(timeout=0.1)
+            except queue.Empty:
+                continue
+        return None
+
+    def _stage(self, fn, *args):
+        def run():
+            try:
+                fn(*args)
+            except Exception as e:
+                self.error = self.error or e
+                self._abort.set()
+                self.tracker.outstanding = {}
+                self.submit_done.set()
+        t = threading.Thread(target=run, daemon=True)
+        t.start()
+        return t
+
+    def _read(self, items):
+        items = iter(items)
+        while not self._stopped():
+            chunk = list(islice(items, self.chunk_size))
+            if not chunk:
+                break
+            self.stats["read"].add(len(chunk))
+            if not self._put(self.items_q, chunk):
+                return
+        self._put(self.items_q, None)
+
+    def _sign(self):
+        def jobs():
+            while True:
+                chunk = self._get(self.items_q)
+                if chunk is None:
+                    return
+                yield from self.make_jobs(chunk)
+
+        # Once stopped, jobs() ends and the few jobs already on the pool are collected as unsent
+        for signed in sign_stream(jobs(), self.workers):
+            self.stats["sign"].add(len(signed))
+            if not self._put(self.signed_q, signed):
+                self.unsent += signed
+        self._put(self.signed_q, None)
+
+    async def _submit_loop(self):
+        loop = asyncio.get_running_loop()
+        sem = asyncio.Semaphore(self.concurrency)
+        tasks = set()
+
+        clients = [AsyncRpcClient(url) for url in self.urls]
+        for c in clients:
+            await c.__aenter__()
+        try:
+            async def send(node, batch):
+                client = clients[node]
+                calls = [("eth_sendRawTransaction", ["0x" + raw.hex()]) for _, raw in batch]
+                try:
+                    if len(calls) > 1:
+                        results = await client.batch(calls)
+                    else:
+                        results = [(await client.call(*calls[0]), None)]
+                except Exception as e:
+                    results = [(None, str(e))] * len(batch)
+                finally:
+                    sem.release()
+                ok, refused = [], []
+                for (tag, raw), (result, err) in zip(batch, results):
+                    if err is None:
+                        ok.append((tag, bytes.fromhex(result[2:])))
+                    else:
+                        self.tracker.outstanding.pop(keccak(raw), None)
+                        self.sent_at.pop(keccak(raw), None)
+                        self.refused_raw[tag] = raw
+                        refused.append((tag, err))
+                self.sent += ok
+                self.failed += refused
+                self.stats["submit"].add(len(batch))
+                if ok and self.on_sent is not None:
+                    self.on_sent(ok)
+                if refused and self.on_rejected is not None:
+                    self.on_rejected(node, refused)
+
+            while True:
+                signed = await loop.run_in_executor(None, self._get, self.signed_q)
+                if signed is None:
+                    break
+                for k in range(0, len(signed), self.batch_size):
+                    batch = signed[k:k + self.batch_size]
+                    # Backpressure from the confirm stage
+                    while len(self.tracker.outstanding) >= self.max_outstanding and not self._stopped():
+                        await asyncio.sleep(0.05)
+                    if self.limiter is not None:
+                        await self.limiter.acquire(len(batch))
+                    if self._stopped():
+                        self.unsent += signed[k:]
+                        break
+                    now = time.time()
+                    for tag, raw in batch:
+                        tx_hash = keccak(raw)
+                        self.sent_at[tx_hash] = now
+                        self.tracker.track(tag, tx_hash)
+                    self.first_send = self.first_send or now
+                    by_node = {}
+                    for tag, raw in batch:
+                        by_node.setdefault(self.route(tag), []).append((tag, raw))
+                    for node, group in by_node.items():
+                        await sem.acquire()
+                        task = asyncio.ensure_future(send(node, group))
+                        tasks.add(task)
+                        task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks)
+        finally:
+            for c in clients:
+                await c.__aexit__(None, None, None)
+
+    def _submit(self):
+        try:
+            asyncio.run(self._submit_loop())
+        finally:
+            self.submit_done.set()
+
+    def _monitor(self, done):
+        last_print = time.time()
+        while not done.wait(SAMPLE_INTERVAL):
+            for s in self.stats.values():
+                s.sample()
+            if self.progress_interval and time.time() - last_print >= self.progress_interval:
+                last_print = time.time()
+                print("Pipeline :: " + ", ".join(
+                    f"{s.name} {s.items}" + (f" (queue {s.depth()})" if s.depth is not None else "")
+                    for s in self.stats.values()))
+
+    def run(self, items, start_block):
+        """Stream items to the chain; returns (sent, failed, ConfirmationResult)."""
+        done = threading.Event()
+        monitor = threading.Thread(target=self._monitor, args=(done,), daemon=True)
+        monitor.start()
+        stages = [self._stage(self._read, items), self._stage(self._sign), self._stage(self._submit)]
+        try:
+            result = self.tracker.wait(start_block, until=self.submit_done.is_set)
+        except Exception as e:
+            self.error = self.error or e
+            self._abort.set()
+            result = ConfirmationResult(start_block=start_block)
+        for t in stages:
+            t.join()
+        while not self.signed_q.empty():
+            self.unsent += self.signed_q.get_nowait() or []
+        done.set()
+        monitor.join()
+        if self.error is not None:
+            raise self.error
+        return self.sent, self.failed, result
+
+    def summary(self):
+        return {name: s.summary() for name, s in self.stats.items()}
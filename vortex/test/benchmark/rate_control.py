@@ -0,0 +1,211 @@
+"""Closed-loop submission rate control for the streaming pipeline.
+
+Instead of sending a fixed GAS_LIMIT // PER_TXN_GAS * ESTIMATED_BLOCKS_TO_MONITOR
+transactions as fast as possible, the submitter is paced by a token bucket
+whose rate a controller adjusts once per slot from live signals:
+
+    latency   p90 submit-to-inclusion time of the slot's inclusions, and the
+              age of the oldest transaction still waiting
+    pool      txpool_status pending depth, in blocks' worth of our transactions
+    blocks    gas utilisation and transaction count of the new heads
+
+AIMD adds `step` txns/s while every signal is inside its target and halves
+the rate when one is not; PID steers the latency towards the target. The
+capacity is the mean inclusion rate over the slots after the controller
+first backed off in which latency stayed under target while load was still
+being offered, i.e. the highest
+rate the chain sustained without queueing. Each slot is a row of
+rate_control.csv.
+"""
+import asyncio
+import csv
+import os
+import threading
+import time
+
+from percentiles import percentile
+
+SERIES_FIELDS = [
+    "t", "rate", "included", "includedPerSec", "latencyP90", "oldestAge", "pending", "poolBlocks",
+    "gasUtil", "congested", "draining",
+]
+
+class RateLimiter:
+    """Token bucket for the asyncio submitter; `rate` may be changed from another thread."""
+
+    def __init__(self, rate):
+        self.rate = rate
+        self.tokens = 0.0
+        self._t = time.monotonic()
+
+    async def acquire(self, n=1):
+        while True:
+            now = time.monotonic()
+            # At most one second of unused rate is banked
+            self.tokens = min(self.tokens + (now - self._t) * self.rate, self.rate)
+            self._t = now
+            if self.tokens >= 0:
+                # A batch larger than the bucket borrows against the next tokens
+                self.tokens -= n
+                return
+            await asyncio.sleep(-self.tokens / self.rate)
+
+class AimdController:
+    def __init__(self, rate, step=None, decrease=0.5, min_rate=1.0, max_rate=None):
+        self.rate = rate
+        self.step = step or max(1.0, rate / 10)
+        self.decrease = decrease
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+
+    def update(self, congested, error, gas_util):
+        if congested:
+            self.rate = max(self.min_rate, self.rate * self.decrease)
+        else:
+            # Climb faster while blocks are mostly empty
+            self.rate += self.step * (2 if gas_util is not None and gas_util < 0.5 else 1)
+        if self.max_rate:
+            self.rate = min(self.rate, self.max_rate)
+        return self.rate
+
+class PidController:
+    """PI(D) on the relative latency error (target - latency) / target, applied multiplicatively."""
+
+    def __init__(self, rate, kp=0.3, ki=0.05, kd=0.1, min_rate=1.0, max_rate=None):
+        self.rate = rate
+        self.kp, self.ki, self.kd = kp, ki, kd
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.integral = 0.0
+        self.last_error = None
+
+    def update(self, congested, error, gas_util):
+        self.integral = max(-2.0, min(2.0, self.integral + error))
+        derivative = 0.0 if self.last_error is None else error - self.last_error
+        self.last_error = error
+        gain = self.kp * error + self.ki * self.integral + self.kd * derivative
+        self.rate = max(self.min_rate, self.rate * (1 + max(-0.5, min(0.5, gain))))
+        if self.max_rate:
+            self.rate = min(self.rate, self.max_rate)
+        return self.rate
+
+class RateControl:
+    """Drive `limiter` from chain signals once per slot while `pipeline` runs."""
+
+    def __init__(self, w3, pipeline, limiter, controller, slot, target_slots=2, duration=0, run_dir=None):
+        self.w3 = w3
+        self.pipeline = pipeline
+        self.limiter = limiter
+        self.controller = controller
+        self.slot = slot
+        self.target = target_slots * slot
+        self.target_slots = target_slots
+        self.duration = duration
+        self.run_dir = run_dir
+        self.rows = []
+        self.settled_at = None
+        self._txpool_api = True
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+        self._thread.start()
+        return self
+
+    def _pending(self):
+        if not self._txpool_api:
+            return None
+        try:
+            return int(self.w3.provider.make_request("txpool_status", [])["result"]["pending"], 16)
+        except Exception as e:
+            print(f"txpool API unavailable ({e}) :: pool depth is not used for rate control")
+            self._txpool_api = False
+            return None
+
+    def _loop(self):
+        t0 = time.time()
+        next_block = self.w3.eth.block_number + 1
+        per_block = None    # our transactions that fit in one block, learnt from full blocks
+        last = t0
+        while not self._stop.wait(self.slot):
+            now = time.time()
+            elapsed, last = now - last, now
+            if self.duration and now - t0 >= self.duration:
+                self.pipeline.drain()
+            latencies = []
+            while self.pipeline.latencies:
+                latencies.append(self.pipeline.latencies.popleft()[1])
+            sent_at = list(self.pipeline.sent_at.values())
+            oldest = now - min(sent_at) if sent_at else 0.0
+
+            head = self.w3.eth.block_number
+            utils = []
+            for number in range(next_block, head + 1):
+                block = self.w3.eth.get_block(number)
+                util = block["gasUsed"] / block["gasLimit"] if block["gasLimit"] else 0
+                utils.append(util)
+                if util > 0.5 and block["transactions"]:
+                    per_block = len(block["transactions"]) / util
+            next_block = max(next_block, head + 1)
+            gas_util = sum(utils) / len(utils) if utils else None
+
+            pending = self._pending()
+            pool_blocks = pending / per_block if pending is not None and per_block else None
+            p90 = percentile(latencies, 0.9)
+            measured = max(p90 or 0.0, oldest)
+            error = (self.target - measured) / self.target
+            if pool_blocks is not None:
+                error = min(error, (self.target_slots - pool_blocks) / self.target_slots)
+            congested = error < 0
+            if congested and self.settled_at is None:
+                self.settled_at = len(self.rows)
+            rate = self.controller.update(congested, error, gas_util)
+            self.rows.append({
+                "t": round(now - t0, 3), "rate": self.limiter.rate, "included": len(latencies),
+                "includedPerSec": len(latencies) / elapsed, "latencyP90": p90, "oldestAge": round(oldest, 3),
+                "pending": pending, "poolBlocks": pool_blocks, "gasUtil": gas_util, "congested": congested,
+                "draining": self.pipeline.submit_done.is_set(),
+            })
+            self.limiter.rate = rate
+
+    def stop(self):
+        """Stop adjusting, write rate_control.csv and return the capacity summary."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        if self.run_dir:
+            os.makedirs(self.run_dir, exist_ok=True)
+            with open(os.path.join(self.run_dir, "rate_control.csv"), "w", newline="") as f:
+                writer = csv.DictWriter(f, fieldnames=SERIES_FIELDS)
+                writer.writeheader()
+                writer.writerows(self.rows)
+        return self.summary()
+
+    def summary(self):
+        settled = self.rows[self.settled_at:] if self.settled_at is not None else []
+        # Slots after the last submission only drain the backlog and say nothing about capacity
+        good = [r for r in settled if not r["congested"] and not r["draining"]]
+        return {
+            "controlSlots": len(self.rows),
+            "congestedSlots": sum(r["congested"] for r in self.rows),
+            "capacityTps": sum(r["includedPerSec"] for r in good) / len(good) if good else None,
+            "capacityRate": sum(r["rate"] for r in good) / len(good) if good else None,
+            # Never backed off: the chain kept up with everything, so the top rate is only a lower bound
+            "capacityLowerBound": max((r["rate"] for r in self.rows), default=None) if self.settled_at is None else None,
+            "targetLatencySec": self.target,
+        }
+
+def print_summary(s, noun):
+    fmt = lambda v: "n/a" if v is None else f"{v:.2f}"
+    print("======== RATE CONTROL ========")
+    print(f"Control Slots: {s['controlSlots']}, Congested: {s['congestedSlots']}, "
+          f"Target Latency: {fmt(s['targetLatencySec'])} sec(s)")
+    if s["capacityTps"] is not None:
+        print(f"Sustainable Capacity: {fmt(s['capacityTps'])} {noun}s/s included "
+              f"(offered {fmt(s['capacityRate'])} {noun}s/s)")
+    elif s["capacityLowerBound"] is not None:
+        print(f"Sustainable Capacity: not reached, >= {fmt(s['capacityLowerBound'])} {noun}s/s")
+    else:
+        print("Sustainable Capacity: not reached (congested in every settled slot)")
+    print("======== END ========")
@@ -0,0 +1,531 @@
+"""Run a scenario: sign, submit, confirm, profile and report."""
+import csv
+import dataclasses
+import json
+import os
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from web3 import Web3
+
+from block_scanner import FIELDS as BLOCK_FIELDS, block_details as scan_block_details
+from confirmation import ConfirmationTracker
+from event_log import EventLog, summarize as summarize_events
+from node_endpoints import NodeRouter
+from process_sampler import ProcessSampler
+from propagation import PropagationMonitor
+from rpc_async import submit_raw_transactions
+from sender_pool import build_sender_pool
+from slot_monitor import SlotMonitor
+from slot_profiler import RunProfiler, SlotProfiler, merge_profiles, write_block_series
+from tx_signing import sign_calls_parallel
+from txpool_sampler import TxpoolSampler
+
+from .pipeline import Pipeline
+from .rate_control import AimdController, PidController, RateControl, RateLimiter, print_summary as print_rate_summary
+from .stats import summarize_runs
+
+# Metrics summarised across repeated runs and compared by `compare`
+METRICS = [
+    "gasPerSec", "tps", "cpuUsage", "execCpuSec", "cpuPerTx", "included", "dropped",
+    "missRate", "latencySecP50", "latencySecP90", "gasPerProof", "capacityTps",
+    "fullPropagationSecP90", "inclusionSecP90", "nodeCpuSec", "missedSlots", "blockSeenSecP90",
+]
+
+# Item count for a --rate-control run bounded only by --control-duration
+STREAM_UNBOUNDED = 10**9
+
+def fees(w3):
+    tip = w3.to_wei(2, "gwei")
+    return int(w3.to_wei(10, "gwei")) + tip, tip
+
+class Runner:
+    def __init__(self, cfg, scenario_cls, opts, local=None):
+        self.cfg = cfg
+        self.opts = opts
+        self.local = local
+        self.w3 = Web3(Web3.HTTPProvider(cfg.rpc_url))
+        self.key = random.choice(cfg.private_keys)
+        self.scenario = scenario_cls(cfg, self.w3, self.key)
+        self.pool = None
+        self.sampler = None
+        self.propagation = None
+        self.procs = None
+        self.slots = None
+        self.events = None
+        self.router = None
+        if opts.nodes > 1:
+            if len(cfg.node_urls) < opts.nodes:
+                raise SystemExit(f"--nodes {opts.nodes} but only {len(cfg.node_urls)} node URL(s) (NUM_NODES / RPC_URLS)")
+            self.router = NodeRouter(cfg.node_urls[:opts.nodes], opts.route)
+        self.nonce_of = {}  # tag -> (sender, nonce) of the single-key path
+        self.refused_raw = {}   # tag -> raw_tx of refused submissions, for resubmit_failed
+        if opts.senders:
+            max_fee, tip = fees(self.w3)
+            self.pool = build_sender_pool(
+                self.w3, opts.senders, cfg.private_keys, opts.assign, cfg.sender_mnemonic, cfg.sender_keyfile,
+                self.w3.to_wei(cfg.sender_funding_eth, "ether"), max_fee, tip, cfg.signing_workers,
+            )
+
+    def submit_url(self):
+        if self.opts.ws:
+            if not self.cfg.ws_url:
+                raise SystemExit("--ws needs WS_URL (e.g. ws://127.0.0.1:8100)")
+            return self.cfg.ws_url
+        return self.cfg.rpc_url
+
+    def sign(self, count):
+        noun = self.scenario.noun
+        self.to, self.selector, self.types, self.value, items = self.scenario.calls(count)
+        max_fee, tip = fees(self.w3)
+        if self.pool is not None:
+            signed = self.pool.sign_calls(self.to, self.selector, self.types, items, max_fee, tip,
+                                          self.value, self.cfg.signing_workers)
+            print(f"Signed {len(signed)} {noun}s :: {len(self.pool)} Senders ({self.pool.policy}), "
+                  f"Gas {self.scenario.gas_cache.stats()}")
+            return signed
+        base_nonce = self.w3.eth.get_transaction_count(self.scenario.acct.address, "pending")
+        signed = sign_calls_parallel(
+            self.key, self.w3.eth.chain_id, self.to, self.selector, self.types, items,
+            base_nonce, max_fee, tip, self.cfg.signing_workers, value=self.value,
+        )
+        self.nonce_of = {tag: (self.scenario.acct.address, base_nonce + k) for k, (tag, _) in enumerate(signed)}
+        print(f"Signed {len(signed)} {noun}s :: Nonce {base_nonce}..{base_nonce + len(signed) - 1}")
+        return signed
+
+    def stream(self, count, start_block):
+        """Sign, submit and confirm through the streaming pipeline.
+
+        Returns (sent, failed, ConfirmationResult, first send time, stage stats,
+        rate control summary or None).
+        """
+        noun = self.scenario.noun
+        self.to, self.selector, self.types, self.value, items = self.scenario.stream_calls(count)
+        max_fee, tip = fees(self.w3)
+        chain_id = self.w3.eth.chain_id
+        opts = self.opts
+        if self.pool is not None:
+            def make_jobs(chunk):
+                return self.pool.assign_jobs(self.to, self.selector, self.types, chunk, max_fee, tip,
+                                             self.value, self.cfg.signing_workers, opts.chunk_size)
+        else:
+            address = self.scenario.acct.address
+            next_nonce = [self.w3.eth.get_transaction_count(address, "pending")]
+
+            def make_jobs(chunk):
+                base = next_nonce[0]
+                next_nonce[0] += len(chunk)
+                for k, (tag, _, _) in enumerate(chunk):
+                    self.nonce_of[tag] = (address, base + k)
+                return [(self.key, chain_id, self.to, self.selector, self.types, max_fee, tip, self.value,
+                         [(tag, args, gas, base + k) for k, (tag, args, gas) in enumerate(chunk)])]
+        limiter = RateLimiter(self.initial_rate()) if opts.rate_control else None
+        url, route = self.submit_url(), None
+        if self.router is not None:
+            url, route = self.router.urls, lambda tag: self.router.route(tag, self.sender_of(tag))
+        pipeline = Pipeline(
+            self.w3, url, make_jobs, self.cfg.signing_workers, opts.chunk_size,
+            batch_size=opts.batch_size, concurrency=opts.concurrency, max_outstanding=opts.max_outstanding,
+            confirm_timeout=self.cfg.confirm_timeout, on_sent=self.watch, limiter=limiter,
+            route=route, on_rejected=self.rejected, on_inclusion=self.included,
+            progress_interval=opts.progress_interval,
+        )
+        control = None
+        if limiter is not None:
+            if opts.rate_control == "aimd":
+                controller = AimdController(limiter.rate, opts.rate_step)
+            else:
+                controller = PidController(limiter.rate)
+            print(f"Rate Control :: {opts.rate_control}, Start {limiter.rate:.1f} {noun}s/s, "
+                  f"Target Latency {opts.target_latency_slots} Slot(s)")
+            control = RateControl(self.w3, pipeline, limiter, controller, self.cfg.slot_duration,
+                                  opts.target_latency_slots, opts.control_duration, self.run_dir).start()
+        try:
+            sent, failed, result = pipeline.run(items, start_block)
+        finally:
+            capacity = control.stop() if control is not None else None
+        self.refused_raw.update(pipeline.refused_raw)
+        if pipeline.unsent:
+            print(f"{len(pipeline.unsent)} {noun}s Signed but Not Sent (run drained)")
+            if self.pool is not None:
+                self.pool.unsent(tag for tag, _ in pipeline.unsent)
+        self.print_rejected(failed)
+        self.unconfirmed(result)
+        stages = pipeline.summary()
+        for name, s in stages.items():
+            rate = "n/a" if s["perSec"] is None else f"{s['perSec']:.1f}/s"
+            queue = "" if s["queueMax"] is None else f", queue max {s['queueMax']} mean {s['queueMean'] or 0:.1f}"
+            print(f"Stage {name} :: {s['items']} {noun}s, {rate}{queue}")
+        print(f"{len(result.included)} {noun}s Confirmed, {len(result.pending)} Pending, {len(result.dropped)} Dropped.")
+        if capacity is not None:
+            print_rate_summary(capacity, noun)
+        return sent, failed, result, pipeline.first_send, stages, capacity
+
+    def initial_rate(self):
+        """--initial-rate, else half a block of PER_TXN_GAS transactions per slot."""
+        if self.opts.initial_rate:
+            return self.opts.initial_rate
+        if self.cfg.gas_limit and self.cfg.per_txn_gas:
+            return max(1.0, self.cfg.gas_limit / self.cfg.per_txn_gas / self.cfg.slot_duration / 2)
+        return 10.0
+
+    def submit(self, signed):
+        """Send [(tag, raw_tx)]; returns ([(tag, tx_hash)], [(tag, error)])."""
+        noun = self.scenario.noun
+        if self.router is not None:
+            sent, failed = self.submit_routed(signed)
+        elif self.opts.async_submit:
+            sent, failed = submit_raw_transactions(
+                self.submit_url(), signed, self.opts.batch_size, self.opts.concurrency,
+                on_result=lambda ok, refused: (self.watch(ok), self.rejected(0, refused)),
+            )
+        else:
+            sent, failed = [], []
+            with ThreadPoolExecutor(max_workers=50) as executor:
+                future_to_tag = {executor.submit(self.w3.eth.send_raw_transaction, raw): tag for tag, raw in signed}
+                for future in as_completed(future_to_tag):
+                    tag = future_to_tag[future]
+                    try:
+                        sent.append((tag, future.result()))
+                        self.watch(sent[-1:])
+                    except Exception as e:
+                        failed.append((tag, str(e)))
+                        self.rejected(0, failed[-1:])
+        print(f"Submitted {len(sent)} {noun}s")
+        self.print_rejected(failed)
+        if failed:
+            raw_of = dict(signed)
+            self.refused_raw.update((tag, raw_of[tag]) for tag, _ in failed)
+        return sent, failed
+
+    def print_rejected(self, failed):
+        if failed:
+            errors = sorted({e for _, e in failed})
+            print(f"Error Submitting {len(failed)} {self.scenario.noun}s :: {errors[0]}"
+                  + (f" (+{len(errors) - 1} other error(s))" if len(errors) > 1 else ""))
+
+    def submit_routed(self, signed):
+        """Send [(tag, raw_tx)] to the ingress nodes chosen by the router, every node at once."""
+        groups = self.router.split(signed, self.sender_of)
+        sent, failed = [], []
+        with ThreadPoolExecutor(max_workers=len(groups)) as executor:
+            futures = [
+                executor.submit(submit_raw_transactions, self.router.urls[node], txs,
+                                self.opts.batch_size, self.opts.concurrency,
+                                on_result=lambda ok, refused, node=node: (self.watch(ok), self.rejected(node, refused)))
+                for node, txs in groups.items()
+            ]
+            for future in as_completed(futures):
+                node_sent, node_failed = future.result()
+                sent += node_sent
+                failed += node_failed
+        return sent, failed
+
+    def sender_of(self, tag):
+        if self.pool is not None:
+            return self.pool.addresses[self.pool.assigned[tag][0]]
+        return self.scenario.acct.address
+
+    def rejected(self, node, failed):
+        """Record [(tag, error)] refused by `node`."""
+        if not failed:
+            return
+        if self.events is not None:
+            for tag, e in failed:
+                self.events.emit("reject", tag=tag, node=node, error=e)
+        if self.propagation is not None:
+            self.propagation.note_rejected(node, len(failed))
+
+    def included(self, inc):
+        if self.events is not None:
+            self.events.emit("include", tag=inc.tag, hash=inc.tx_hash, block=inc.block_number,
+                             gas=inc.gas_used, status=inc.status)
+
+    def unconfirmed(self, result):
+        if self.events is not None:
+            for stage, txs in (("pending", result.pending), ("dropped", result.dropped)):
+                for tag, tx_hash in txs:
+                    self.events.emit(stage, tag=tag, hash=tx_hash)
+
+    def watch(self, sent):
+        """Log accepted submissions and hand them to the txpool sampler and propagation monitor."""
+        if not sent:
+            return
+        entries = []
+        for tag, tx_hash in sent:
+            if self.pool is not None:
+                k, nonce = self.pool.assigned[tag][:2]
+                entries.append((bytes(tx_hash), self.pool.addresses[k], nonce))
+            else:
+                entries.append((bytes(tx_hash), *self.nonce_of[tag]))
+        if self.events is not None:
+            for (tag, _), (tx_hash, sender, nonce) in zip(sent, entries):
+                node = self.router.node_of[tag] if self.router is not None else 0
+                self.events.emit("submit", tag=tag, hash=tx_hash, sender=sender, nonce=nonce, node=node)
+        if self.sampler is not None:
+            self.sampler.note_submitted(entries)
+        if self.propagation is not None:
+            self.propagation.note_submitted([(*e, self.router.node_of[tag]) for e, (tag, _) in zip(entries, sent)])
+
+    def resubmit_failed(self, failed):
+        """Re-sign and resend failed submissions, repairing their senders' nonces."""
+        max_fee, tip = fees(self.w3)
+        sent_all = []
+        for _ in range(self.cfg.submit_retries):
+            if not failed:
+                break
+            retry, known = self.pool.resign_failed(failed, self.to, self.selector, self.types, max_fee, tip,
+                                                   self.value, self.cfg.signing_workers, self.refused_raw)
+            if known:
+                # Already in the pool from an earlier attempt: track it like any other send
+                print(f"{len(known)} {self.scenario.noun}(s) Already Known")
+                self.watch(known)
+                sent_all += known
+            print(f"Retrying {len(retry)} {self.scenario.noun}(s)")
+            if self.events is not None:
+                for tag, _ in retry:
+                    self.events.emit("retry", tag=tag)
+            sent, failed = self.submit(retry)
+            sent_all += sent
+        return sent_all, failed
+
+    def confirm(self, sent, start_block):
+        noun = self.scenario.noun
+        tracker = ConfirmationTracker(self.w3, timeout=self.cfg.confirm_timeout, on_inclusion=self.included)
+        for tag, tx_hash in sent:
+            tracker.track(tag, tx_hash)
+        result = tracker.wait(start_block)
+        self.unconfirmed(result)
+        print(f"{len(result.included)} {noun}s Confirmed, {len(result.pending)} Pending, {len(result.dropped)} Dropped.")
+        return result
+
+    def profiler(self, run_dir):
+        if not self.opts.profile or self.local is not None:
+            return None
+        if self.opts.slot_profile:
+            return SlotProfiler(self.cfg.ipc_path, os.path.join(run_dir, "cpu_slots"),
+                                self.cfg.slot_duration, self.opts.slot_profile)
+        return RunProfiler(self.cfg.ipc_path, os.path.join(run_dir, "cpu.prof"))
+
+    def run_once(self, count, run_dir):
+        """One measured run; writes its artefacts to run_dir and returns its metrics."""
+        os.makedirs(run_dir, exist_ok=True)
+        self.run_dir = run_dir
+        self.refused_raw = {}
+        # The pipeline prints its own per-stage progress
+        events_path = os.path.join(run_dir, "events.ndjson")
+        self.events = EventLog(events_path, progress_interval=0 if self.opts.stream else self.opts.progress_interval)
+        self.scenario.events = self.events.start()
+        signed = None if self.opts.stream else self.sign(count)
+        start_block = self.w3.eth.block_number + 1
+        profiler = self.profiler(run_dir)
+        if profiler is not None:
+            profiler.start()
+        self.sampler = None
+        if self.opts.txpool_interval > 0:
+            self.sampler = TxpoolSampler(self.cfg.rpc_url, run_dir, self.opts.txpool_interval).start()
+        self.procs = None
+        if self.opts.proc_interval > 0 and self.local is None:
+            self.procs = ProcessSampler(self.cfg.rpc_url, run_dir, self.opts.proc_interval).start()
+        self.slots = None
+        if self.opts.slot_interval > 0 and self.cfg.beacon_urls:
+            self.slots = SlotMonitor(self.cfg.beacon_urls, run_dir, self.opts.slot_interval).start()
+        self.propagation = None
+        if self.router is not None and self.opts.propagation_interval > 0:
+            beacon = self.cfg.beacon_urls[0] if self.cfg.beacon_urls else None
+            self.propagation = PropagationMonitor(self.router.urls, run_dir, self.opts.propagation_interval,
+                                                  beacon).start()
+        t0 = time.time()
+        stages = capacity = None
+        if self.opts.stream:
+            sent, failed, confirmation, first_send, stages, capacity = self.stream(count, start_block)
+            if self.pool is not None and failed:
+                more, failed = self.resubmit_failed(failed)
+                sent += more
+                retried = self.confirm(more, start_block)
+                confirmation.included += retried.included
+                confirmation.pending += retried.pending
+                confirmation.dropped += retried.dropped
+        else:
+            sent, failed = self.submit(signed)
+            if self.pool is not None:
+                more, failed = self.resubmit_failed(failed)
+                sent += more
+            confirmation = self.confirm(sent, start_block)
+        end_block = max((inc.block_number for inc in confirmation.included), default=self.w3.eth.block_number)
+        end_block, extra = self.scenario.finalize(confirmation, start_block, end_block, run_dir)
+        segments = profiler.stop() if profiler is not None else None
+        wall = time.time() - t0
+        txpool = self.sampler.stop() if self.sampler is not None else {}
+        propagation = self.propagation.stop() if self.propagation is not None else {}
+        procs = self.procs.stop() if self.procs is not None else {}
+        slots = self.slots.stop() if self.slots is not None else {}
+        self.events.close()
+        self.scenario.events = self.events = None
+
+        # Counts, throughput and inclusion latency come from the run's event log
+        metrics = summarize_events(events_path)
+        metrics["wallSec"] = wall
+        metrics.update(self.generate_results(start_block, end_block, segments, run_dir))
+        metrics["tps"] = metrics["included"] / (metrics["blocks"] * self.cfg.slot_duration) if metrics["blocks"] else 0
+        metrics["cpuPerTx"] = metrics["execCpuSec"] / metrics["included"] if metrics["included"] else None
+        metrics.update(extra)
+        if stages is not None:
+            metrics["firstSendSec"] = first_send - t0 if first_send else None
+            metrics["pipeline"] = stages
+        if capacity is not None:
+            metrics.update(capacity)
+        if propagation:
+            metrics.update({
+                "fullPropagationSecP50": propagation["fullPropagationSecP50"],
+                "fullPropagationSecP90": propagation["fullPropagationSecP90"],
+                "proposerMarginSecP50": propagation["proposerMarginSecP50"],
+            })
+        if txpool:
+            metrics.update({
+                "txpoolPeakPending": txpool["peakPending"],
+                "txpoolEvictions": txpool["evictions"],
+                "txpoolMissing": txpool["missing"],
+                "submitSec": txpool["submitSec"],
+                "drainSec": txpool["drainSec"],
+                "bottleneck": txpool["bottleneck"],
+            })
+        if procs:
+            # CPU of every client process on the host, not just geth's block execution
+            metrics["nodeCpuSec"] = sum(p["cpuSec"] for p in procs.values())
+            metrics["processes"] = procs
+        if slots:
+            metrics.update({
+                "missedSlots": slots["missedSlots"],
+                "orphanedBlocks": slots["orphanedBlocks"],
+                "blockSeenSecP90": slots["blockSeenSecP90"],
+                "headLagSlotsMax": slots["headLagSlotsMax"],
+            })
+        return metrics
+
+    def generate_results(self, start_block, end_block, segments, run_dir):
+        slot = self.cfg.slot_duration
+        total_blocks = end_block - start_block + 1
+
+        # Block-based TPS + block details (hash-only, batched, cached by block hash)
+        block_details = scan_block_details(self.cfg.rpc_url, start_block, end_block, self.cfg.block_cache)
+        if segments and self.opts.slot_profile:
+            write_block_series(run_dir, segments, block_details, slot)
+        # Trim leading and trailing 0-tx blocks
+        while block_details and block_details[0]["txCount"] == 0:
+            block_details.pop(0)
+        while block_details and block_details[-1]["txCount"] == 0:
+            block_details.pop()
+        block_gas_total = sum(b["gasUsed"] for b in block_details)
+        with open(os.path.join(run_dir, "block_details.csv"), "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=BLOCK_FIELDS)
+            writer.writeheader()
+            writer.writerows(block_details)
+        block_tps = block_gas_total / (total_blocks * slot) if total_blocks > 0 else 0
+
+        cpu_breakdown = {}
+        exec_time = 0.0
+        if self.local is not None:
+            # Block building time of the in-process miner stands in for StateProcessor.Process
+            exec_time = self.local.exec_cpu(start_block, end_block)
+            cpu_breakdown = {"StateProcessor.Process": (exec_time, exec_time)}
+        elif segments:
+            profile = merge_profiles(segments)
+            profile.write_folded(os.path.join(run_dir, "cpu.folded"))
+            cpu_breakdown = profile.breakdown()
+            exec_time = cpu_breakdown["StateProcessor.Process"][1]
+        cpu_usage = exec_time / (total_blocks * slot) if total_blocks > 0 else 0
+
+        print("======== FINAL REPORT ========")
+        print(f"Blocks Used: {total_blocks}")
+        print(f"Total Gas in Blocks: {block_gas_total}")
+        print(f"Gas-Based Throughput: {block_tps:.2f}")
+        if cpu_breakdown:
+            print(f"Average CPU Usage by Execution Client (%): {cpu_usage*100:.2f}%")
+            print(f"Average CPU Usage by Execution Client (Time): {cpu_usage*slot:.2f} sec(s) out of {slot} secs")
+            for name, (flat, cum) in cpu_breakdown.items():
+                print(f"CPU Time in {name}: flat {flat:.2f} sec(s), cum {cum:.2f} sec(s)")
+        print("======== END ========")
+        return {
+            "startBlock": start_block,
+            "endBlock": end_block,
+            "blocks": total_blocks,
+            "gasTotal": block_gas_total,
+            "gasPerSec": block_tps,
+            "execCpuSec": exec_time,
+            "cpuUsage": cpu_usage,
+            "cpuBreakdown": {name: cum for name, (_, cum) in cpu_breakdown.items()},
+        }
+
+def start_local_backend(cfg, opts):
+    """Start the in-process EVM and point the config at it; returns (chain, cfg)."""
+    from local_chain import DEFAULT_ARTIFACTS, start_local_chain
+
+    # Without genesis keys in the environment use eth-tester's prefunded ones
+    keys = cfg.private_keys if all(cfg.private_keys) else [f"0x{i:064x}" for i in (1, 2, 3)]
+    artifacts = {
+        "verifier": cfg.verifier_abi_path or DEFAULT_ARTIFACTS["verifier"],
+        "vortex": cfg.vortex_abi_path or DEFAULT_ARTIFACTS["vortex"],
+    }
+    gas_limit = opts.block_gas_limit or cfg.gas_limit or 30_000_000
+    chain, url, addresses = start_local_chain(keys, gas_limit, opts.block_interval, artifacts)
+    print(f"Local Backend :: {url}, Gas Limit {gas_limit}, Block Every {opts.block_interval:g}s, "
+          f"Contracts {addresses or 'none (run npx hardhat compile)'}")
+    cfg = dataclasses.replace(
+        cfg, rpc_url=url, ws_url=None, ipc_path=None, private_keys=keys,
+        slot_duration=opts.block_interval, gas_limit=gas_limit,
+        verifier_address=addresses.get("verifier"), verifier_abi_path=artifacts["verifier"],
+        vortex_address=addresses.get("vortex"), vortex_abi_path=artifacts["vortex"],
+        block_cache=None,
+        # One in-process node: --nodes N routes over N connections to it
+        node_urls=[url] * max(1, opts.nodes), beacon_urls=[],
+    )
+    return chain, cfg
+
+def run_benchmark(cfg, scenario_cls, opts):
+    """Warm-up runs, then `opts.repeat` measured runs; returns the result document."""
+    local = None
+    if getattr(opts, "backend", "testnet") == "local":
+        local, cfg = start_local_backend(cfg, opts)
+    try:
+        return _run_benchmark(cfg, scenario_cls, opts, local)
+    finally:
+        if local is not None:
+            local.stop()
+
+def _run_benchmark(cfg, scenario_cls, opts, local):
+    runner = Runner(cfg, scenario_cls, opts, local)
+    if opts.rate_control:
+        opts.stream = True
+    # A controlled run streams lazily, so without --count it simply runs for --control-duration
+    count = opts.count or (STREAM_UNBOUNDED if opts.rate_control and opts.control_duration else cfg.default_count)
+    single = opts.repeat == 1 and opts.warmup == 0
+    base_dir = cfg.readings_dir if single else os.path.join(cfg.readings_dir, scenario_cls.name)
+
+    size = "until --control-duration" if count == STREAM_UNBOUNDED else f"{count} {runner.scenario.noun}s"
+    for k in range(opts.warmup):
+        print(f"======== WARM-UP {k + 1}/{opts.warmup} :: {scenario_cls.name} ========")
+        runner.run_once(count, os.path.join(base_dir, f"warmup_{k}"))
+    runs = []
+    for k in range(opts.repeat):
+        print(f"======== RUN {k + 1}/{opts.repeat} :: {scenario_cls.name}, {size} ========")
+        run_dir = base_dir if single else os.path.join(base_dir, f"run_{k}")
+        runs.append(runner.run_once(count, run_dir))
+
+    return {
+        "scenario": scenario_cls.name,
+        "description": scenario_cls.description,
+        "createdAt": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "count": None if count == STREAM_UNBOUNDED else count,
+        "warmup": opts.warmup,
+        "options": {k: v for k, v in vars(opts).items() if k not in ("cmd", "scenario", "out")},
+        "config": cfg.public(),
+        "runs": runs,
+        "summary": summarize_runs(runs, METRICS),
+    }
+
+def write_results(doc, path):
+    with open(path, "w") as f:
+        json.dump(doc, f, indent=2)
+    print(f"Results :: {path}")
@@ -0,0 +1,213 @@
+"""Scenario registry.
+
+A scenario says what to send: the target, ABI selector/types, value and
+[(tag, args, gas)] of `count` calls. Signing, submission, confirmation,
+profiling and reporting are shared by the runner. Scenarios with an
+off-chain leg (Vortex) extend the measured window in finalize().
+"""
+import json
+import time
+
+from eth_account import Account
+from web3 import Web3
+
+from proof_corpus import available_proof_ids, iter_proofs, load_proofs
+from tx_signing import GasEstimateCache, abi_function
+from vortex_report import DELAY_BLOCKS, report
+
+SCENARIOS = {}
+
+def register(cls):
+    SCENARIOS[cls.name] = cls
+    return cls
+
+def get_scenario(name):
+    try:
+        return SCENARIOS[name]
+    except KeyError:
+        raise ValueError(f"Unknown scenario {name}; choose from {', '.join(SCENARIOS)}")
+
+class Scenario:
+    name = None
+    noun = "Txn"
+    description = ""
+
+    def __init__(self, cfg, w3, key):
+        self.cfg = cfg
+        self.w3 = w3
+        self.key = key
+        self.acct = Account.from_key(key)
+        self.gas_cache = GasEstimateCache()
+        self.events = None      # the runner's EventLog while a run is in progress
+
+    def note_gas(self, tag, gas):
+        """Record a real gas estimate in the run's event log (the console when there is none)."""
+        if self.events is not None:
+            self.events.emit("estimate", tag=tag, gas=gas)
+        else:
+            print(f"Estimated Gas for {self.noun} {tag} :: {gas}")
+
+    def calls(self, count):
+        """Return (to, selector, types, value, [(tag, args, gas)])."""
+        raise NotImplementedError
+
+    def stream_calls(self, count):
+        """Like calls(), but the items come from an iterator produced on demand."""
+        to, selector, types, value, items = self.calls(count)
+        return to, selector, types, value, iter(items)
+
+    def finalize(self, confirmation, start_block, end_block, run_dir):
+        """Last block of the measured window and scenario-specific metrics."""
+        return end_block, {}
+
+@register
+class TransferScenario(Scenario):
+    name = "transfer"
+    description = "Plain ETH transfers between genesis accounts"
+
+    def calls(self, count):
+        to, selector, types, value, items = self.stream_calls(count)
+        return to, selector, types, value, list(items)
+
+    def stream_calls(self, count):
+        to = Account.from_key(next(k for k in self.cfg.private_keys if k != self.key)).address
+        value = self.w3.to_wei(0.1, "ether")
+        est = self.w3.eth.estimate_gas({"from": self.acct.address, "to": to, "value": value})
+        print(f"Estimated Gas for Txn :: {est}")
+        return to, b"", [], value, ((i, [], est) for i in range(count))
+
+class ProofScenario(Scenario):
+    noun = "Proof"
+    function = None
+    swap_g2 = False
+    sample = None
+
+    def contract_info(self):
+        raise NotImplementedError
+
+    def proof_args(self, proof):
+        pi_a, (b0, b1), pi_c, public = proof
+        # verifyProof takes the G2 coordinates swapped, announceProof stores them as snarkjs emits them
+        pi_b = [[b0[1], b0[0]], [b1[1], b1[0]]] if self.swap_g2 else [b0, b1]
+        return [pi_a, pi_b, pi_c, public]
+
+    def proof_ids(self):
+        ids = available_proof_ids(self.cfg.proofs_dir, self.cfg.corpus_path)
+        if not ids:
+            raise ValueError(f"No proofs in {self.cfg.corpus_path} or {self.cfg.proofs_dir}; "
+                             "generate them with generate_proof.py")
+        return ids
+
+    def load_contract(self):
+        address, abi_path = self.contract_info()
+        with open(abi_path) as f:
+            self.abi = json.load(f)["abi"]
+        self.contract = self.w3.eth.contract(address=Web3.to_checksum_address(address), abi=self.abi)
+
+    def calls(self, count):
+        self.load_contract()
+        available = self.proof_ids()
+        ids = [available[i % len(available)] for i in range(count)]
+        proofs = load_proofs(self.cfg.proofs_dir, self.cfg.corpus_path, sorted(set(ids)))
+        fn = getattr(self.contract.functions, self.function)
+        items = []
+        for i, proof_id in enumerate(ids):
+            args = self.proof_args(proofs[proof_id])
+            gas, sampled = self.gas_cache.get(
+                self.function, args, lambda: fn(*args).estimate_gas({"from": self.acct.address}),
+            )
+            if sampled:
+                self.note_gas(i, gas)
+            items.append((i, args, gas))
+        self.sample = proofs[ids[0]] if ids else None
+        selector, types = abi_function(self.abi, self.function)
+        return self.contract.address, selector, types, 0, items
+
+    def stream_calls(self, count):
+        """Proofs are decoded from the corpus one at a time as the pipeline pulls them."""
+        self.load_contract()
+        available = self.proof_ids()
+        fn = getattr(self.contract.functions, self.function)
+        self.sample = next(iter_proofs(self.cfg.proofs_dir, self.cfg.corpus_path, available[:1]))[1] if count else None
+
+        def items():
+            ids = (available[i % len(available)] for i in range(count))
+            for i, (_, proof) in enumerate(iter_proofs(self.cfg.proofs_dir, self.cfg.corpus_path, ids)):
+                args = self.proof_args(proof)
+                gas, sampled = self.gas_cache.get(
+                    self.function, args, lambda: fn(*args).estimate_gas({"from": self.acct.address}),
+                )
+                if sampled:
+                    self.note_gas(i, gas)
+                yield i, args, gas
+
+        selector, types = abi_function(self.abi, self.function)
+        return self.contract.address, selector, types, 0, items()
+
+@register
+class VerifyProofScenario(ProofScenario):
+    name = "verifyProof"
+    description = "On-chain Groth16Verifier.verifyProof"
+    function = "verifyProof"
+    swap_g2 = True
+
+    def contract_info(self):
+        return self.cfg.verifier_address, self.cfg.verifier_abi_path
+
+@register
+class VortexScenario(ProofScenario):
+    name = "vortex"
+    description = "VortexStorage.announceProof with off-chain verification and submitState"
+    function = "announceProof"
+
+    def contract_info(self):
+        return self.cfg.vortex_address, self.cfg.vortex_abi_path
+
+    def verify_proof_gas(self):
+        """eth_estimateGas of Groth16Verifier.verifyProof for one of the run's proofs, if deployed."""
+        if self.sample is None or not (self.cfg.verifier_address and self.cfg.verifier_abi_path):
+            return None
+        with open(self.cfg.verifier_abi_path) as f:
+            abi = json.load(f)["abi"]
+        verifier = self.w3.eth.contract(address=Web3.to_checksum_address(self.cfg.verifier_address), abi=abi)
+        pi_a, (b0, b1), pi_c, public = self.sample
+        try:
+            return verifier.functions.verifyProof(pi_a, [b0[::-1], b1[::-1]], pi_c, public).estimate_gas(
+                {"from": self.acct.address})
+        except Exception as e:
+            print(f"Error Estimating verifyProof Gas: {e}")
+            return None
+
+    def finalize(self, confirmation, start_block, end_block, run_dir):
+        """Wait out the validator's submit window and report announce-to-submit latency.
+
+        The window is extended to the last submitState block so its gas and
+        CPU are charged to the run. Latency, window misses and backlog are
+        written by vortex_report.report().
+        """
+        announced_in = {bytes(inc.tx_hash) for inc in confirmation.included}
+        deadline = end_block + DELAY_BLOCKS + 1
+        while self.w3.eth.block_number < deadline:
+            time.sleep(1)
+
+        proofs = {}
+        for log in self.contract.events.ProofAnnounced().get_logs(from_block=start_block, to_block=end_block):
+            if bytes(log["transactionHash"]) in announced_in:
+                proofs[log["args"]["proofId"]] = {
+                    "proof_id": log["args"]["proofId"], "announce_block": log["blockNumber"],
+                    "announce_tx": "0x" + bytes(log["transactionHash"]).hex(),
+                    "submit_block": None, "submit_tx": None,
+                }
+        for log in self.contract.events.StateSubmitted().get_logs(from_block=start_block, to_block=deadline):
+            p = proofs.get(log["args"]["proofId"])
+            if p is not None and p["submit_block"] is None:
+                p["submit_block"] = log["blockNumber"]
+                p["submit_tx"] = "0x" + bytes(log["transactionHash"]).hex()
+        finalized = sum(p["submit_block"] is not None for p in proofs.values())
+        print(f"Vortex :: {len(proofs)} Announced, {finalized} State Submitted")
+        last = max((p["submit_block"] for p in proofs.values() if p["submit_block"] is not None), default=end_block)
+        extra = {"announced": len(proofs), "stateSubmitted": finalized}
+        if proofs:
+            extra.update(report(self.cfg.rpc_url, list(proofs.values()), start_block, deadline, run_dir,
+                                self.cfg.block_cache, self.verify_proof_gas(), DELAY_BLOCKS))
+        return max(end_block, last), extra
@@ -0,0 +1,35 @@
+"""Summary statistics over repeated runs."""
+import math
+
+# Two-sided 95% Student t critical values by degrees of freedom
+T95 = [
+    12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+    2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+    2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042,
+]
+
+def t95(df):
+    return T95[df - 1] if df <= len(T95) else 1.96
+
+def summarize(values):
+    """{mean, stdev, ci95, n, min, max}; ci95 is the half-width of the 95% interval."""
+    vals = [v for v in values if v is not None and not math.isnan(v)]
+    n = len(vals)
+    if n == 0:
+        return {"mean": float("nan"), "stdev": float("nan"), "ci95": float("nan"), "n": 0, "min": None, "max": None}
+    mean = sum(vals) / n
+    stdev = math.sqrt(sum((v - mean) ** 2 for v in vals) / (n - 1)) if n > 1 else 0.0
+    ci = t95(n - 1) * stdev / math.sqrt(n) if n > 1 else float("nan")
+    return {"mean": mean, "stdev": stdev, "ci95": ci, "n": n, "min": min(vals), "max": max(vals)}
+
+def summarize_runs(runs, metrics):
+    return {m: summarize([r.get(m) for r in runs]) for m in metrics}
+
+def overlap(a, b):
+    """True if the 95% intervals of two summaries overlap.
+
+    False when either is undefined (a single run), so the threshold alone decides.
+    """
+    if math.isnan(a["ci95"]) or math.isnan(b["ci95"]):
+        return False
+    return abs(a["mean"] - b["mean"]) <= a["ci95"] + b["ci95"]
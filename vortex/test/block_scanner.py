@@ -0,0 +1,166 @@
+"""Batched, cached block-range scanner for the result reports.
+
+Blocks are fetched with hash-only transaction lists in JSON-RPC batches,
+several batches in flight at once, and reduced to the handful of header
+fields the reports use. Summaries are appended to an on-disk cache keyed
+by block hash. A re-scan fetches only the last block of the range and walks
+parentHash links back through the cache, so an unchanged range costs one
+request and a reorg only refetches the blocks that are no longer canonical.
+
+Usage: python block_scanner.py START END [--out block_details.csv]
+"""
+import argparse
+import asyncio
+import csv
+import json
+import os
+
+from rpc_async import AsyncRpcClient
+
+FIELDS = [
+    "blockNumber", "gasUsed", "baseFeePerGas", "txCount",
+    "gasLimit", "gasUtilisation", "blobGasUsed", "excessBlobGas", "timestamp", "timestampDelta",
+]
+
+def default_cache_path(readings_dir):
+    return os.getenv("BLOCK_CACHE") or os.path.join(readings_dir, "block_cache.jsonl")
+
+def summarize(block):
+    """Reduce an eth_getBlockByNumber result (hex fields) to the cached summary."""
+    q = lambda k: int(block.get(k) or "0x0", 16)
+    return {
+        "hash": block["hash"],
+        "parentHash": block["parentHash"],
+        "number": q("number"),
+        "gasUsed": q("gasUsed"),
+        "gasLimit": q("gasLimit"),
+        "baseFeePerGas": q("baseFeePerGas"),
+        "blobGasUsed": q("blobGasUsed"),
+        "excessBlobGas": q("excessBlobGas"),
+        "timestamp": q("timestamp"),
+        "txCount": len(block["transactions"]),
+    }
+
+class BlockCache:
+    """Append-only JSONL file of block summaries, indexed by block hash."""
+
+    def __init__(self, path):
+        self.path = path
+        self.by_hash = {}
+        if path and os.path.isfile(path):
+            with open(path) as f:
+                for line in f:
+                    try:
+                        rec = json.loads(line)
+                    except ValueError:
+                        continue    # torn last line from an interrupted run
+                    self.by_hash[rec["hash"]] = rec
+
+    def get(self, block_hash):
+        return self.by_hash.get(block_hash)
+
+    def add(self, records):
+        new = [r for r in records if r["hash"] not in self.by_hash]
+        for r in new:
+            self.by_hash[r["hash"]] = r
+        if self.path and new:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with open(self.path, "a") as f:
+                for r in new:
+                    f.write(json.dumps(r) + "\n")
+
+async def fetch_blocks(client, numbers, batch_size=100, concurrency=8):
+    """Fetch hash-only blocks for `numbers` in parallel batches; returns summaries."""
+    sem = asyncio.Semaphore(concurrency)
+
+    async def fetch(chunk):
+        calls = [("eth_getBlockByNumber", [hex(n), False]) for n in chunk]
+        async with sem:
+            results = await client.batch(calls)
+        out = []
+        for n, (block, err) in zip(chunk, results):
+            if err is not None or block is None:
+                raise RuntimeError(f"Block {n} unavailable: {err}")
+            out.append(summarize(block))
+        return out
+
+    chunks = [numbers[k:k + batch_size] for k in range(0, len(numbers), batch_size)]
+    blocks = []
+    for part in await asyncio.gather(*(fetch(c) for c in chunks)):
+        blocks += part
+    return blocks
+
+async def scan_range_async(url, start, end, cache=None, batch_size=100, concurrency=8):
+    cache = cache or BlockCache(None)
+    async with AsyncRpcClient(url) as client:
+        head = summarize(await client.call("eth_getBlockByNumber", [hex(end), False]))
+        cache.add([head])
+        # Walk back through cached parents; whatever is below the break is refetched
+        chain = [head]
+        while chain[-1]["number"] > start:
+            parent = cache.get(chain[-1]["parentHash"])
+            if parent is None:
+                break
+            chain.append(parent)
+        missing = list(range(start, chain[-1]["number"]))
+        if missing:
+            fetched = await fetch_blocks(client, missing, batch_size, concurrency)
+            cache.add(fetched)
+            chain += fetched
+    return sorted(chain, key=lambda b: b["number"]), len(missing) + 1
+
+def scan_range(url, start, end, cache_path=None, batch_size=100, concurrency=8):
+    """Summaries of blocks start..end (inclusive), ascending; returns (blocks, fetched)."""
+    return asyncio.run(scan_range_async(url, start, end, BlockCache(cache_path), batch_size, concurrency))
+
+def block_details(url, start_block, end_block, cache_path=None, batch_size=100, concurrency=8):
+    """block_details.csv rows for start_block..end_block with gas, blob and timing columns."""
+    first = max(0, start_block - 1)     # one block earlier for the first timestamp delta
+    blocks, fetched = scan_range(url, first, end_block, cache_path, batch_size, concurrency)
+    print(f"Scanned Blocks {start_block}..{end_block} :: {fetched} fetched, "
+          f"{len(blocks) - fetched} from cache")
+    rows = []
+    prev = None
+    for b in blocks:
+        if b["number"] >= start_block:
+            rows.append({
+                "blockNumber": b["number"],
+                "gasUsed": b["gasUsed"],
+                "baseFeePerGas": b["baseFeePerGas"],
+                "txCount": b["txCount"],
+                "gasLimit": b["gasLimit"],
+                "gasUtilisation": round(b["gasUsed"] / b["gasLimit"], 6) if b["gasLimit"] else 0,
+                "blobGasUsed": b["blobGasUsed"],
+                "excessBlobGas": b["excessBlobGas"],
+                "timestamp": b["timestamp"],
+                "timestampDelta": b["timestamp"] - prev["timestamp"] if prev else 0,
+            })
+        prev = b
+    return rows
+
+def write_block_details(path, rows):
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+def main():
+    parser = argparse.ArgumentParser(description="Scan a block range into block_details.csv")
+    parser.add_argument("start", type=int)
+    parser.add_argument("end", type=int)
+    parser.add_argument("--out", default=None)
+    parser.add_argument("--batch-size", type=int, default=100, help="blocks per JSON-RPC batch")
+    parser.add_argument("--concurrency", type=int, default=8, help="batches in flight")
+    args = parser.parse_args()
+
+    readings_dir = os.getenv("READINGS_DIR") or "."
+    rows = block_details(os.getenv("RPC_URL"), args.start, args.end,
+                         default_cache_path(readings_dir), args.batch_size, args.concurrency)
+    out = args.out or os.path.join(readings_dir, "block_details.csv")
+    write_block_details(out, rows)
+    print(f"Wrote {len(rows)} Block(s) :: {out}")
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+    load_dotenv("../.env")
+    main()
@@ -0,0 +1,276 @@
+"""Sweep the benchmark across circuits of growing verification cost.
+
+For every circuit (zk_circuit_0/1/2 and HighGasCircuit(n) for each --high-gas n):
+
+    1. build the artifacts with create_zk_circuit.sh into build/sweep/<name>-<hash>,
+       skipped when that directory is already complete (the hash covers the
+       circuit source and the ptau size)
+    2. generate a proof corpus there with generate_proof.py (resumable)
+    3. compile its Verifier.sol, then run the verifyProof and vortex scenarios
+    4. add one row per (circuit, scenario) to the matrix
+
+The matrix (sweep_matrix.csv / sweep_matrix.md in --out-dir) holds proving
+time, proof and calldata size, gas per transaction, achieved gas throughput
+and execution CPU, showing where Vortex starts to pay off as verification
+cost grows.
+
+With --backend testnet the contracts are deployed with scripts/deploy.js for
+each circuit and, for the vortex scenario, validator.js is started against
+that circuit's verification key.
+
+Usage: python circuit_sweep.py [--circuits zk_circuit_0,zk_circuit_1,zk_circuit_2] [--high-gas 1,10,40,80]
+                               [--proofs 200] [--count 200] [--backend local|testnet]
+"""
+import argparse
+import csv
+import hashlib
+import json
+import os
+import re
+import secrets
+import shutil
+import struct
+import subprocess
+import sys
+import time
+
+VORTEX_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+CIRCUITS_DIR = os.path.join(VORTEX_DIR, "circuits")
+SWEEP_DIR = os.path.join(VORTEX_DIR, "build", "sweep")
+VERIFIER_SOL = os.path.join(VORTEX_DIR, "contracts", "Verifier.sol")
+
+# Input shape per circuit, see generate_proof.proof_input()
+CIRCUIT_INPUTS = {"zk_circuit_0": "ab", "zk_circuit_1": "x", "zk_circuit_2": "merkle"}
+SCENARIOS = ["verifyProof", "vortex"]
+
+MATRIX_FIELDS = [
+    "circuit", "scenario", "nPublic", "constraints", "provingSec", "proofBytes", "calldataBytes",
+    "gasPerTx", "gasPerSec", "tps", "execCpuSec", "cpuPerTx", "included", "missRate",
+]
+
+def high_gas_source(n):
+    """zk_circuit_1 with HighGasCircuit(n) as its main component."""
+    with open(os.path.join(CIRCUITS_DIR, "zk_circuit_1.circom")) as f:
+        src = f.read()
+    return re.sub(r"component main = HighGasCircuit\(\d+\);", f"component main = HighGasCircuit({n});", src)
+
+def circuit_sources(names, high_gas):
+    """[(name, source, input kind)] for the requested circuits."""
+    out = []
+    for name in names:
+        with open(os.path.join(CIRCUITS_DIR, f"{name}.circom")) as f:
+            out.append((name, f.read(), CIRCUIT_INPUTS.get(name, "x")))
+    for n in high_gas:
+        out.append((f"high_gas_{n}", high_gas_source(n), "x"))
+    return out
+
+def circuit_hash(source, ptau_power):
+    return hashlib.sha256(f"{ptau_power}\n{source}".encode()).hexdigest()[:12]
+
+def r1cs_info(path):
+    """(constraints, public inputs + outputs) from the header section of a .r1cs file."""
+    with open(path, "rb") as f:
+        data = f.read()
+    pos = 12     # magic, version, section count
+    while pos < len(data):
+        kind, size = struct.unpack_from("<IQ", data, pos)
+        pos += 12
+        if kind == 1:
+            field_size = struct.unpack_from("<I", data, pos)[0]
+            at = pos + 4 + field_size
+            _, n_out, n_pub, _, _, n_constraints = struct.unpack_from("<IIIIQI", data, at)
+            return n_constraints, n_out + n_pub
+        pos += size
+    return None, None
+
+class CircuitBuild:
+    """One circuit's artifact directory under build/sweep."""
+
+    def __init__(self, name, source, input_kind, ptau_power):
+        self.name = name
+        self.source = source
+        self.input_kind = input_kind
+        self.ptau_power = ptau_power
+        self.dir = os.path.join(SWEEP_DIR, f"{name}-{circuit_hash(source, ptau_power)}")
+        self.meta_path = os.path.join(self.dir, "sweep.json")
+
+    @property
+    def verifier_sol(self):
+        return os.path.join(self.dir, "Verifier.sol")
+
+    def meta(self):
+        if not os.path.isfile(self.meta_path):
+            return {}
+        with open(self.meta_path) as f:
+            return json.load(f)
+
+    def save_meta(self, **fields):
+        meta = self.meta()
+        meta.update(fields)
+        with open(self.meta_path, "w") as f:
+            json.dump(meta, f, indent=1)
+
+    def build(self):
+        if self.meta().get("built"):
+            print(f"Build {self.name} :: cached in {self.dir}")
+            return
+        os.makedirs(self.dir, exist_ok=True)
+        src = os.path.join(self.dir, f"{self.name}.circom")
+        with open(src, "w") as f:
+            f.write(self.source)
+        env = dict(os.environ, CIRCUIT_PATH=src, CIRCUIT_BUILD_DIR=self.dir, PTAU_POWER=str(self.ptau_power),
+                   PTAU_DIR=SWEEP_DIR, VERIFIER_SOL=self.verifier_sol)
+        print(f"Build {self.name} :: {self.dir}")
+        # zkey contribute reads its entropy from stdin
+        subprocess.run(["bash", "create_zk_circuit.sh", self.name], cwd=VORTEX_DIR, env=env, check=True,
+                       input=(secrets.token_hex(32) + "\n") * 4, text=True)
+        constraints, n_public = r1cs_info(os.path.join(self.dir, f"{self.name}.r1cs"))
+        self.save_meta(built=True, circuit=self.name, constraints=constraints, nPublic=n_public)
+
+    def env(self):
+        return dict(os.environ, BUILD_DIR=self.dir, ZK_CIRCUIT_NAME=self.name, ZK_CIRCUIT_INPUT=self.input_kind,
+                    PROOF_CORPUS=os.path.join(self.dir, "proofs.corpus"))
+
+    def generate_proofs(self, count, workers):
+        """Fill the corpus up to `count` proofs; records seconds per proof when any were generated."""
+        proofs_dir = os.path.join(self.dir, "proofs")
+        have = sum(1 for i in range(count) if os.path.isfile(os.path.join(proofs_dir, str(i), "public.json")))
+        t0 = time.perf_counter()
+        subprocess.run([sys.executable, "generate_proof.py", "--start", "0", "--count", str(count),
+                        "--workers", str(workers)], env=self.env(), check=True)
+        made = count - have
+        if made > 0:
+            self.save_meta(provingSec=(time.perf_counter() - t0) / made * workers, provingWorkers=workers)
+
+def compile_verifier(build):
+    shutil.copyfile(build.verifier_sol, VERIFIER_SOL)
+    subprocess.run(["npx", "hardhat", "compile", "--quiet"], cwd=VORTEX_DIR, check=True)
+
+def deploy_contracts():
+    """Deploy with scripts/deploy.js; returns (verifier address, vortex address)."""
+    out = subprocess.run(["npx", "hardhat", "run", "scripts/deploy.js", "--network", "local"],
+                         cwd=VORTEX_DIR, check=True, capture_output=True, text=True).stdout
+    verifier = re.search(r"Verifier deployed to:\s*(0x[0-9a-fA-F]{40})", out).group(1)
+    vortex = re.search(r"VortexStorage deployed to:\s*(0x[0-9a-fA-F]{40})", out).group(1)
+    return verifier, vortex
+
+def run_scenario(build, scenario, args, out_path, addresses=None):
+    env = build.env()
+    if addresses:
+        env.update(VERIFIER_CONTRACT_ADDRESS=addresses[0], VORTEX_CONTRACT_ADDRESS=addresses[1])
+    cmd = [sys.executable, "-m", "benchmark", "run", scenario, "--backend", args.backend,
+           "--count", str(args.count), "--repeat", str(args.repeat), "--out", out_path]
+    if args.no_profile or args.backend == "local":
+        cmd.append("--no-profile")
+    validator = None
+    if scenario == "vortex" and args.backend == "testnet":
+        validator = subprocess.Popen(
+            ["node", os.path.join("scripts", "validator.js")], cwd=VORTEX_DIR,
+            env=dict(env, VERIFICATION_KEY=os.path.join(build.dir, "verification_key.json")),
+        )
+    try:
+        subprocess.run(cmd, env=env, check=True)
+    finally:
+        if validator is not None:
+            validator.terminate()
+            validator.wait()
+    with open(out_path) as f:
+        return json.load(f)
+
+def matrix_row(build, scenario, doc):
+    meta = build.meta()
+    n_public = meta.get("nPublic") or 0
+    mean = lambda m: (doc["summary"].get(m) or {}).get("mean")
+    runs = doc["runs"]
+    included = sum(r["included"] for r in runs)
+    gas_per_tx = sum(r["gasTotal"] for r in runs) / included if included else None
+    if scenario == "vortex" and mean("gasPerProof"):
+        gas_per_tx = mean("gasPerProof")
+    # uint256[2], uint256[2][2], uint256[2] plus the public inputs; announceProof
+    # takes them as a dynamic array (offset + length words)
+    words = 8 + n_public + (2 if scenario == "vortex" else 0)
+    return {
+        "circuit": build.name,
+        "scenario": scenario,
+        "nPublic": n_public,
+        "constraints": meta.get("constraints"),
+        "provingSec": meta.get("provingSec"),
+        "proofBytes": 32 * (8 + n_public),
+        "calldataBytes": 4 + 32 * words,
+        "gasPerTx": gas_per_tx,
+        "gasPerSec": mean("gasPerSec"),
+        "tps": mean("tps"),
+        "execCpuSec": mean("execCpuSec"),
+        "cpuPerTx": mean("cpuPerTx"),
+        "included": mean("included"),
+        "missRate": mean("missRate"),
+    }
+
+def write_matrix(out_dir, rows):
+    with open(os.path.join(out_dir, "sweep_matrix.csv"), "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=MATRIX_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+    def cell(v):
+        if v is None:
+            return ""
+        if isinstance(v, float):
+            return f"{v:.0f}" if abs(v) >= 1000 else f"{v:.4g}"
+        return str(v)
+
+    lines = ["| " + " | ".join(MATRIX_FIELDS) + " |", "|" + "---|" * len(MATRIX_FIELDS)]
+    lines += ["| " + " | ".join(cell(r[k]) for k in MATRIX_FIELDS) + " |" for r in rows]
+    with open(os.path.join(out_dir, "sweep_matrix.md"), "w") as f:
+        f.write("\n".join(lines) + "\n")
+    print("\n".join(lines))
+
+def main():
+    parser = argparse.ArgumentParser(description="Build, prove and benchmark a range of circuits")
+    parser.add_argument("--circuits", default="zk_circuit_0,zk_circuit_1,zk_circuit_2",
+                        help="comma-separated circuits/*.circom names")
+    parser.add_argument("--high-gas", default="1,10,40,80", help="comma-separated n for HighGasCircuit(n)")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--proofs", type=int, default=200, help="corpus size per circuit")
+    parser.add_argument("--count", type=int, default=200, help="transactions per benchmark run")
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="proof generation processes")
+    parser.add_argument("--ptau-power", type=int, default=15)
+    parser.add_argument("--backend", choices=["local", "testnet"], default="local")
+    parser.add_argument("--no-profile", action="store_true")
+    parser.add_argument("--skip-bench", action="store_true", help="only build and prove")
+    parser.add_argument("--out-dir", default=None, help="default READINGS_DIR/sweep")
+    args = parser.parse_args()
+
+    names = [c for c in args.circuits.split(",") if c]
+    high_gas = [int(n) for n in args.high_gas.split(",") if n]
+    scenarios = [s for s in args.scenarios.split(",") if s]
+    out_dir = args.out_dir or os.path.join(os.getenv("READINGS_DIR") or "readings", "sweep")
+    os.makedirs(out_dir, exist_ok=True)
+
+    builds = [CircuitBuild(name, src, kind, args.ptau_power) for name, src, kind in circuit_sources(names, high_gas)]
+    original_verifier = open(VERIFIER_SOL).read() if os.path.isfile(VERIFIER_SOL) else None
+    rows = []
+    try:
+        for build in builds:
+            build.build()
+            build.generate_proofs(args.proofs, args.workers)
+            if args.skip_bench:
+                continue
+            compile_verifier(build)
+            addresses = deploy_contracts() if args.backend == "testnet" else None
+            for scenario in scenarios:
+                print(f"======== SWEEP :: {build.name}, {scenario} ========")
+                doc = run_scenario(build, scenario, args, os.path.join(out_dir, f"{build.name}_{scenario}.json"),
+                                   addresses)
+                rows.append(matrix_row(build, scenario, doc))
+                write_matrix(out_dir, rows)
+    finally:
+        if original_verifier is not None:
+            with open(VERIFIER_SOL, "w") as f:
+                f.write(original_verifier)
+    print(f"Sweep :: {len(builds)} circuit(s), {len(rows)} row(s) :: {out_dir}")
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+    load_dotenv("../.env")
+    main()
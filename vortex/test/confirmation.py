@@ -0,0 +1,120 @@
+"""Block-driven transaction confirmation.
+
+Instead of polling `eth_getTransactionReceipt` once per hash, follow the head
+by polling the block number, fetch every new block's receipts once
+(`eth_getBlockReceipts`, falling back to the block's hash list) and match them
+against the set of outstanding hashes.
+"""
+import time
+from dataclasses import dataclass, field
+
+@dataclass
+class Inclusion:
+    tag: object
+    tx_hash: bytes
+    block_number: int
+    gas_used: int
+    status: int
+    seen_at: float = 0.0    # wall time the block was picked up by the tracker
+
+@dataclass
+class ConfirmationResult:
+    included: list = field(default_factory=list)
+    pending: list = field(default_factory=list)   # still known to the node when we gave up
+    dropped: list = field(default_factory=list)   # unknown to the node: evicted or never accepted
+    start_block: int = 0
+    end_block: int = 0
+
+    @property
+    def failed(self):
+        return [inc for inc in self.included if inc.status != 1]
+
+RECEIPT_ATTEMPTS = 3    # tries of eth_getBlockReceipts per block before a transient error is raised
+
+def method_missing(e):
+    """True when a JSON-RPC error says the node does not implement the method."""
+    response = getattr(e, "rpc_response", None)
+    error = (response.get("error") or {}) if isinstance(response, dict) else {}
+    msg = str(error.get("message") or e).lower()
+    return error.get("code") == -32601 or "-32601" in msg or "does not exist" in msg or "not available" in msg
+
+class ConfirmationTracker:
+    def __init__(self, w3, poll_interval=0.5, timeout=300, on_inclusion=None):
+        self.w3 = w3
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+        self.on_inclusion = on_inclusion
+        self.outstanding = {}
+        self._block_receipts = True
+
+    def track(self, tag, tx_hash):
+        self.outstanding[bytes(tx_hash)] = tag
+
+    def _receipts(self, number):
+        """Receipts of the outstanding transactions in block `number`."""
+        for attempt in range(RECEIPT_ATTEMPTS if self._block_receipts else 0):
+            try:
+                return [r for r in self.w3.eth.get_block_receipts(number)
+                        if bytes(r["transactionHash"]) in self.outstanding]
+            except Exception as e:
+                if method_missing(e):
+                    # Node without eth_getBlockReceipts: fall back to hashes + per-match receipts
+                    self._block_receipts = False
+                    break
+                # A timeout or dropped connection must not switch the confirm path for the rest of the run
+                if attempt == RECEIPT_ATTEMPTS - 1:
+                    raise
+                time.sleep(self.poll_interval)
+        block = self.w3.eth.get_block(number, full_transactions=False)
+        return [self.w3.eth.get_transaction_receipt(h)
+                for h in block.transactions if bytes(h) in self.outstanding]
+
+    def _scan(self, number, result):
+        seen_at = time.time()
+        for r in self._receipts(number):
+            tx_hash = bytes(r["transactionHash"])
+            inc = Inclusion(self.outstanding.pop(tx_hash), tx_hash, r["blockNumber"], r["gasUsed"], r["status"], seen_at)
+            result.included.append(inc)
+            if self.on_inclusion is not None:
+                self.on_inclusion(inc)
+
+    def wait(self, start_block, until=None):
+        """Follow blocks from start_block until every tracked hash is included or
+        no new inclusion happens for `timeout` seconds.
+
+        `until` lets hashes be tracked while waiting (from another thread):
+        the tracker keeps following blocks until it returns True.
+        """
+        result = ConfirmationResult(start_block=start_block)
+        next_block = start_block
+        last_progress = time.monotonic()
+
+        def timed_out():
+            done_adding = until is None or until()
+            return done_adding and time.monotonic() - last_progress > self.timeout
+
+        while self.outstanding or (until is not None and not until()):
+            head = self.w3.eth.block_number
+            if head < next_block:
+                if timed_out():
+                    break
+                time.sleep(self.poll_interval)
+                continue
+            before = len(self.outstanding)
+            for number in range(next_block, head + 1):
+                self._scan(number, result)
+            next_block = head + 1
+            if len(self.outstanding) < before:
+                last_progress = time.monotonic()
+            elif timed_out():
+                break
+        result.end_block = next_block - 1
+
+        for tx_hash, tag in self.outstanding.items():
+            try:
+                known = self.w3.eth.get_transaction(tx_hash) is not None
+            except Exception:
+                known = False
+            (result.pending if known else result.dropped).append((tag, tx_hash))
+        self.outstanding = {}
+        return result
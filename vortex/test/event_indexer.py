@@ -0,0 +1,320 @@
+"""Checkpointed SQLite index of VortexStorage ProofAnnounced / StateSubmitted events.
+
+The indexer walks the chain from a persisted cursor in adaptive eth_getLogs
+ranges: a range grows while responses stay small and is halved when the node
+rejects it (result limits, timeouts). Each range's logs are decoded in bulk
+and written in one transaction together with the new cursor, so a crash never
+leaves the cursor ahead of the data.
+
+The hash of every range end is kept as a checkpoint. Before a sync the
+newest checkpoints are compared against the canonical chain; on a mismatch
+everything above the last matching checkpoint is rolled back and re-indexed.
+
+One row per proof holds the announcement, the submitted state and a
+`status` column (pending, verifying, verified, failed, submitted) that
+verifiers update, so consumers query by status or proofId instead of
+keeping proofs in memory.
+
+Usage: python event_indexer.py sync [--from-block N] [--follow] [--interval 2]
+       python event_indexer.py status
+       python event_indexer.py show PROOF_ID
+"""
+import argparse
+import asyncio
+import json
+import os
+import sqlite3
+import time
+
+from eth_abi import decode
+from eth_utils import keccak
+
+from rpc_async import AsyncRpcClient, RpcError
+
+PROOF_ANNOUNCED = "0x" + keccak(text="ProofAnnounced(uint256,address,uint256[2],uint256[2][2],uint256[2],uint256[])").hex()
+STATE_SUBMITTED = "0x" + keccak(text="StateSubmitted(uint256,bytes32)").hex()
+ANNOUNCED_DATA = ["uint256[2]", "uint256[2][2]", "uint256[2]", "uint256[]"]
+
+STATUSES = ("pending", "verifying", "verified", "failed", "submitted")
+MIN_SPAN = 1
+MAX_SPAN = 10_000
+TARGET_LOGS = 5_000     # grow the range while responses stay below this
+KEEP_CHECKPOINTS = 256
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS proofs (
+    proof_id        INTEGER PRIMARY KEY,
+    submitter       TEXT,
+    a               TEXT,
+    b               TEXT,
+    c               TEXT,
+    public_inputs   TEXT,
+    announce_block  INTEGER,
+    announce_tx     TEXT,
+    state           TEXT,
+    submit_block    INTEGER,
+    submit_tx       TEXT,
+    status          TEXT NOT NULL DEFAULT 'pending',
+    updated_at      REAL
+);
+CREATE INDEX IF NOT EXISTS proofs_status ON proofs (status, announce_block);
+CREATE INDEX IF NOT EXISTS proofs_announce_block ON proofs (announce_block);
+CREATE INDEX IF NOT EXISTS proofs_submit_block ON proofs (submit_block);
+CREATE TABLE IF NOT EXISTS checkpoints (
+    block_number    INTEGER PRIMARY KEY,
+    block_hash      TEXT NOT NULL
+);
+"""
+
+def default_db_path(readings_dir):
+    return os.getenv("EVENT_DB") or os.path.join(readings_dir, "events.db")
+
+def _int(word):
+    return int(word, 16) if isinstance(word, str) else int(word)
+
+def decode_logs(logs):
+    """Split raw eth_getLogs results into (announced rows, submitted rows)."""
+    announced, submitted = [], []
+    for log in logs:
+        if log.get("removed"):
+            continue
+        topics = log["topics"]
+        block, tx = _int(log["blockNumber"]), log["transactionHash"]
+        if topics[0] == PROOF_ANNOUNCED:
+            a, b, c, public = decode(ANNOUNCED_DATA, bytes.fromhex(log["data"][2:]))
+            announced.append((
+                _int(topics[1]), "0x" + topics[2][-40:],
+                json.dumps([str(x) for x in a]), json.dumps([[str(x) for x in r] for r in b]),
+                json.dumps([str(x) for x in c]), json.dumps([str(x) for x in public]),
+                block, tx,
+            ))
+        elif topics[0] == STATE_SUBMITTED:
+            submitted.append((_int(topics[1]), log["data"][:66], block, tx))
+    return announced, submitted
+
+class EventIndex:
+    """The SQLite side: schema, cursor, rollback and the status queries."""
+
+    def __init__(self, path):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.db = sqlite3.connect(path, timeout=30)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def cursor(self):
+        """(block_number, block_hash) of the last indexed block, or None."""
+        row = self.db.execute(
+            "SELECT block_number, block_hash FROM checkpoints ORDER BY block_number DESC LIMIT 1").fetchone()
+        return tuple(row) if row else None
+
+    def checkpoints(self, limit=KEEP_CHECKPOINTS):
+        return [tuple(r) for r in self.db.execute(
+            "SELECT block_number, block_hash FROM checkpoints ORDER BY block_number DESC LIMIT ?", (limit,))]
+
+    def store(self, logs, block_number, block_hash):
+        """Write one range's logs and advance the cursor, atomically."""
+        announced, submitted = decode_logs(logs)
+        now = time.time()
+        with self.db:
+            self.db.executemany(
+                "INSERT INTO proofs (proof_id, submitter, a, b, c, public_inputs, announce_block, announce_tx, updated_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT (proof_id) DO UPDATE SET submitter=excluded.submitter, a=excluded.a, b=excluded.b,"
+                " c=excluded.c, public_inputs=excluded.public_inputs, announce_block=excluded.announce_block,"
+                " announce_tx=excluded.announce_tx, updated_at=excluded.updated_at",
+                [row + (now,) for row in announced])
+            self.db.executemany(
+                "INSERT INTO proofs (proof_id, state, submit_block, submit_tx, status, updated_at)"
+                " VALUES (?, ?, ?, ?, 'submitted', ?)"
+                " ON CONFLICT (proof_id) DO UPDATE SET state=excluded.state, submit_block=excluded.submit_block,"
+                " submit_tx=excluded.submit_tx, status='submitted', updated_at=excluded.updated_at"
+                " WHERE proofs.submit_block IS NULL",
+                [row + (now,) for row in submitted])
+            self.db.execute("INSERT OR REPLACE INTO checkpoints VALUES (?, ?)", (block_number, block_hash))
+            self.db.execute(
+                "DELETE FROM checkpoints WHERE block_number NOT IN"
+                " (SELECT block_number FROM checkpoints ORDER BY block_number DESC LIMIT ?)", (KEEP_CHECKPOINTS,))
+        return len(announced), len(submitted)
+
+    def rollback(self, block_number):
+        """Forget everything indexed above block_number (a reorged-out suffix)."""
+        with self.db:
+            self.db.execute(
+                "UPDATE proofs SET state=NULL, submit_block=NULL, submit_tx=NULL, updated_at=?,"
+                " status=CASE status WHEN 'submitted' THEN 'verified' ELSE status END"
+                " WHERE submit_block > ?", (time.time(), block_number))
+            self.db.execute(
+                "UPDATE proofs SET submitter=NULL, a=NULL, b=NULL, c=NULL, public_inputs=NULL,"
+                " announce_block=NULL, announce_tx=NULL WHERE announce_block > ?", (block_number,))
+            self.db.execute("DELETE FROM proofs WHERE announce_block IS NULL AND submit_block IS NULL")
+            self.db.execute("DELETE FROM checkpoints WHERE block_number > ?", (block_number,))
+
+    def set_status(self, proof_ids, status, expect=None):
+        """Move proofs to `status`; with `expect`, only those currently in that status.
+
+        Returns the number of rows changed, so `set_status(ids, "verifying",
+        expect="pending")` doubles as a claim when several verifiers share the index.
+        """
+        if status not in STATUSES:
+            raise ValueError(f"Unknown status {status!r}")
+        ids = [int(i) for i in proof_ids]
+        sql = f"UPDATE proofs SET status=?, updated_at=? WHERE proof_id IN ({','.join('?' * len(ids))})"
+        params = [status, time.time(), *ids]
+        if expect is not None:
+            sql += " AND status=?"
+            params.append(expect)
+        with self.db:
+            return self.db.execute(sql, params).rowcount if ids else 0
+
+    def proofs(self, status=None, limit=None, from_block=None):
+        """Proof rows ordered by announcement block, optionally filtered."""
+        sql, params = "SELECT * FROM proofs WHERE 1=1", []
+        if status is not None:
+            sql += " AND status=?"
+            params.append(status)
+        if from_block is not None:
+            sql += " AND announce_block >= ?"
+            params.append(from_block)
+        sql += " ORDER BY announce_block, proof_id"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [dict(r) for r in self.db.execute(sql, params)]
+
+    def get(self, proof_id):
+        row = self.db.execute("SELECT * FROM proofs WHERE proof_id=?", (int(proof_id),)).fetchone()
+        return dict(row) if row else None
+
+    def counts(self):
+        return dict(self.db.execute("SELECT status, COUNT(*) FROM proofs GROUP BY status").fetchall())
+
+class Indexer:
+    """Moves an EventIndex forward against one node."""
+
+    def __init__(self, index, url, address, start_block=0, confirmations=0, span=1000):
+        self.index = index
+        self.url = url
+        self.address = address
+        self.start_block = start_block
+        self.confirmations = confirmations
+        self.span = span
+
+    async def _hashes(self, client, numbers):
+        results = await client.batch([("eth_getBlockByNumber", [hex(n), False]) for n in numbers])
+        return [block["hash"] if block else None for block, _ in results]
+
+    async def check_reorg(self, client):
+        """Roll back to the newest checkpoint that is still canonical; returns the rollback block or None."""
+        cps = self.index.checkpoints()
+        if not cps:
+            return None
+        if (await self._hashes(client, [cps[0][0]]))[0] == cps[0][1]:
+            return None
+        canonical = await self._hashes(client, [n for n, _ in cps])
+        keep = next((n for (n, h), c in zip(cps, canonical) if h == c), self.start_block - 1)
+        self.index.rollback(keep)
+        print(f"Reorg :: rolled back to Block {keep}")
+        return keep
+
+    async def fetch_range(self, client, first, last):
+        """eth_getLogs for both events plus the hash of `last`, in one batch."""
+        flt = {"fromBlock": hex(first), "toBlock": hex(last), "address": self.address,
+               "topics": [[PROOF_ANNOUNCED, STATE_SUBMITTED]]}
+        (logs, err), (block, block_err) = await client.batch([
+            ("eth_getLogs", [flt]), ("eth_getBlockByNumber", [hex(last), False])])
+        if err is not None or block is None:
+            raise RpcError(err or block_err or f"Block {last} unavailable")
+        return logs, block["hash"]
+
+    async def sync_async(self):
+        """Index up to head - confirmations; returns (blocks, announced, submitted)."""
+        totals = [0, 0, 0]
+        async with AsyncRpcClient(self.url) as client:
+            await self.check_reorg(client)
+            head = int(await client.call("eth_blockNumber"), 16) - self.confirmations
+            cursor = self.index.cursor()
+            first = cursor[0] + 1 if cursor else self.start_block
+            while first <= head:
+                last = min(head, first + self.span - 1)
+                try:
+                    logs, block_hash = await self.fetch_range(client, first, last)
+                except (RpcError, asyncio.TimeoutError) as e:
+                    if self.span == MIN_SPAN:
+                        raise
+                    self.span = max(MIN_SPAN, self.span // 2)
+                    print(f"getLogs {first}..{last} failed ({e}) :: span {self.span}")
+                    continue
+                n_ann, n_sub = self.index.store(logs, last, block_hash)
+                totals[0] += last - first + 1
+                totals[1] += n_ann
+                totals[2] += n_sub
+                if len(logs) < TARGET_LOGS // 2:
+                    self.span = min(MAX_SPAN, self.span * 2)
+                elif len(logs) > TARGET_LOGS:
+                    self.span = max(MIN_SPAN, self.span // 2)
+                first = last + 1
+        return tuple(totals)
+
+    def sync(self):
+        return asyncio.run(self.sync_async())
+
+    def follow(self, interval=2.0):
+        while True:
+            start = time.perf_counter()
+            blocks, ann, sub = self.sync()
+            if blocks:
+                print(f"Indexed {blocks} Block(s) to {self.index.cursor()[0]} :: {ann} announced, {sub} submitted "
+                      f"({time.perf_counter() - start:.2f}s)")
+            time.sleep(interval)
+
+def main():
+    parser = argparse.ArgumentParser(description="Index VortexStorage events into SQLite")
+    parser.add_argument("--db", default=None, help="SQLite file (default EVENT_DB or READINGS_DIR/events.db)")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    sync = sub.add_parser("sync", help="index from the cursor to the head")
+    sync.add_argument("--from-block", type=int, default=int(os.getenv("EVENT_START_BLOCK") or 0),
+                      help="first block when the index is empty")
+    sync.add_argument("--confirmations", type=int, default=0, help="stay this many blocks behind the head")
+    sync.add_argument("--span", type=int, default=1000, help="initial eth_getLogs range")
+    sync.add_argument("--follow", action="store_true", help="keep polling the head")
+    sync.add_argument("--interval", type=float, default=2.0, help="seconds between polls with --follow")
+    sub.add_parser("status", help="print the cursor and proof counts by status")
+    show = sub.add_parser("show", help="print one proof row")
+    show.add_argument("proof_id", type=int)
+    args = parser.parse_args()
+
+    with EventIndex(args.db or default_db_path(os.getenv("READINGS_DIR") or ".")) as index:
+        if args.cmd == "status":
+            print(f"Cursor :: {index.cursor()}")
+            for status, n in sorted(index.counts().items()):
+                print(f"{status:<10} {n}")
+        elif args.cmd == "show":
+            print(json.dumps(index.get(args.proof_id), indent=1))
+        else:
+            address = os.getenv("VORTEX_CONTRACT_ADDRESS")
+            if not address:
+                raise SystemExit("Set VORTEX_CONTRACT_ADDRESS")
+            indexer = Indexer(index, os.getenv("RPC_URL"), address, args.from_block, args.confirmations, args.span)
+            if args.follow:
+                indexer.follow(args.interval)
+            start = time.perf_counter()
+            blocks, ann, sub_ = indexer.sync()
+            print(f"Indexed {blocks} Block(s) :: {ann} announced, {sub_} submitted "
+                  f"({time.perf_counter() - start:.2f}s), cursor {index.cursor()}")
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+    load_dotenv("../.env")
+    main()
@@ -0,0 +1,144 @@
+"""Buffered NDJSON event log for the stress runs.
+
+The hot path only appends a tuple to a deque: EventLog.emit(stage, **fields)
+stamps it with time.monotonic_ns() and returns. A background thread drains
+the deque every `flush_interval` seconds, serialises the events as one JSON
+object per line and, every `progress_interval` seconds, prints a one-line
+count per stage instead of a line per transaction.
+
+    {"t": 81234567890123, "stage": "submit", "tag": 17, "hash": "0x...", "nonce": 42, "node": 0}
+    {"t": 81236012345678, "stage": "include", "tag": 17, "hash": "0x...", "block": 1203, "gas": 231807, "status": 1}
+
+`t` is monotonic nanoseconds; the first line ("stage": "start") pairs it with
+wall time. Stages written by the benchmark runner: estimate, submit, reject,
+retry, include, pending, dropped. summarize() rebuilds the run's counts,
+submit/inclusion throughput and submit-to-inclusion latency from the file.
+
+Usage: python event_log.py summarize READINGS_DIR/events.ndjson
+"""
+import argparse
+import json
+import os
+import threading
+import time
+from collections import deque
+
+from percentiles import percentile
+
+def _default(value):
+    if isinstance(value, (bytes, bytearray)):
+        return "0x" + bytes(value).hex()
+    raise TypeError(f"{type(value).__name__} is not JSON serialisable")
+
+class EventLog:
+    def __init__(self, path, flush_interval=0.5, progress_interval=2.0, label="Progress"):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.progress_interval = progress_interval
+        self.label = label
+        self.counts = {}
+        self._events = deque()
+        self._stop = threading.Event()
+        self._thread = None
+        self._file = None
+
+    def start(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._file = open(self.path, "w")
+        self.emit("start", wall=time.time())
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def emit(self, stage, **fields):
+        self._events.append((time.monotonic_ns(), stage, fields))
+        self.counts[stage] = self.counts.get(stage, 0) + 1
+
+    def _flush(self):
+        lines = []
+        while self._events:
+            t, stage, fields = self._events.popleft()
+            lines.append(json.dumps({"t": t, "stage": stage, **fields}, default=_default))
+        if lines:
+            self._file.write("\n".join(lines) + "\n")
+            self._file.flush()
+
+    def _run(self):
+        last_progress = time.monotonic()
+        while not self._stop.wait(self.flush_interval):
+            self._flush()
+            if self.progress_interval and time.monotonic() - last_progress >= self.progress_interval:
+                last_progress = time.monotonic()
+                self.print_progress()
+
+    def print_progress(self):
+        counts = {k: v for k, v in self.counts.items() if k != "start"}
+        if counts:
+            print(f"{self.label} :: " + ", ".join(f"{k} {v}" for k, v in counts.items()))
+
+    def close(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        if self._file is not None:
+            self._flush()
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
+
+def read_events(path):
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+def summarize(path):
+    """Counts, throughput and submit-to-inclusion latency of one run, from its event log."""
+    submitted, included, counts = {}, [], {}
+    refused = set()     # tags whose last submission attempt was rejected
+    for e in read_events(path):
+        stage = e["stage"]
+        counts[stage] = counts.get(stage, 0) + 1
+        if stage == "submit":
+            submitted[e["hash"]] = e["t"]
+            refused.discard(e["tag"])
+        elif stage == "reject":
+            refused.add(e["tag"])
+        elif stage == "include":
+            included.append(e)
+    latency = [(e["t"] - submitted[e["hash"]]) / 1e9 for e in included if e["hash"] in submitted]
+    submit_times = sorted(submitted.values())
+    include_times = sorted(e["t"] for e in included)
+    span = lambda ts: (ts[-1] - ts[0]) / 1e9 if len(ts) > 1 else 0
+    return {
+        "sent": counts.get("submit", 0),
+        "rejected": len(refused),
+        "included": counts.get("include", 0),
+        "reverted": sum(e.get("status") != 1 for e in included),
+        "pending": counts.get("pending", 0),
+        "dropped": counts.get("dropped", 0),
+        "gasUsed": sum(e.get("gas", 0) for e in included),
+        "submitPerSec": len(submit_times) / span(submit_times) if span(submit_times) else None,
+        "includePerSec": len(include_times) / span(include_times) if span(include_times) else None,
+        "inclusionSecP50": percentile(latency, 0.5),
+        "inclusionSecP90": percentile(latency, 0.9),
+        "inclusionSecP99": percentile(latency, 0.99),
+        "inclusionSecMax": max(latency, default=None),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect a stress-run event log")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    s_ = sub.add_parser("summarize", help="counts, throughput and inclusion latency")
+    s_.add_argument("path")
+    args = parser.parse_args()
+    for k, v in summarize(args.path).items():
+        print(f"{k} :: {v:.3f}" if isinstance(v, float) else f"{k} :: {v}")
+
+if __name__ == "__main__":
+    main()
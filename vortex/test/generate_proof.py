@@ -1,23 +1,50 @@
+import argparse
 import json
 import os
 import random
 import secrets
 import subprocess
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from dotenv import load_dotenv
 
+from proof_corpus import convert_proof_dirs, default_corpus_path
+from prover_client import ProverClient, write_proof_files
+from witness_calculator import WitnessCalculator
+
 load_dotenv("../.env")
 
 BUILD_DIR = os.getenv("BUILD_DIR")
 PROOFS_DIR = os.path.join(BUILD_DIR, "proofs")
+SCRATCH_DIR = os.path.join(BUILD_DIR, "scratch")
+CORPUS_PATH = default_corpus_path(BUILD_DIR)
 CIRCUIT_NAME = os.getenv("ZK_CIRCUIT_NAME")
+# Input shape of the circuit: "x" (HighGasCircuit), "ab" (Multiplier) or "merkle" (ZKProof2)
+CIRCUIT_INPUT = os.getenv("ZK_CIRCUIT_INPUT") or "x"
+WASM_PATH = os.path.join(BUILD_DIR, f"{CIRCUIT_NAME}_js", f"{CIRCUIT_NAME}.wasm")
 os.makedirs(PROOFS_DIR, exist_ok=True)
 
+# Per-process scratch directory for input.json / witness.wtns, set by init_worker()
+worker_scratch_dir = BUILD_DIR
+# In-process WitnessCalculator replacing `node generate_witness.js`, set by init_worker()
+witness_calc = None
+# Per-process prover_daemon.js that takes the in-memory witnesses, set by init_worker()
+witness_prover = None
+
 def create_proof_path(i):
     """Return folder path for proof #i."""
     p = os.path.join(PROOFS_DIR, str(i))
     os.makedirs(p, exist_ok=True)
     return p
 
+def proof_exists(i):
+    """Return True if proof #i already has a non-empty proof.json and public.json."""
+    p = os.path.join(PROOFS_DIR, str(i))
+    for name in ("proof.json", "public.json"):
+        f = os.path.join(p, name)
+        if not os.path.isfile(f) or os.path.getsize(f) == 0:
+            return False
+    return True
+
 def run_command(cmd):
     result = subprocess.run(
         cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True
@@ -35,22 +62,27 @@ def generate_random_merkle_input():
 
     return {"leaf": leaf, "pathElements": pathElements, "pathIndices": pathIndices}
 
-def create_proof(i):
-    dst = create_proof_path(i)
-    proof_json = os.path.join(dst, "proof.json")
-    public_json = os.path.join(dst, "public.json")
-    inp = {"x": str(1000+i)}
-    # inp = generate_random_merkle_input()
-    inp_path = os.path.join(BUILD_DIR, "input.json")
+def proof_input(i):
+    """Return the circuit input used for proof #i."""
+    if CIRCUIT_INPUT == "merkle":
+        return generate_random_merkle_input()
+    if CIRCUIT_INPUT == "ab":
+        return {"a": str(1000+i), "b": str(7)}
+    return {"x": str(1000+i)}
+
+def prove_with_snarkjs(inp, scratch_dir, proof_json, public_json):
+    """Prove one input with a fresh `node` witness run and `snarkjs groth16 prove`."""
+    wtns_path = os.path.join(scratch_dir, "witness.wtns")
+    inp_path = os.path.join(scratch_dir, "input.json")
     with open(inp_path, "w") as f:
         json.dump(inp, f)
     run_command(
         [
             "node",
             os.path.join(BUILD_DIR, f"{CIRCUIT_NAME}_js", "generate_witness.js"),
-            os.path.join(BUILD_DIR, f"{CIRCUIT_NAME}_js", f"{CIRCUIT_NAME}.wasm"),
+            WASM_PATH,
             inp_path,
-            os.path.join(BUILD_DIR, "witness.wtns"),
+            wtns_path,
         ]
     )
 
@@ -60,16 +92,128 @@ def create_proof(i):
             "groth16",
             "prove",
             os.path.join(BUILD_DIR, f"{CIRCUIT_NAME}.zkey"),
-            os.path.join(BUILD_DIR, "witness.wtns"),
+            wtns_path,
             proof_json,
             public_json,
         ]
     )
 
+def create_proof(i, scratch_dir=None):
+    dst = create_proof_path(i)
+    if witness_calc is not None:
+        # `snarkjs groth16 prove` only reads the witness from a file; the daemon takes the bytes over its pipe
+        proof, public_signals = witness_prover.prove(wtns=witness_calc.calculate_wtns_bin(proof_input(i)))
+        write_proof_files(dst, proof, public_signals)
+        return i
+    prove_with_snarkjs(
+        proof_input(i),
+        scratch_dir or worker_scratch_dir,
+        os.path.join(dst, "proof.json"),
+        os.path.join(dst, "public.json"),
+    )
+    return i
+
+def init_worker(python_witness=False):
+    """Give each pool process its own scratch directory so runs never share files.
+
+    With python_witness the worker instead computes witnesses in memory and
+    proves them through its own prover_daemon.js, so nothing is written.
+    """
+    global worker_scratch_dir, witness_calc, witness_prover
+    if python_witness:
+        witness_calc = WitnessCalculator(WASM_PATH)
+        # Exits on EOF when this worker does and its stdin closes
+        witness_prover = ProverClient(BUILD_DIR, CIRCUIT_NAME)
+        return
+    worker_scratch_dir = os.path.join(SCRATCH_DIR, str(os.getpid()))
+    os.makedirs(worker_scratch_dir, exist_ok=True)
+
+def generate_proofs(start, count, workers, resume=True, python_witness=False):
+    ids = range(start, start + count)
+    if resume:
+        pending = [i for i in ids if not proof_exists(i)]
+        print(f"⏭️  Skipping {count - len(pending)} existing proof(s)")
+    else:
+        pending = list(ids)
+    if not pending:
+        return []
+
+    failed = []
+    done = 0
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=init_worker, initargs=(python_witness,)
+    ) as executor:
+        futures = {executor.submit(create_proof, i): i for i in pending}
+        for future in as_completed(futures):
+            i = futures[future]
+            try:
+                future.result()
+                done += 1
+                print(f"🔧 Generated proof #{i} ({done}/{len(pending)})")
+            except Exception as e:
+                failed.append(i)
+                print(f"Error generating proof #{i}: {e}")
+    print(f"✅ {done} proof(s) generated, {len(failed)} failed")
+    return failed
+
+def generate_proofs_daemon(start, count, concurrency, resume=True, python_witness=False):
+    """Generate proofs through one long-lived prover_daemon.js instead of two processes per proof.
+
+    With python_witness the witnesses are computed here, in memory, while the
+    daemon is busy proving the previous ones.
+    """
+    ids = [i for i in range(start, start + count) if not (resume and proof_exists(i))]
+    print(f"⏭️  Skipping {count - len(ids)} existing proof(s)")
+    calc = WitnessCalculator(WASM_PATH) if python_witness else None
+    failed = []
+    with ProverClient(BUILD_DIR, CIRCUIT_NAME, concurrency) as client:
+        if calc is not None:
+            futures = [(i, client.submit(wtns=calc.calculate_wtns_bin(proof_input(i)))) for i in ids]
+        else:
+            futures = [(i, client.submit(proof_input(i))) for i in ids]
+        for done, (i, fut) in enumerate(futures, 1):
+            try:
+                proof, public_signals = fut.result()
+                write_proof_files(os.path.join(PROOFS_DIR, str(i)), proof, public_signals)
+                print(f"🔧 Generated proof #{i} ({done}/{len(ids)})")
+            except Exception as e:
+                failed.append(i)
+                print(f"Error generating proof #{i}: {e}")
+    print(f"✅ {len(ids) - len(failed)} proof(s) generated, {len(failed)} failed")
+    return failed
+
 def main():
-    N=5000
-    for i in range(6000,6000+N):
-        print(f"🔧 Generating proof #{i}")
-        create_proof(i)
-        
-main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Generate Groth16 proofs into BUILD_DIR/proofs")
+    parser.add_argument("--start", type=int, default=6000, help="first proof ID")
+    parser.add_argument("--count", type=int, default=5000, help="number of proof IDs")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="proof generation processes")
+    parser.add_argument("--no-resume", action="store_true", help="regenerate proofs that already exist")
+    parser.add_argument("--daemon", action="store_true", help="prove through prover_daemon.js; --workers sets its concurrency")
+    parser.add_argument("--no-corpus", action="store_true", help="do not repack PROOFS_DIR into the proof corpus")
+    parser.add_argument("--python-witness", action="store_true", help="compute witnesses in-process from the circuit wasm")
+    args = parser.parse_args()
+
+    if args.daemon:
+        generate_proofs_daemon(
+            args.start, args.count, args.workers,
+            resume=not args.no_resume, python_witness=args.python_witness,
+        )
+    elif args.workers <= 1:
+        init_worker(args.python_witness)
+        for i in range(args.start, args.start + args.count):
+            if not args.no_resume and proof_exists(i):
+                continue
+            print(f"🔧 Generating proof #{i}")
+            create_proof(i)
+    else:
+        generate_proofs(
+            args.start, args.count, args.workers,
+            resume=not args.no_resume, python_witness=args.python_witness,
+        )
+
+    if not args.no_corpus:
+        n = convert_proof_dirs(PROOFS_DIR, CORPUS_PATH)
+        print(f"📦 Packed {n} proof(s) into {CORPUS_PATH}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+"""Batch Groth16 verifier for snarkjs proofs over BN254.
+
+Loads verification_key.json once and checks N proofs with a random linear
+combination: for random 128-bit r_i,
+
+    prod e(r_i*A_i, B_i) * e(-sum r_i*vk_x_i, gamma) * e(-sum r_i*C_i, delta)
+        == e(alpha, beta)^(sum r_i)
+
+which costs N + 2 Miller loops and one final exponentiation instead of
+4N pairings. A failing batch is bisected to find the bad proofs, and large
+batches are split over a process pool whose workers each load the key once.
+
+Usage: python groth16_batch.py bench [--count N] [--batch-size N] [--workers N]
+       python groth16_batch.py daemon [VKEY] [--workers N]
+
+The daemon speaks newline-delimited JSON on stdin/stdout, like prover_daemon.js:
+
+    request  {"id": 3, "proofs": [{"proof": {"pi_a": [...], "pi_b": [...], "pi_c": [...]}, "publicSignals": [...]}, ...]}
+    response {"id": 3, "valid": [true, false, ...]}
+
+A single {"ready": true} line is written once the key is loaded.
+"""
+import argparse
+import json
+import os
+import secrets
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from py_ecc.optimized_bn128 import (
+    FQ, FQ2, FQ12, Z1, add, b, b2, curve_order, field_modulus, final_exponentiate,
+    is_inf, is_on_curve, multiply, neg, pairing,
+)
+
+RANDOM_BITS = 128
+
+class VerifyError(Exception):
+    pass
+
+def g1(coords):
+    x, y = int(coords[0]), int(coords[1])
+    if x >= field_modulus or y >= field_modulus:
+        raise VerifyError("G1 coordinate out of range")
+    if x == 0 and y == 0:
+        return Z1
+    p = (FQ(x), FQ(y), FQ.one())
+    if not is_on_curve(p, b):
+        raise VerifyError("G1 point not on curve")
+    return p
+
+def g2(coords):
+    """snarkjs G2 coordinates are [[x.c0, x.c1], [y.c0, y.c1]]."""
+    (x0, x1), (y0, y1) = [[int(v) for v in c] for c in coords[:2]]
+    if max(x0, x1, y0, y1) >= field_modulus:
+        raise VerifyError("G2 coordinate out of range")
+    p = (FQ2([x0, x1]), FQ2([y0, y1]), FQ2.one())
+    if not is_on_curve(p, b2):
+        raise VerifyError("G2 point not on curve")
+    if not is_inf(multiply(p, curve_order)):
+        raise VerifyError("G2 point not in subgroup")
+    return p
+
+class VerifyingKey:
+    def __init__(self, vk):
+        self.alpha = g1(vk["vk_alpha_1"])
+        self.beta = g2(vk["vk_beta_2"])
+        self.gamma = g2(vk["vk_gamma_2"])
+        self.delta = g2(vk["vk_delta_2"])
+        self.ic = [g1(p) for p in vk["IC"]]
+        self.alpha_beta = pairing(self.beta, self.alpha)
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            return cls(json.load(f))
+
+    @property
+    def n_public(self):
+        return len(self.ic) - 1
+
+    def prepare(self, pi_a, pi_b, pi_c, public):
+        """Decode and check one proof; returns (A, B, C, vk_x) or raises VerifyError."""
+        if len(public) != self.n_public:
+            raise VerifyError(f"expected {self.n_public} public signals, got {len(public)}")
+        vk_x = self.ic[0]
+        for s, ic in zip(public, self.ic[1:]):
+            s = int(s)
+            if s >= curve_order:
+                raise VerifyError("public signal not in scalar field")
+            vk_x = add(vk_x, multiply(ic, s))
+        return g1(pi_a), g2(pi_b), g1(pi_c), vk_x
+
+    def check(self, prepared):
+        """One randomized check over every prepared proof."""
+        acc = FQ12.one()
+        vk_x_sum, c_sum, r_sum = Z1, Z1, 0
+        for a, b_, c, vk_x in prepared:
+            r = secrets.randbits(RANDOM_BITS) | 1
+            acc *= pairing(b_, multiply(a, r), final_exponentiate=False)
+            vk_x_sum = add(vk_x_sum, multiply(vk_x, r))
+            c_sum = add(c_sum, multiply(c, r))
+            r_sum += r
+        acc *= pairing(self.gamma, neg(vk_x_sum), final_exponentiate=False)
+        acc *= pairing(self.delta, neg(c_sum), final_exponentiate=False)
+        return final_exponentiate(acc) == self.alpha_beta ** r_sum
+
+    def bisect(self, prepared, idx, out):
+        """Write verdicts for prepared[k] into out[idx[k]], halving on failure."""
+        if not prepared:
+            return
+        if self.check(prepared):
+            for i in idx:
+                out[i] = True
+        elif len(prepared) == 1:
+            out[idx[0]] = False
+        else:
+            mid = len(prepared) // 2
+            self.bisect(prepared[:mid], idx[:mid], out)
+            self.bisect(prepared[mid:], idx[mid:], out)
+
+    def verify_batch(self, proofs):
+        """Verify [(pi_a, pi_b, pi_c, public), ...]; returns a list of bools in input order."""
+        out = [False] * len(proofs)
+        prepared, idx = [], []
+        for i, proof in enumerate(proofs):
+            try:
+                prepared.append(self.prepare(*proof))
+                idx.append(i)
+            except (VerifyError, ValueError, TypeError, IndexError):
+                pass
+        self.bisect(prepared, idx, out)
+        return out
+
+_worker_key = None
+
+def _init_worker(vk):
+    global _worker_key
+    _worker_key = VerifyingKey(vk)
+
+def _verify_chunk(proofs):
+    return _worker_key.verify_batch(proofs)
+
+class BatchVerifier:
+    """verify_batch() over a pool of processes, each holding its own copy of the key."""
+
+    def __init__(self, vkey_path, workers=1, chunk_size=16):
+        with open(vkey_path) as f:
+            vk = json.load(f)
+        self.key = VerifyingKey(vk)
+        self.chunk_size = chunk_size
+        self.pool = None
+        if workers > 1:
+            self.pool = ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(vk,))
+
+    def verify(self, proofs):
+        if self.pool is None or len(proofs) <= self.chunk_size:
+            return self.key.verify_batch(proofs)
+        chunks = [proofs[k:k + self.chunk_size] for k in range(0, len(proofs), self.chunk_size)]
+        return [v for verdicts in self.pool.map(_verify_chunk, chunks) for v in verdicts]
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def from_snarkjs(proof, public_signals):
+    """(proof.json, public.json) contents to the (pi_a, pi_b, pi_c, public) tuple used here."""
+    return proof["pi_a"], proof["pi_b"], proof["pi_c"], public_signals
+
+def serve(verifier, stdin=sys.stdin, stdout=sys.stdout):
+    def reply(msg):
+        stdout.write(json.dumps(msg) + "\n")
+        stdout.flush()
+
+    reply({"ready": True})
+    for line in stdin:
+        if not line.strip():
+            continue
+        try:
+            req = json.loads(line)
+            proofs = [from_snarkjs(p["proof"], p["publicSignals"]) for p in req["proofs"]]
+        except (ValueError, KeyError, TypeError) as e:
+            reply({"id": None, "error": f"bad request: {e}"})
+            continue
+        try:
+            reply({"id": req.get("id"), "valid": verifier.verify(proofs)})
+        except Exception as e:
+            reply({"id": req.get("id"), "error": str(e)})
+
+def bench(verifier, proofs, batch_size):
+    start = time.perf_counter()
+    verdicts = []
+    for k in range(0, len(proofs), batch_size):
+        verdicts += verifier.verify(proofs[k:k + batch_size])
+    elapsed = time.perf_counter() - start
+    print(f"Verified {len(proofs)} proof(s) :: {sum(verdicts)} valid, {len(proofs) - sum(verdicts)} invalid")
+    print(f"Elapsed :: {elapsed:.2f}s, {len(proofs) / elapsed:.2f} proofs/s")
+    return verdicts
+
+def main():
+    parser = argparse.ArgumentParser(description="Randomized batch Groth16 verifier")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    b_ = sub.add_parser("bench", help="verify proofs from the corpus / PROOFS_DIR and report throughput")
+    b_.add_argument("--count", type=int, default=0, help="proofs to verify (default: all)")
+    b_.add_argument("--batch-size", type=int, default=64)
+    d_ = sub.add_parser("daemon", help="serve verification requests on stdin/stdout")
+    d_.add_argument("vkey", nargs="?", default=None)
+    for p in (b_, d_):
+        p.add_argument("--workers", type=int, default=int(os.getenv("VERIFY_WORKERS", "1")))
+        p.add_argument("--chunk-size", type=int, default=16, help="proofs per pool task")
+    args = parser.parse_args()
+
+    build_dir = os.getenv("BUILD_DIR") or "../build"
+    vkey = getattr(args, "vkey", None) or os.path.join(build_dir, "verification_key.json")
+    with BatchVerifier(vkey, args.workers, args.chunk_size) as verifier:
+        if args.cmd == "daemon":
+            serve(verifier)
+            return
+        from proof_corpus import available_proof_ids, default_corpus_path, load_proofs
+        proofs_dir, corpus = os.path.join(build_dir, "proofs"), default_corpus_path(build_dir)
+        ids = available_proof_ids(proofs_dir, corpus)
+        if args.count:
+            ids = ids[:args.count]
+        proofs = load_proofs(proofs_dir, corpus, ids)
+        bench(verifier, [proofs[i] for i in ids], args.batch_size)
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+    load_dotenv("../.env")
+    main()
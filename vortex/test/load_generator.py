@@ -0,0 +1,235 @@
+"""Open-loop, rate-controlled load generator.
+
+Transactions are sent on a fixed schedule (constant or Poisson arrivals) for a
+fixed duration, independent of how fast the node answers. Every transaction
+is timestamped at submit, at txpool acceptance (the eth_sendRawTransaction
+response) and at inclusion, and the run reports submit-to-inclusion latency
+percentiles. Sweeping --rates gives a throughput-versus-latency curve.
+
+Usage: python load_generator.py --kind transfer --rates 5,10,20 --duration 120
+       python load_generator.py --kind verifyProof --rates 2,4,8 --arrivals poisson
+"""
+import argparse
+import asyncio
+import csv
+import json
+import math
+import os
+import random
+import threading
+import time
+
+from dotenv import load_dotenv
+from eth_account import Account
+from eth_utils import keccak
+from web3 import Web3
+
+from confirmation import ConfirmationTracker
+from percentiles import percentile
+from proof_corpus import available_proof_ids, default_corpus_path, load_proofs
+from rpc_async import AsyncRpcClient
+from tx_signing import GasEstimateCache, abi_function, sign_calls_parallel
+
+load_dotenv("../.env")
+
+SLOT_DURATION = int(os.getenv("CPU_PROFILE_INTERVAL"))
+READINGS_DIR = os.getenv("READINGS_DIR")
+RPC_URL = os.getenv("RPC_URL")
+BUILD_DIR = os.getenv("BUILD_DIR")
+PROOFS_DIR = os.path.join(BUILD_DIR, "proofs")
+CORPUS_PATH = default_corpus_path(BUILD_DIR)
+SIGNING_WORKERS = int(os.getenv("SIGNING_WORKERS", os.cpu_count() or 1))
+PRIVATE_KEYS = [
+    os.getenv("PRIVATE_KEY_1"),
+    os.getenv("PRIVATE_KEY_2"),
+    os.getenv("PRIVATE_KEY_3"),
+]
+CONTRACTS = {
+    "verifyProof": (os.getenv("VERIFIER_CONTRACT_ADDRESS"), os.getenv("VERIFIER_ABI_PATH")),
+    "announceProof": (os.getenv("VORTEX_CONTRACT_ADDRESS"), os.getenv("VORTEX_ABI_PATH")),
+}
+os.makedirs(READINGS_DIR, exist_ok=True)
+
+w3 = Web3(Web3.HTTPProvider(RPC_URL))
+
+def arrival_offsets(rate, duration, arrivals, rng):
+    """Send times (seconds from start) for an offered load of `rate` tx/s."""
+    if arrivals == "constant":
+        return [k / rate for k in range(int(rate * duration))]
+    offsets, t = [], rng.expovariate(rate)
+    while t < duration:
+        offsets.append(t)
+        t += rng.expovariate(rate)
+    return offsets
+
+def prepare_transactions(kind, count, key):
+    """Pre-sign `count` transactions of `kind`; returns [(tag, raw_tx)] in nonce order."""
+    acct = Account.from_key(key)
+    base_fee = w3.to_wei(10, "gwei")
+    tip = w3.to_wei(2, "gwei")
+    max_fee = int(base_fee) + tip
+    base_nonce = w3.eth.get_transaction_count(acct.address, "pending")
+
+    if kind == "transfer":
+        to = Account.from_key(next(k for k in PRIVATE_KEYS if k != key)).address
+        items = [(i, [], 21000) for i in range(count)]
+        return sign_calls_parallel(
+            key, w3.eth.chain_id, to, b"", [], items, base_nonce, max_fee, tip, SIGNING_WORKERS,
+        )
+
+    address, abi_path = CONTRACTS[kind]
+    with open(abi_path) as f:
+        abi = json.load(f)["abi"]
+    contract = w3.eth.contract(address=Web3.to_checksum_address(address), abi=abi)
+    available = available_proof_ids(PROOFS_DIR, CORPUS_PATH)
+    if not available:
+        raise ValueError(f"No proofs in {CORPUS_PATH} or {PROOFS_DIR}; generate them with generate_proof.py")
+    proofs = load_proofs(PROOFS_DIR, CORPUS_PATH, available)
+    cache = GasEstimateCache()
+    items = []
+    for i in range(count):
+        pi_a, (b0, b1), pi_c, public = proofs[available[i % len(available)]]
+        # verifyProof takes the G2 coordinates swapped, announceProof stores them as snarkjs emits them
+        pi_b = [[b0[1], b0[0]], [b1[1], b1[0]]] if kind == "verifyProof" else [b0, b1]
+        args = [pi_a, pi_b, pi_c, public]
+        gas, _ = cache.get(kind, args, lambda: getattr(contract.functions, kind)(*args).estimate_gas({"from": acct.address}))
+        items.append((i, args, gas))
+    selector, types = abi_function(abi, kind)
+    return sign_calls_parallel(
+        key, w3.eth.chain_id, contract.address, selector, types, items, base_nonce, max_fee, tip, SIGNING_WORKERS,
+    )
+
+async def send_on_schedule(signed, offsets, records, tracker, url):
+    """Fire each transaction at its scheduled offset without waiting for earlier replies."""
+    async with AsyncRpcClient(url) as client:
+        async def send(tag, raw):
+            rec = records[tag]
+            rec["submit"] = time.time()
+            try:
+                await client.call("eth_sendRawTransaction", ["0x" + raw.hex()])
+            except Exception as e:
+                rec["error"] = str(e)
+                tracker.outstanding.pop(rec["hash"], None)
+            rec["accept"] = time.time()
+
+        tasks = []
+        t0 = time.monotonic()
+        for (tag, raw), offset in zip(signed, offsets):
+            delay = t0 + offset - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tracker.track(tag, records[tag]["hash"])
+            tasks.append(asyncio.ensure_future(send(tag, raw)))
+        await asyncio.gather(*tasks)
+
+def run_rate(kind, rate, duration, arrivals, key, drain, seed):
+    rng = random.Random(seed)
+    offsets = arrival_offsets(rate, duration, arrivals, rng)
+    signed = prepare_transactions(kind, len(offsets), key)
+    records = {tag: {"tag": tag, "hash": keccak(raw)} for tag, raw in signed}
+
+    tracker = ConfirmationTracker(w3, poll_interval=0.25, timeout=drain)
+    submitting = threading.Event()
+    submitting.set()
+    start_block = w3.eth.block_number + 1
+    holder = []
+    follower = threading.Thread(target=lambda: holder.append(tracker.wait(start_block, until=lambda: not submitting.is_set())))
+    follower.start()
+    t_start = time.time()
+    try:
+        asyncio.run(send_on_schedule(signed, offsets, records, tracker, RPC_URL))
+    finally:
+        submitting.clear()
+        follower.join()
+    result = holder[0]
+
+    timestamps = {}
+    for inc in result.included:
+        if inc.block_number not in timestamps:
+            timestamps[inc.block_number] = w3.eth.get_block(inc.block_number)["timestamp"]
+        rec = records[inc.tag]
+        rec["block"] = inc.block_number
+        rec["gasUsed"] = inc.gas_used
+        rec["include"] = inc.seen_at
+        rec["blockTimestamp"] = timestamps[inc.block_number]
+    # Slots are counted on the grid of block timestamps, so latency in slots is
+    # the number of slot boundaries between submit and the including block.
+    ref = next(iter(timestamps.values()), t_start)
+    slot_of = lambda t: math.floor((t - ref) / SLOT_DURATION)
+    for rec in records.values():
+        if "block" in rec:
+            rec["latencySlots"] = max(0, slot_of(rec["blockTimestamp"]) - slot_of(rec["submit"]))
+            rec["latencySec"] = rec["include"] - rec["submit"]
+
+    included = [r for r in records.values() if "block" in r]
+    slots = [r["latencySlots"] for r in included]
+    secs = [r["latencySec"] for r in included]
+    if included:
+        first = min(r["blockTimestamp"] for r in included)
+        last = max(r["blockTimestamp"] for r in included)
+        span = last - first + SLOT_DURATION
+    else:
+        span = duration
+    summary = {
+        "kind": kind,
+        "arrivals": arrivals,
+        "offeredRate": rate,
+        "sent": len(records),
+        "rejected": sum(1 for r in records.values() if "error" in r),
+        "included": len(included),
+        "pending": len(result.pending),
+        "dropped": len(result.dropped),
+        "achievedTps": len(included) / span,
+        "gasPerSec": sum(r["gasUsed"] for r in included) / span,
+        "p50Slots": percentile(slots, 0.5),
+        "p90Slots": percentile(slots, 0.9),
+        "p99Slots": percentile(slots, 0.99),
+        "maxSlots": max(slots, default=None),
+        "p50Sec": percentile(secs, 0.5),
+        "p99Sec": percentile(secs, 0.99),
+    }
+
+    with open(os.path.join(READINGS_DIR, f"load_{kind}_{rate:g}.csv"), "w", newline="") as f:
+        fields = ["tag", "submit", "accept", "include", "block", "blockTimestamp", "gasUsed", "latencySlots", "latencySec", "error"]
+        writer = csv.DictWriter(f, fieldnames=fields, extrasaction="ignore")
+        writer.writeheader()
+        for rec in records.values():
+            writer.writerow(rec)
+    return summary
+
+def main():
+    parser = argparse.ArgumentParser(description="Open-loop load generator with per-transaction latency")
+    parser.add_argument("--kind", choices=["transfer", "verifyProof", "announceProof"], default="transfer")
+    parser.add_argument("--rates", default="10", help="comma-separated offered loads in tx/s")
+    parser.add_argument("--duration", type=float, default=60, help="seconds of load per rate")
+    parser.add_argument("--arrivals", choices=["constant", "poisson"], default="constant")
+    parser.add_argument("--drain", type=float, default=5 * SLOT_DURATION, help="seconds to wait for stragglers after the last inclusion")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    key = random.choice(PRIVATE_KEYS)
+    fmt = lambda v: "n/a" if v is None else v
+    curve = []
+    for rate in [float(r) for r in args.rates.split(",")]:
+        print(f"Offered Load :: {rate:g} tx/s of {args.kind} for {args.duration:g} secs ({args.arrivals})")
+        s = run_rate(args.kind, rate, args.duration, args.arrivals, key, args.drain, args.seed)
+        curve.append(s)
+        print(f"Achieved :: {s['achievedTps']:.2f} tx/s, {s['gasPerSec']:.0f} gas/s, "
+              f"{s['included']}/{s['sent']} included, {s['dropped']} dropped")
+        print(f"Latency (slots) :: p50 {fmt(s['p50Slots'])}, p90 {fmt(s['p90Slots'])}, p99 {fmt(s['p99Slots'])}, "
+              f"max {fmt(s['maxSlots'])}")
+
+    with open(os.path.join(READINGS_DIR, f"latency_curve_{args.kind}.csv"), "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(curve[0].keys()))
+        writer.writeheader()
+        writer.writerows(curve)
+
+    print("======== THROUGHPUT vs LATENCY ========")
+    print(f"{'offered':>8} {'achieved':>9} {'gas/s':>12} {'p50':>4} {'p90':>4} {'p99':>4} {'max':>4}")
+    for s in curve:
+        print(f"{s['offeredRate']:>8g} {s['achievedTps']:>9.2f} {s['gasPerSec']:>12.0f} "
+              f"{fmt(s['p50Slots']):>4} {fmt(s['p90Slots']):>4} {fmt(s['p99Slots']):>4} {fmt(s['maxSlots']):>4}")
+    print("======== END ========")
+
+if __name__ == "__main__":
+    main()
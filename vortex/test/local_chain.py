@@ -0,0 +1,521 @@
+"""Offline benchmark backend: an in-process EVM behind a geth-style JSON-RPC endpoint.
+
+Runs py-evm through eth-tester, deploys the compiled Groth16Verifier and
+VortexStorage artifacts, and serves the subset of JSON-RPC the harness uses
+(hex-encoded, camelCase, batches included) on a local HTTP port, so the
+submit, confirm and report code talks to it exactly as it talks to geth.
+
+Blocks are built by a miner thread every `block_interval` seconds from a
+small txpool that mimics geth's: per-sender nonce ordering, highest tip
+first, `nonce too low` / `already known` / `replacement transaction
+underpriced` errors, and a block gas limit. The miner records the CPU time
+spent executing each block, standing in for the StateProcessor.Process
+profile of a real node.
+
+Usage: python local_chain.py [--port 8545] [--gas-limit 30000000] [--block-interval 1]
+"""
+import argparse
+import asyncio
+import heapq
+import itertools
+import json
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+
+from aiohttp import web
+from eth_account import Account
+from eth_tester import EthereumTester, PyEVMBackend
+from eth_tester.exceptions import TransactionNotFound
+from eth_utils import to_checksum_address
+
+ARTIFACTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "artifacts", "contracts")
+DEFAULT_ARTIFACTS = {
+    "verifier": os.path.join(ARTIFACTS_DIR, "Verifier.sol", "Groth16Verifier.json"),
+    "vortex": os.path.join(ARTIFACTS_DIR, "VortexStorage.sol", "VortexStorage.json"),
+}
+FUNDING = 10**5 * 10**18
+PRICE_BUMP = 10     # percent, geth's default --txpool.pricebump
+
+class RpcFailure(Exception):
+    pass
+
+def _camel(key):
+    head, *rest = key.split("_")
+    return head + "".join(p.title() for p in rest)
+
+def to_rpc(value):
+    """eth-tester output (snake_case, ints) to geth JSON-RPC (camelCase, hex quantities)."""
+    if isinstance(value, dict):
+        return {_camel(k): to_rpc(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_rpc(v) for v in value]
+    if isinstance(value, bool) or value is None:
+        return value
+    if isinstance(value, int):
+        return hex(value)
+    if isinstance(value, bytes):
+        return "0x" + value.hex()
+    return value
+
+TX_FIELDS = {
+    "from": "from", "to": "to", "gas": "gas", "gasPrice": "gas_price", "value": "value",
+    "data": "data", "input": "data", "nonce": "nonce",
+    "maxFeePerGas": "max_fee_per_gas", "maxPriorityFeePerGas": "max_priority_fee_per_gas",
+}
+QUANTITIES = {"gas", "gas_price", "value", "nonce", "max_fee_per_gas", "max_priority_fee_per_gas"}
+
+def from_rpc_tx(tx):
+    out = {}
+    for k, v in tx.items():
+        name = TX_FIELDS.get(k)
+        if name is None or v is None:
+            continue
+        out[name] = int(v, 16) if name in QUANTITIES and isinstance(v, str) else v
+    return out
+
+def block_id(tag):
+    if isinstance(tag, str) and tag.startswith("0x"):
+        return int(tag, 16)
+    return 0 if tag == "earliest" else tag
+
+@dataclass(order=True)
+class PoolTx:
+    sort_key: tuple
+    hash: bytes = field(compare=False)
+    raw: bytes = field(compare=False)
+    sender: str = field(compare=False)
+    nonce: int = field(compare=False)
+    gas: int = field(compare=False)
+    max_fee: int = field(compare=False)
+    tip: int = field(compare=False)
+    tx: object = field(compare=False)     # decoded py-evm transaction
+
+class TxPool:
+    """Pending transactions by sender and nonce; guarded by its own lock so
+    eth_sendRawTransaction never waits for block execution."""
+
+    def __init__(self, decode, state_nonce):
+        self.decode = decode
+        self.state_nonce = state_nonce      # callable: sender -> next nonce on chain
+        self.by_sender = {}
+        self.by_hash = {}
+        self.nonces = {}                    # sender -> cached chain nonce
+        self.lock = threading.Lock()
+        self._arrival = itertools.count()
+
+    def _learn(self, sender):
+        # Read outside self.lock: the miner holds the chain lock while it takes ours
+        if sender not in self.nonces:
+            nonce = self.state_nonce(sender)
+            with self.lock:
+                self.nonces.setdefault(sender, nonce)
+
+    def add(self, raw):
+        tx = self.decode(raw)
+        sender = to_checksum_address(tx.sender)
+        max_fee = getattr(tx, "max_fee_per_gas", None) or tx.gas_price
+        tip = getattr(tx, "max_priority_fee_per_gas", None) or tx.gas_price
+        ptx = PoolTx((-tip, next(self._arrival)), tx.hash, raw, sender, tx.nonce, tx.gas, max_fee, tip, tx)
+        self._learn(sender)
+        with self.lock:
+            if ptx.hash in self.by_hash:
+                raise RpcFailure("already known")
+            if ptx.nonce < self.nonces[sender]:
+                raise RpcFailure(f"nonce too low: address {sender}, tx: {ptx.nonce} state: {self.nonces[sender]}")
+            slots = self.by_sender.setdefault(sender, {})
+            old = slots.get(ptx.nonce)
+            if old is not None:
+                if max_fee * 100 < old.max_fee * (100 + PRICE_BUMP) or tip * 100 < old.tip * (100 + PRICE_BUMP):
+                    raise RpcFailure("replacement transaction underpriced")
+                del self.by_hash[old.hash]
+            slots[ptx.nonce] = ptx
+            self.by_hash[ptx.hash] = ptx
+        return ptx.hash
+
+    def get(self, tx_hash):
+        with self.lock:
+            return self.by_hash.get(tx_hash)
+
+    def pending_nonce(self, sender):
+        self._learn(sender)
+        with self.lock:
+            nonce = self.nonces[sender]
+            slots = self.by_sender.get(sender, {})
+            while nonce in slots:
+                nonce += 1
+            return nonce
+
+    def status(self):
+        """(executable, queued) counts, like txpool_status."""
+        with self.lock:
+            pending = 0
+            for sender, slots in self.by_sender.items():
+                nonce = self.nonces[sender]
+                while nonce in slots:
+                    pending += 1
+                    nonce += 1
+            return pending, len(self.by_hash) - pending
+
+    def inspect(self):
+        """{"pending": {sender: {nonce: summary}}, "queued": {...}}, like txpool_inspect."""
+        out = {"pending": {}, "queued": {}}
+        with self.lock:
+            for sender, slots in self.by_sender.items():
+                nonce = self.nonces[sender]
+                for n in sorted(slots):
+                    ptx = slots[n]
+                    kind = "pending" if n == nonce else "queued"
+                    if kind == "pending":
+                        nonce += 1
+                    out[kind].setdefault(sender, {})[str(n)] = f"{ptx.gas} gas × {ptx.max_fee} wei"
+        return out
+
+    def executable(self, base_fee):
+        """Yield executable transactions, highest tip first, in nonce order per sender.
+
+        The consumer sends back True if the transaction was included so the
+        sender's next nonce becomes eligible.
+        """
+        with self.lock:
+            heads = []
+            for sender, slots in self.by_sender.items():
+                ptx = slots.get(self.nonces[sender])
+                if ptx is not None and ptx.max_fee >= base_fee:
+                    heads.append(ptx)
+        heapq.heapify(heads)
+        while heads:
+            ptx = heapq.heappop(heads)
+            included = yield ptx
+            if included:
+                with self.lock:
+                    self._remove(ptx)
+                    self.nonces[ptx.sender] = ptx.nonce + 1
+                    nxt = self.by_sender.get(ptx.sender, {}).get(ptx.nonce + 1)
+                if nxt is not None and nxt.max_fee >= base_fee:
+                    heapq.heappush(heads, nxt)
+
+    def drop(self, ptx):
+        with self.lock:
+            self._remove(ptx)
+
+    def _remove(self, ptx):
+        self.by_hash.pop(ptx.hash, None)
+        slots = self.by_sender.get(ptx.sender, {})
+        if slots.get(ptx.nonce) is ptx:
+            del slots[ptx.nonce]
+
+class LocalChain:
+    """py-evm chain, txpool, interval miner and JSON-RPC server in one process."""
+
+    def __init__(self, gas_limit=30_000_000, block_interval=1.0, port=0):
+        params = PyEVMBackend.generate_genesis_params(overrides={"gas_limit": gas_limit})
+        self.backend = PyEVMBackend(genesis_parameters=params)
+        self.tester = EthereumTester(self.backend, auto_mine_transactions=True)
+        self.gas_limit = gas_limit
+        self.block_interval = block_interval
+        self.port = port
+        self.chain_id = self.backend.chain.chain_id
+        self.lock = threading.RLock()
+        self.pool = TxPool(self._decode, lambda a: self.call_locked(self.tester.get_nonce, a))
+        self.block_cpu = {}
+        self.errors = {}
+        self._stop = threading.Event()
+        self._threads = []
+        self._loop = None
+        self.url = None
+
+    def call_locked(self, fn, *args):
+        with self.lock:
+            return fn(*args)
+
+    def _decode(self, raw):
+        vm = self.backend.chain.get_vm()
+        return vm.get_transaction_builder().decode(raw)
+
+    # -- setup -------------------------------------------------------------
+
+    def fund(self, addresses, amount=FUNDING):
+        """Send `amount` wei from the tester's genesis accounts to each address."""
+        funder = self.tester.get_accounts()[0]
+        with self.lock:
+            for addr in addresses:
+                self.tester.send_transaction({
+                    "from": funder, "to": to_checksum_address(addr), "value": amount,
+                    "gas": 21000, "max_fee_per_gas": 10**11, "max_priority_fee_per_gas": 10**9,
+                })
+
+    def deploy(self, artifact_path):
+        """Deploy a hardhat artifact (abi + bytecode); returns the contract address."""
+        with open(artifact_path) as f:
+            bytecode = json.load(f)["bytecode"]
+        funder = self.tester.get_accounts()[0]
+        with self.lock:
+            tx_hash = self.tester.send_transaction({
+                "from": funder, "data": bytecode, "gas": min(self.gas_limit, 10_000_000),
+                "max_fee_per_gas": 10**11, "max_priority_fee_per_gas": 10**9,
+            })
+            receipt = self.tester.get_transaction_receipt(tx_hash)
+        if receipt["status"] != 1:
+            raise RuntimeError(f"Deploying {artifact_path} failed")
+        return to_checksum_address(receipt["contract_address"])
+
+    # -- mining ------------------------------------------------------------
+
+    def mine_block(self):
+        """Fill one block from the txpool within the gas limit and seal it.
+
+        Transactions are applied on one VM against a running header and the
+        block's transaction and receipt tries are built once at the end;
+        MiningChain.apply_transaction would rebuild both per transaction.
+        """
+        with self.lock:
+            cpu0 = time.thread_time()
+            chain = self.backend.chain
+            vm = chain.get_vm(chain.header)
+            block = vm.get_block()
+            header = block.header
+            transactions, receipts = list(block.transactions), list(block.get_receipts(chain.chaindb))
+            picker = self.pool.executable(header.base_fee_per_gas)
+            included = None
+            try:
+                ptx = next(picker)
+                while True:
+                    included = False
+                    if header.gas_used + ptx.gas <= self.gas_limit:
+                        try:
+                            # Invalid transactions are rejected before they touch the state
+                            receipt, _ = vm.apply_transaction(header, ptx.tx)
+                        except Exception as e:
+                            self.errors[ptx.hash] = str(e)
+                            self.pool.drop(ptx)
+                        else:
+                            header = vm.increment_blob_gas_used(vm.add_receipt_to_header(header, receipt),
+                                                                ptx.tx)
+                            transactions.append(ptx.tx)
+                            receipts.append(receipt)
+                            included = True
+                    ptx = picker.send(included)
+            except StopIteration:
+                pass
+            if len(transactions) > len(block.transactions):
+                vm.state.persist()
+                block = vm.set_block_transactions_and_withdrawals(
+                    block, header.copy(state_root=vm.state.state_root), transactions, receipts)
+                chain.header = block.header
+            self.tester.mine_blocks(1)
+            number = self.backend.chain.get_canonical_head().block_number
+            self.block_cpu[number] = time.thread_time() - cpu0
+        return number
+
+    def _mine_loop(self):
+        next_at = time.monotonic() + self.block_interval
+        while not self._stop.wait(max(0.0, next_at - time.monotonic())):
+            try:
+                self.mine_block()
+            except Exception as e:
+                # One bad block must not stop block production for the rest of the run
+                print(f"Local Chain Mining Error :: {type(e).__name__}: {e}")
+            next_at += self.block_interval
+
+    def exec_cpu(self, start_block, end_block):
+        """CPU seconds the miner spent building blocks start..end."""
+        return sum(self.block_cpu.get(n, 0.0) for n in range(start_block, end_block + 1))
+
+    # -- JSON-RPC ----------------------------------------------------------
+
+    def _get_block(self, tag, full=False):
+        try:
+            return self.tester.get_block_by_number(block_id(tag), full)
+        except Exception:
+            return None
+
+    def _receipt(self, tx_hash):
+        try:
+            return self.tester.get_transaction_receipt(tx_hash)
+        except TransactionNotFound:
+            return None
+
+    def _logs(self, flt):
+        head = self.backend.chain.get_canonical_head().block_number
+        first = block_id(flt.get("fromBlock", "latest"))
+        last = block_id(flt.get("toBlock", "latest"))
+        first = head if first in ("latest", "pending", None) else first
+        last = head if last in ("latest", "pending", None) else last
+        addresses = flt.get("address") or []
+        addresses = {a.lower() for a in ([addresses] if isinstance(addresses, str) else addresses)}
+        topics = flt.get("topics") or []
+        out = []
+        for n in range(first, min(last, head) + 1):
+            for h in self.tester.get_block_by_number(n)["transactions"]:
+                for log in self._receipt(h)["logs"]:
+                    if addresses and log["address"].lower() not in addresses:
+                        continue
+                    if any(t is not None and (k >= len(log["topics"]) or
+                           log["topics"][k] not in ([t] if isinstance(t, str) else t))
+                           for k, t in enumerate(topics)):
+                        continue
+                    out.append(log)
+        return out
+
+    def _pending_tx(self, ptx):
+        return {
+            "hash": "0x" + ptx.hash.hex(), "from": ptx.sender, "nonce": hex(ptx.nonce), "gas": hex(ptx.gas),
+            "maxFeePerGas": hex(ptx.max_fee), "maxPriorityFeePerGas": hex(ptx.tip),
+            "blockHash": None, "blockNumber": None, "transactionIndex": None,
+        }
+
+    def dispatch(self, method, params):
+        t = self.tester
+        if method == "eth_sendRawTransaction":
+            return "0x" + self.pool.add(bytes.fromhex(params[0][2:])).hex()
+        if method == "eth_getTransactionCount" and len(params) > 1 and params[1] == "pending":
+            return hex(self.pool.pending_nonce(to_checksum_address(params[0])))
+        if method == "txpool_status":
+            pending, queued = self.pool.status()
+            return {"pending": hex(pending), "queued": hex(queued)}
+        if method == "txpool_inspect":
+            return self.pool.inspect()
+        if method in ("eth_chainId",):
+            return hex(self.chain_id)
+        if method == "net_version":
+            return str(self.chain_id)
+        if method == "web3_clientVersion":
+            return "vortex-local/py-evm"
+        if method == "eth_maxPriorityFeePerGas":
+            return hex(10**9)
+
+        with self.lock:
+            if method == "eth_blockNumber":
+                return hex(self.backend.chain.get_canonical_head().block_number)
+            if method == "eth_gasPrice":
+                return hex(self.backend.chain.get_block().header.base_fee_per_gas + 10**9)
+            if method == "eth_getBlockByNumber":
+                return to_rpc(self._get_block(params[0], bool(params[1]) if len(params) > 1 else False))
+            if method == "eth_getBlockByHash":
+                try:
+                    return to_rpc(t.get_block_by_hash(params[0], bool(params[1]) if len(params) > 1 else False))
+                except Exception:
+                    return None
+            if method == "eth_getBlockReceipts":
+                block = self._get_block(params[0])
+                return None if block is None else to_rpc([self._receipt(h) for h in block["transactions"]])
+            if method == "eth_getTransactionReceipt":
+                return to_rpc(self._receipt(params[0]))
+            if method == "eth_getTransactionByHash":
+                try:
+                    return to_rpc(t.get_transaction_by_hash(params[0]))
+                except TransactionNotFound:
+                    ptx = self.pool.get(bytes.fromhex(params[0][2:]))
+                    return None if ptx is None else self._pending_tx(ptx)
+            if method == "eth_getTransactionCount":
+                return hex(t.get_nonce(params[0], block_id(params[1]) if len(params) > 1 else "latest"))
+            if method == "eth_getBalance":
+                return hex(t.get_balance(params[0], block_id(params[1]) if len(params) > 1 else "latest"))
+            if method == "eth_getCode":
+                return t.get_code(params[0], block_id(params[1]) if len(params) > 1 else "latest")
+            if method == "eth_estimateGas":
+                return hex(t.estimate_gas(from_rpc_tx(params[0]), "latest"))
+            if method == "eth_call":
+                return t.call(from_rpc_tx(params[0]), block_id(params[1]) if len(params) > 1 else "latest")
+            if method == "eth_getLogs":
+                return to_rpc(self._logs(params[0]))
+        raise RpcFailure(f"the method {method} does not exist/is not available")
+
+    def _answer(self, req):
+        resp = {"jsonrpc": "2.0", "id": req.get("id")}
+        try:
+            resp["result"] = self.dispatch(req.get("method"), req.get("params") or [])
+        except RpcFailure as e:
+            resp["error"] = {"code": -32000, "message": str(e)}
+        except Exception as e:
+            # Reverts and validation errors from the EVM surface as geth-style errors
+            message = re.sub(r"\s+", " ", str(e)) or type(e).__name__
+            resp["error"] = {"code": -32000, "message": message}
+        return resp
+
+    async def _handle(self, request):
+        body = json.loads(await request.read())
+        loop = asyncio.get_running_loop()
+        if isinstance(body, list):
+            result = await loop.run_in_executor(None, lambda: [self._answer(r) for r in body])
+        else:
+            result = await loop.run_in_executor(None, self._answer, body)
+        return web.json_response(result)
+
+    def _serve(self, ready):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        app = web.Application(client_max_size=64 * 1024 * 1024)
+        app.router.add_post("/", self._handle)
+        runner = web.AppRunner(app, access_log=None)
+        self._loop.run_until_complete(runner.setup())
+        site = web.TCPSite(runner, "127.0.0.1", self.port)
+        self._loop.run_until_complete(site.start())
+        self.port = site._server.sockets[0].getsockname()[1]
+        self.url = f"http://127.0.0.1:{self.port}"
+        ready.set()
+        self._loop.run_forever()
+        self._loop.run_until_complete(runner.cleanup())
+
+    def start(self):
+        """Start the RPC server and the miner; returns the endpoint URL."""
+        self.tester.disable_auto_mine_transactions()
+        ready = threading.Event()
+        for target, args in ((self._serve, (ready,)), (self._mine_loop, ())):
+            thread = threading.Thread(target=target, args=args, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        ready.wait()
+        return self.url
+
+    def stop(self):
+        self._stop.set()
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+        for thread in self._threads:
+            thread.join(timeout=5)
+
+def start_local_chain(keys, gas_limit, block_interval, artifacts=None, port=0):
+    """Start a LocalChain with `keys` funded and both contracts deployed.
+
+    Returns (chain, url, {"verifier": address, "vortex": address}); artifacts
+    that do not exist yet (contracts not compiled) are skipped.
+    """
+    chain = LocalChain(gas_limit, block_interval, port)
+    chain.fund([Account.from_key(k).address for k in keys if k])
+    addresses = {}
+    for name, path in (artifacts or DEFAULT_ARTIFACTS).items():
+        if path and os.path.isfile(path):
+            addresses[name] = chain.deploy(path)
+    url = chain.start()
+    return chain, url, addresses
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve an in-process EVM over JSON-RPC for offline benchmarks")
+    parser.add_argument("--port", type=int, default=8545)
+    parser.add_argument("--gas-limit", type=int, default=int(os.getenv("GAS_LIMIT") or 30_000_000))
+    parser.add_argument("--block-interval", type=float, default=1.0, help="seconds between blocks")
+    args = parser.parse_args()
+
+    keys = [os.getenv(f"PRIVATE_KEY_{i}") for i in (1, 2, 3)]
+    artifacts = {
+        "verifier": os.getenv("VERIFIER_ABI_PATH") or DEFAULT_ARTIFACTS["verifier"],
+        "vortex": os.getenv("VORTEX_ABI_PATH") or DEFAULT_ARTIFACTS["vortex"],
+    }
+    chain, url, addresses = start_local_chain(keys, args.gas_limit, args.block_interval, artifacts, args.port)
+    print(f"Local Chain :: {url}, Chain ID {chain.chain_id}, Gas Limit {args.gas_limit}, Block Every {args.block_interval:g}s")
+    for name, address in addresses.items():
+        print(f"{name} :: {address}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        chain.stop()
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+    load_dotenv("../.env")
+    main()
@@ -0,0 +1,80 @@
+"""Endpoints of the testnet.sh nodes and routing of transactions between them.
+
+testnet.sh starts NUM_NODES nodes with every port offset by the node index:
+geth HTTP on GETH_HTTP_PORT + i, the beacon REST gateway on
+PRYSM_BEACON_GRPC_GATEWAY_PORT + i, and so on. The helpers here rebuild
+those lists from the same variables (RPC_URLS / BEACON_URLS override them
+with explicit comma-separated lists).
+
+Node i runs the validator with interop index i, so beacon proposer index i
+is node i.
+"""
+import os
+import random
+
+NUM_NODES = 3
+GETH_HTTP_PORT = 8000
+PRYSM_BEACON_GRPC_GATEWAY_PORT = 4100
+
+ROUTE_POLICIES = ("round_robin", "sender", "random")
+
+def _env_int(name, default):
+    value = os.getenv(name)
+    return int(value) if value not in (None, "") else default
+
+def _urls(env_list, port_var, default_port, count, host):
+    explicit = os.getenv(env_list)
+    if explicit:
+        urls = [u.strip() for u in explicit.split(",") if u.strip()]
+        return urls[:count] if count else urls
+    count = count or _env_int("NUM_NODES", NUM_NODES)
+    host = host or os.getenv("NODE_HOST") or "127.0.0.1"
+    base = _env_int(port_var, default_port)
+    return [f"http://{host}:{base + i}" for i in range(count)]
+
+def geth_http_urls(count=None, host=None):
+    """JSON-RPC URL of each geth node."""
+    return _urls("RPC_URLS", "GETH_HTTP_PORT", GETH_HTTP_PORT, count, host)
+
+def beacon_urls(count=None, host=None):
+    """Beacon REST (grpc-gateway) URL of each prysm node."""
+    return _urls("BEACON_URLS", "PRYSM_BEACON_GRPC_GATEWAY_PORT", PRYSM_BEACON_GRPC_GATEWAY_PORT, count, host)
+
+class NodeRouter:
+    """Choose the ingress node of each transaction.
+
+    round_robin  rotate per transaction
+    sender       pin each sender to one node, so its nonces arrive in order
+    random       uniform per transaction
+    """
+
+    def __init__(self, urls, policy="round_robin", seed=None):
+        if policy not in ROUTE_POLICIES:
+            raise ValueError(f"Unknown route policy {policy}")
+        self.urls = list(urls)
+        self.policy = policy
+        self.node_of = {}       # tag -> node index
+        self._next = 0
+        self._by_sender = {}
+        self._rng = random.Random(seed)
+
+    def __len__(self):
+        return len(self.urls)
+
+    def route(self, tag, sender=None):
+        if self.policy == "sender" and sender is not None:
+            node = self._by_sender.setdefault(sender.lower(), len(self._by_sender) % len(self.urls))
+        elif self.policy == "random":
+            node = self._rng.randrange(len(self.urls))
+        else:
+            node = self._next
+            self._next = (self._next + 1) % len(self.urls)
+        self.node_of[tag] = node
+        return node
+
+    def split(self, signed, sender_of):
+        """Group [(tag, raw_tx)] by ingress node: {node: [(tag, raw_tx)]}."""
+        groups = {}
+        for tag, raw in signed:
+            groups.setdefault(self.route(tag, sender_of(tag)), []).append((tag, raw))
+        return groups
@@ -0,0 +1,9 @@
+"""Nearest-rank percentiles shared by the run reports, monitors and the rate controller."""
+import math
+
+def percentile(values, q):
+    """Nearest-rank percentile of `values` (any order) for q in 0..1; None when empty."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))]
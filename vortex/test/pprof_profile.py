@@ -0,0 +1,208 @@
+"""In-process reader for Go pprof CPU profiles (gzipped profile.proto).
+
+Decodes the protobuf directly, so analysing a profile needs neither a Go
+toolchain nor `go tool pprof`. Samples are aggregated into a stack table
+(function names, root first -> value) from which flat and cumulative times
+for any function pattern and folded stacks for flame graphs are derived.
+
+Usage: python pprof_profile.py cpu.prof [--folded cpu.folded] [--top 20]
+"""
+import argparse
+import gzip
+import re
+from collections import defaultdict
+
+# Functions the reports break CPU time down by; values are regexes over the
+# fully qualified Go function name.
+PATTERNS = {
+    "StateProcessor.Process": r"core\.\(\*StateProcessor\)\.Process$",
+    "bn256Pairing": r"core/vm\.\(\*bn256Pairing\w*\)\.Run$",
+    "txpool": r"core/txpool[/.]",
+    "trieCommit": r"trie\.\(\*\w*Trie\)\.Commit$|state\.\(\*StateDB\)\.Commit$",
+}
+
+class ProfileError(Exception):
+    pass
+
+def _varint(buf, pos):
+    result = shift = 0
+    while True:
+        b = buf[pos]
+        pos += 1
+        result |= (b & 0x7F) << shift
+        if b < 0x80:
+            return result, pos
+        shift += 7
+
+def _fields(buf):
+    """Yield (field number, wire type, value) of one protobuf message.
+
+    Length-delimited values are returned as memoryview slices.
+    """
+    pos, end = 0, len(buf)
+    while pos < end:
+        key, pos = _varint(buf, pos)
+        num, wt = key >> 3, key & 7
+        if wt == 0:
+            val, pos = _varint(buf, pos)
+        elif wt == 2:
+            n, pos = _varint(buf, pos)
+            val = buf[pos:pos + n]
+            pos += n
+        elif wt == 1:
+            val = int.from_bytes(buf[pos:pos + 8], "little")
+            pos += 8
+        elif wt == 5:
+            val = int.from_bytes(buf[pos:pos + 4], "little")
+            pos += 4
+        else:
+            raise ProfileError(f"Unsupported wire type {wt}")
+        yield num, wt, val
+
+def _repeated_ints(wt, val):
+    """Values of a repeated integer field, packed (wire type 2) or not."""
+    if wt == 0:
+        return [val]
+    out, pos = [], 0
+    while pos < len(val):
+        v, pos = _varint(val, pos)
+        out.append(v)
+    return out
+
+def _signed(v):
+    return v - (1 << 64) if v >= 1 << 63 else v
+
+class Profile:
+    """Decoded pprof profile reduced to a stack table."""
+
+    def __init__(self, data):
+        if data[:2] == b"\x1f\x8b":
+            data = gzip.decompress(data)
+        buf = memoryview(data)
+        strings, sample_types, samples = [], [], []
+        locations, functions = {}, {}
+        self.period = 0
+        self.duration_nanos = 0
+        for num, wt, val in _fields(buf):
+            if num == 1:
+                vt = dict((n, v) for n, _, v in _fields(val))
+                sample_types.append((vt.get(1, 0), vt.get(2, 0)))
+            elif num == 2:
+                locs, values = [], []
+                for n, w, v in _fields(val):
+                    if n == 1:
+                        locs += _repeated_ints(w, v)
+                    elif n == 2:
+                        values += [_signed(x) for x in _repeated_ints(w, v)]
+                samples.append((locs, values))
+            elif num == 4:
+                loc_id, funcs = 0, []
+                for n, _, v in _fields(val):
+                    if n == 1:
+                        loc_id = v
+                    elif n == 4:
+                        line = dict((ln, lv) for ln, _, lv in _fields(v))
+                        funcs.append(line.get(1, 0))
+                locations[loc_id] = funcs
+            elif num == 5:
+                fn = dict((n, v) for n, _, v in _fields(val))
+                functions[fn.get(1, 0)] = fn.get(2, 0)
+            elif num == 6:
+                strings.append(bytes(val).decode("utf-8", "replace"))
+            elif num == 10:
+                self.duration_nanos = val
+            elif num == 12:
+                self.period = val
+
+        self.sample_types = [(strings[t], strings[u]) for t, u in sample_types]
+        names = {fid: strings[s] for fid, s in functions.items()}
+        # A location holds its inlined frames innermost first, like the sample's location list
+        frames = {lid: [names.get(f, "?") for f in fids] for lid, fids in locations.items()}
+        self.value_index = self._time_index()
+        self.stacks = defaultdict(int)
+        for locs, values in samples:
+            if not values:
+                continue
+            leaf_first = [name for lid in locs for name in frames.get(lid, ["?"])]
+            self.stacks[tuple(reversed(leaf_first))] += values[self.value_index]
+
+    def _time_index(self):
+        for k, (kind, unit) in enumerate(self.sample_types):
+            if kind == "cpu" and unit == "nanoseconds":
+                return k
+        return len(self.sample_types) - 1 if self.sample_types else 0
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            return cls(f.read())
+
+    def add(self, other):
+        """Merge another profile's samples into this one (e.g. consecutive segments)."""
+        for stack, v in other.stacks.items():
+            self.stacks[stack] += v
+        self.duration_nanos += other.duration_nanos
+
+    @property
+    def total(self):
+        return sum(self.stacks.values())
+
+    def flat_cum(self, pattern):
+        """(flat, cum) nanoseconds of functions matching `pattern`.
+
+        Flat counts samples whose leaf matches; cum counts every sample with a
+        matching frame anywhere on the stack, once per sample.
+        """
+        rx = re.compile(pattern)
+        flat = cum = 0
+        for stack, v in self.stacks.items():
+            if rx.search(stack[-1]):
+                flat += v
+            if any(rx.search(f) for f in stack):
+                cum += v
+        return flat, cum
+
+    def breakdown(self, patterns=None):
+        """{name: (flat_seconds, cum_seconds)} for each pattern in `patterns` (default PATTERNS)."""
+        patterns = patterns or PATTERNS
+        return {name: tuple(x / 1e9 for x in self.flat_cum(rx)) for name, rx in patterns.items()}
+
+    def top(self, n=20):
+        """[(function, flat_ns, cum_ns)] sorted by flat time, like `pprof -top`."""
+        flat, cum = defaultdict(int), defaultdict(int)
+        for stack, v in self.stacks.items():
+            flat[stack[-1]] += v
+            for f in set(stack):
+                cum[f] += v
+        ranked = sorted(cum, key=lambda f: (flat[f], cum[f]), reverse=True)[:n]
+        return [(f, flat[f], cum[f]) for f in ranked]
+
+    def folded(self):
+        """Folded stacks ("root;...;leaf value" lines) for flamegraph.pl / speedscope."""
+        return [f"{';'.join(stack)} {v}" for stack, v in sorted(self.stacks.items()) if v]
+
+    def write_folded(self, path):
+        with open(path, "w") as f:
+            for line in self.folded():
+                f.write(line + "\n")
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarise a Go CPU profile without go tool pprof")
+    parser.add_argument("profile")
+    parser.add_argument("--folded", default=None, help="write folded stacks to this file")
+    parser.add_argument("--top", type=int, default=20)
+    args = parser.parse_args()
+
+    prof = Profile.load(args.profile)
+    print(f"{args.profile} :: {prof.total / 1e9:.2f}s sampled over {prof.duration_nanos / 1e9:.2f}s")
+    print(f"{'flat':>10} {'cum':>10}  function")
+    for fn, flat, cum in prof.top(args.top):
+        print(f"{flat / 1e9:>9.2f}s {cum / 1e9:>9.2f}s  {fn}")
+    for name, (flat, cum) in prof.breakdown().items():
+        print(f"{name} :: flat {flat:.2f}s, cum {cum:.2f}s")
+    if args.folded:
+        prof.write_folded(args.folded)
+        print(f"Folded Stacks :: {args.folded}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,276 @@
+"""Resource sampler for the testnet.sh processes.
+
+Finds the geth, beacon-chain, validator and bootnode processes on this host
+and labels them by the node-<i> data directory testnet.sh gives each client.
+A thread then reads /proc/<pid>/stat, status and io every `interval` seconds
+through descriptors that stay open for the whole run (one pread each, no
+reopen), and turns the counters into per-process CPU%, RSS, disk read/write
+bytes and context switches.
+
+Every sample carries the head block number (polled every `head_interval`),
+so the series lines up with block_details.csv. Written to the run directory:
+
+    process_series.csv   one row per process per sample
+    process_blocks.csv   CPU seconds, peak RSS and I/O per process per block
+    process_summary.json per-process totals for the run report
+
+Usage: python process_sampler.py [--interval SECS] [--duration SECS] [--out-dir DIR]
+"""
+import argparse
+import csv
+import json
+import os
+import re
+import threading
+import time
+
+from web3 import Web3
+
+PROCESS_NAMES = ("geth", "beacon-chain", "validator", "bootnode")
+CLK_TCK = os.sysconf("SC_CLK_TCK")
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+NODE_DIR = re.compile(r"(?:^|[/=])node-(\d+)(?:/|$)")
+
+SERIES_FIELDS = ["t", "block", "process", "pid", "cpuSec", "cpuPct", "rssBytes", "readBytes", "writeBytes",
+                 "voluntaryCtx", "involuntaryCtx", "threads"]
+BLOCK_FIELDS = ["block", "process", "cpuSec", "rssPeakBytes", "readBytes", "writeBytes", "voluntaryCtx", "involuntaryCtx"]
+
+def _cmdline(pid):
+    try:
+        with open(f"/proc/{pid}/cmdline", "rb") as f:
+            return [a.decode(errors="replace") for a in f.read().split(b"\0") if a]
+    except OSError:
+        return []
+
+def node_label(name, args):
+    """geth-0, beacon-chain-1, validator-2 from the node-<i> data directory; None when there is none."""
+    if name == "bootnode":
+        return name
+    for a in args:
+        m = NODE_DIR.search(a)
+        if m:
+            return f"{name}-{m.group(1)}"
+    return None
+
+def find_processes(names=PROCESS_NAMES):
+    """{label: pid} of the matching processes visible in /proc."""
+    found = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/comm") as f:
+                comm = f.read().strip()
+        except OSError:
+            continue
+        # comm is cut at 15 characters; the executable's basename is the reliable match
+        args = _cmdline(entry)
+        name = os.path.basename(args[0]) if args else comm
+        if name not in names and comm not in names:
+            continue
+        name = name if name in names else comm
+        label = node_label(name, args) or f"{name}-pid{entry}"
+        found[label] = int(entry)
+    return dict(sorted(found.items()))
+
+class ProcFiles:
+    """Open /proc/<pid>/{stat,status,io} once and re-read them with pread."""
+
+    def __init__(self, pid):
+        self.pid = pid
+        self.stat = os.open(f"/proc/{pid}/stat", os.O_RDONLY)
+        self.status = os.open(f"/proc/{pid}/status", os.O_RDONLY)
+        try:
+            self.io = os.open(f"/proc/{pid}/io", os.O_RDONLY)
+        except OSError:
+            # io needs the same user (or CAP_SYS_PTRACE)
+            self.io = None
+
+    def read(self):
+        """(cpu ticks, rss bytes, threads, read bytes, write bytes, voluntary ctx, involuntary ctx)."""
+        stat = os.pread(self.stat, 4096, 0).decode()
+        # Fields after the parenthesised comm, which may itself contain spaces
+        fields = stat[stat.rindex(")") + 2:].split()
+        ticks = int(fields[11]) + int(fields[12])
+        threads, rss = int(fields[17]), int(fields[21]) * PAGE_SIZE
+        vol = invol = None
+        for line in os.pread(self.status, 8192, 0).decode().splitlines():
+            if line.startswith("voluntary_ctxt_switches:"):
+                vol = int(line.split()[1])
+            elif line.startswith("nonvoluntary_ctxt_switches:"):
+                invol = int(line.split()[1])
+        rd = wr = None
+        if self.io is not None:
+            for line in os.pread(self.io, 4096, 0).decode().splitlines():
+                if line.startswith("read_bytes:"):
+                    rd = int(line.split()[1])
+                elif line.startswith("write_bytes:"):
+                    wr = int(line.split()[1])
+        return ticks, rss, threads, rd, wr, vol, invol
+
+    def close(self):
+        for fd in (self.stat, self.status, self.io):
+            if fd is not None:
+                os.close(fd)
+
+def _delta(new, old):
+    return new - old if new is not None and old is not None else None
+
+class ProcessSampler:
+    def __init__(self, rpc_url, run_dir, interval=0.25, head_interval=0.5, names=PROCESS_NAMES):
+        self.rpc_url = rpc_url
+        self.run_dir = run_dir
+        self.interval = interval
+        self.head_interval = head_interval
+        self.names = names
+        self.rows = []
+        self.files = {}
+        self.head = None
+        self._stop = threading.Event()
+        self._threads = []
+
+    def start(self):
+        for label, pid in find_processes(self.names).items():
+            try:
+                self.files[label] = ProcFiles(pid)
+            except OSError as e:
+                print(f"Process Sampler :: cannot read {label} ({pid}): {e}")
+        if not self.files:
+            print(f"Process Sampler :: none of {', '.join(self.names)} running on this host")
+            return self
+        print(f"Process Sampler :: {', '.join(f'{k} ({f.pid})' for k, f in self.files.items())}")
+        for target in (self._follow_head, self._loop):
+            t = threading.Thread(target=target, daemon=True)
+            t.start()
+            self._threads.append(t)
+        return self
+
+    def _follow_head(self):
+        if not self.rpc_url:
+            return
+        w3 = Web3(Web3.HTTPProvider(self.rpc_url))
+        while not self._stop.is_set():
+            try:
+                self.head = w3.eth.block_number
+            except Exception:
+                pass
+            self._stop.wait(self.head_interval)
+
+    def _loop(self):
+        t0 = time.monotonic()
+        last = {}
+        while True:
+            now = time.monotonic()
+            for label, files in list(self.files.items()):
+                try:
+                    cur = files.read()
+                except OSError:
+                    # The process exited; keep what was recorded
+                    files.close()
+                    del self.files[label]
+                    continue
+                prev = last.get(label)
+                last[label] = (now, cur)
+                if prev is None:
+                    continue
+                dt = now - prev[0]
+                ticks, rss, threads, rd, wr, vol, invol = cur
+                cpu = (ticks - prev[1][0]) / CLK_TCK
+                self.rows.append({
+                    "t": round(now - t0, 3), "block": self.head, "process": label, "pid": files.pid,
+                    "cpuSec": cpu, "cpuPct": round(cpu / dt * 100, 2) if dt > 0 else None,
+                    "rssBytes": rss, "readBytes": _delta(rd, prev[1][3]), "writeBytes": _delta(wr, prev[1][4]),
+                    "voluntaryCtx": _delta(vol, prev[1][5]), "involuntaryCtx": _delta(invol, prev[1][6]),
+                    "threads": threads,
+                })
+            if self._stop.wait(max(0.0, self.interval - (time.monotonic() - now))):
+                break
+
+    def stop(self):
+        """Stop sampling, write the series / per-block / summary files and return the summary."""
+        self._stop.set()
+        for t in self._threads:
+            t.join()
+        for files in self.files.values():
+            files.close()
+        self.files = {}
+        if not self.rows:
+            return {}
+        summary = self.summary()
+        os.makedirs(self.run_dir, exist_ok=True)
+        for name, fields, rows in (("process_series.csv", SERIES_FIELDS, self.rows),
+                                   ("process_blocks.csv", BLOCK_FIELDS, self.per_block())):
+            with open(os.path.join(self.run_dir, name), "w", newline="") as f:
+                writer = csv.DictWriter(f, fieldnames=fields)
+                writer.writeheader()
+                writer.writerows(rows)
+        with open(os.path.join(self.run_dir, "process_summary.json"), "w") as f:
+            json.dump(summary, f, indent=2)
+        print_summary(summary)
+        return summary
+
+    def per_block(self):
+        """Aggregate the samples by (block, process)."""
+        out = {}
+        for r in self.rows:
+            if r["block"] is None:
+                continue
+            agg = out.setdefault((r["block"], r["process"]), {
+                "block": r["block"], "process": r["process"], "cpuSec": 0.0, "rssPeakBytes": 0,
+                "readBytes": 0, "writeBytes": 0, "voluntaryCtx": 0, "involuntaryCtx": 0,
+            })
+            agg["cpuSec"] += r["cpuSec"]
+            agg["rssPeakBytes"] = max(agg["rssPeakBytes"], r["rssBytes"])
+            for k in ("readBytes", "writeBytes", "voluntaryCtx", "involuntaryCtx"):
+                agg[k] += r[k] or 0
+        return [out[k] for k in sorted(out)]
+
+    def summary(self):
+        by_process = {}
+        for r in self.rows:
+            by_process.setdefault(r["process"], []).append(r)
+        out = {}
+        for label, rows in by_process.items():
+            cpu = [r["cpuPct"] for r in rows if r["cpuPct"] is not None]
+            total = lambda k: sum(r[k] for r in rows if r[k] is not None) if any(r[k] is not None for r in rows) else None
+            out[label] = {
+                "samples": len(rows),
+                "cpuSec": sum(r["cpuSec"] for r in rows),
+                "cpuPctMean": sum(cpu) / len(cpu) if cpu else None,
+                "cpuPctMax": max(cpu, default=None),
+                "rssPeakBytes": max(r["rssBytes"] for r in rows),
+                "readBytes": total("readBytes"),
+                "writeBytes": total("writeBytes"),
+                "voluntaryCtx": total("voluntaryCtx"),
+                "involuntaryCtx": total("involuntaryCtx"),
+            }
+        return out
+
+def print_summary(summary):
+    mb = lambda v: "n/a" if v is None else f"{v / 2**20:.1f}MB"
+    fmt = lambda v: "n/a" if v is None else f"{v:.1f}"
+    print("======== PROCESS RESOURCES ========")
+    for label, s in summary.items():
+        print(f"{label} :: CPU {s['cpuSec']:.2f} sec(s), mean {fmt(s['cpuPctMean'])}% max {fmt(s['cpuPctMax'])}%, "
+              f"RSS peak {mb(s['rssPeakBytes'])}, Disk read {mb(s['readBytes'])} write {mb(s['writeBytes'])}, "
+              f"Ctx switches {s['voluntaryCtx']}/{s['involuntaryCtx']} (vol/invol)")
+    print("======== END ========")
+
+def main():
+    parser = argparse.ArgumentParser(description="Sample CPU, RSS, disk I/O and context switches of the testnet processes")
+    parser.add_argument("--interval", type=float, default=0.25)
+    parser.add_argument("--duration", type=float, default=60, help="seconds to sample")
+    parser.add_argument("--out-dir", default=None, help="default READINGS_DIR")
+    args = parser.parse_args()
+
+    sampler = ProcessSampler(os.getenv("RPC_URL"), args.out_dir or os.getenv("READINGS_DIR") or ".", args.interval).start()
+    try:
+        time.sleep(args.duration)
+    except KeyboardInterrupt:
+        pass
+    sampler.stop()
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+    load_dotenv("../.env")
+    main()
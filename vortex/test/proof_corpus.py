@@ -0,0 +1,251 @@
+"""Packed, memory-mapped Groth16 proof corpus.
+
+One file replaces the `PROOFS_DIR/<id>/{proof,public}.json` tree:
+
+    header   magic "VXPC", version u32, count u64, total public signals u64, pad to 32 bytes
+    ids      count x u64                      proof IDs, ascending
+    offsets  (count + 1) x u64                start of each proof's public signals
+    proofs   count x 8 x 32-byte field elem   pi_a[0..1], pi_b[0][0..1], pi_b[1][0..1], pi_c[0..1]
+    publics  total x 32-byte field elem       public signals of every proof, back to back
+
+Integers are little-endian; field elements are 32-byte big-endian, exactly
+as they appear in ABI-encoded calldata, and keep snarkjs' (unswapped) order.
+
+Usage: python proof_corpus.py convert [--proofs-dir DIR] [--out FILE]
+       python proof_corpus.py info [FILE]
+"""
+import argparse
+import bisect
+import json
+import mmap
+import os
+import struct
+
+MAGIC = b"VXPC"
+VERSION = 1
+HEADER = struct.Struct("<4sIQQ")
+HEADER_SIZE = 32
+ELEM = 32
+PROOF_ELEMS = 8
+PROOF_SIZE = PROOF_ELEMS * ELEM
+
+def default_corpus_path(build_dir):
+    return os.getenv("PROOF_CORPUS") or os.path.join(build_dir, "proofs.corpus")
+
+def flatten_proof(proof):
+    """Return the 8 proof coordinates of a snarkjs proof.json in corpus order."""
+    return [
+        proof["pi_a"][0], proof["pi_a"][1],
+        proof["pi_b"][0][0], proof["pi_b"][0][1],
+        proof["pi_b"][1][0], proof["pi_b"][1][1],
+        proof["pi_c"][0], proof["pi_c"][1],
+    ]
+
+def encode_elems(values):
+    return b"".join(int(v).to_bytes(ELEM, "big") for v in values)
+
+def decode_elems(buf):
+    return [int.from_bytes(buf[k:k + ELEM], "big") for k in range(0, len(buf), ELEM)]
+
+class CorpusWriter:
+    """Collect proofs in memory and write the packed file on close()."""
+
+    def __init__(self, path):
+        self.path = path
+        self.records = {}
+
+    def add(self, proof_id, proof, public):
+        self.records[int(proof_id)] = (encode_elems(flatten_proof(proof)), encode_elems(public))
+
+    def close(self):
+        ids = sorted(self.records)
+        offsets = [0]
+        for i in ids:
+            offsets.append(offsets[-1] + len(self.records[i][1]) // ELEM)
+        tmp = self.path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, len(ids), offsets[-1]).ljust(HEADER_SIZE, b"\0"))
+            f.write(struct.pack(f"<{len(ids)}Q", *ids))
+            f.write(struct.pack(f"<{len(offsets)}Q", *offsets))
+            for i in ids:
+                f.write(self.records[i][0])
+            for i in ids:
+                f.write(self.records[i][1])
+        os.replace(tmp, self.path)
+        return len(ids)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        if exc_type is None:
+            self.close()
+
+class ProofCorpus:
+    """Read-only view over a packed corpus; slices are zero-copy memoryviews."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.buf = memoryview(self._mm)
+        magic, version, count, total = HEADER.unpack_from(self.buf, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a v{VERSION} proof corpus")
+        self.count = count
+        pos = HEADER_SIZE
+        self.ids = self.buf[pos:pos + 8 * count].cast("Q")
+        pos += 8 * count
+        self.offsets = self.buf[pos:pos + 8 * (count + 1)].cast("Q")
+        pos += 8 * (count + 1)
+        self._proofs_at = pos
+        self._publics_at = pos + PROOF_SIZE * count
+
+    def __len__(self):
+        return self.count
+
+    def index_of(self, proof_id):
+        k = bisect.bisect_left(self.ids, proof_id)
+        if k == self.count or self.ids[k] != proof_id:
+            raise KeyError(proof_id)
+        return k
+
+    def proof_bytes(self, k):
+        """32-byte big-endian pi_a/pi_b/pi_c coordinates of the k-th proof."""
+        at = self._proofs_at + PROOF_SIZE * k
+        return self.buf[at:at + PROOF_SIZE]
+
+    def public_bytes(self, k):
+        """32-byte big-endian public signals of the k-th proof."""
+        return self.buf[self._publics_at + ELEM * self.offsets[k]:self._publics_at + ELEM * self.offsets[k + 1]]
+
+    def proof(self, k):
+        """Decode the k-th proof to (pi_a, pi_b, pi_c, public) in snarkjs order."""
+        e = decode_elems(self.proof_bytes(k))
+        return [e[0], e[1]], [[e[2], e[3]], [e[4], e[5]]], [e[6], e[7]], decode_elems(self.public_bytes(k))
+
+    def load_all(self):
+        """Decode every proof in one pass; returns {proof_id: (pi_a, pi_b, pi_c, public)}."""
+        elems = decode_elems(self.buf[self._proofs_at:self._publics_at])
+        publics = decode_elems(self.buf[self._publics_at:])
+        out = {}
+        for k in range(self.count):
+            e = elems[PROOF_ELEMS * k:PROOF_ELEMS * (k + 1)]
+            out[self.ids[k]] = (
+                [e[0], e[1]], [[e[2], e[3]], [e[4], e[5]]], [e[6], e[7]],
+                publics[self.offsets[k]:self.offsets[k + 1]],
+            )
+        return out
+
+    def close(self):
+        self.ids.release()
+        self.offsets.release()
+        self.buf.release()
+        self._mm.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def read_proof_dir(proofs_dir, proof_id):
+    """Return (proof, public) parsed from PROOFS_DIR/<id>/, or None if incomplete."""
+    p = os.path.join(proofs_dir, str(proof_id))
+    try:
+        with open(os.path.join(p, "proof.json")) as f:
+            proof = json.load(f)
+        with open(os.path.join(p, "public.json")) as f:
+            public = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return proof, public
+
+def convert_proof_dirs(proofs_dir, out_path):
+    """Pack every complete PROOFS_DIR/<id>/ into out_path; returns the proof count."""
+    with CorpusWriter(out_path) as writer:
+        for name in os.listdir(proofs_dir):
+            if not name.isdigit():
+                continue
+            parsed = read_proof_dir(proofs_dir, name)
+            if parsed is not None:
+                writer.add(name, *parsed)
+    return len(writer.records)
+
+def available_proof_ids(proofs_dir, corpus_path):
+    """Sorted IDs of every proof in the corpus, or in PROOFS_DIR if there is no corpus."""
+    if os.path.isfile(corpus_path):
+        with ProofCorpus(corpus_path) as corpus:
+            return corpus.ids.tolist()
+    return sorted(int(name) for name in os.listdir(proofs_dir) if name.isdigit())
+
+def load_proofs(proofs_dir, corpus_path, ids):
+    """Return {proof_id: (pi_a, pi_b, pi_c, public)} for ids.
+
+    Reads the packed corpus in one go when it exists and falls back to the
+    per-proof JSON directories otherwise.
+    """
+    if os.path.isfile(corpus_path):
+        with ProofCorpus(corpus_path) as corpus:
+            proofs = corpus.load_all()
+        missing = [i for i in ids if i not in proofs]
+        if missing:
+            raise KeyError(f"{len(missing)} proof(s) missing from {corpus_path}, e.g. {missing[0]}")
+        return {i: proofs[i] for i in ids}
+
+    proofs = {}
+    for i in ids:
+        parsed = read_proof_dir(proofs_dir, i)
+        if parsed is None:
+            raise KeyError(f"Proof {i} missing from {proofs_dir}")
+        e = [int(x) for x in flatten_proof(parsed[0])]
+        proofs[i] = ([e[0], e[1]], [[e[2], e[3]], [e[4], e[5]]], [e[6], e[7]], [int(x) for x in parsed[1]])
+    return proofs
+
+def iter_proofs(proofs_dir, corpus_path, ids):
+    """Yield (proof_id, (pi_a, pi_b, pi_c, public)) for ids, decoding one proof at a time.
+
+    Unlike load_proofs() nothing is held beyond the current proof, so a
+    stream of any length reads the corpus in constant memory.
+    """
+    if os.path.isfile(corpus_path):
+        with ProofCorpus(corpus_path) as corpus:
+            for i in ids:
+                yield i, corpus.proof(corpus.index_of(i))
+        return
+    for i in ids:
+        parsed = read_proof_dir(proofs_dir, i)
+        if parsed is None:
+            raise KeyError(f"Proof {i} missing from {proofs_dir}")
+        e = [int(x) for x in flatten_proof(parsed[0])]
+        yield i, ([e[0], e[1]], [[e[2], e[3]], [e[4], e[5]]], [e[6], e[7]], [int(x) for x in parsed[1]])
+
+def main():
+    parser = argparse.ArgumentParser(description="Pack and inspect proof corpora")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    conv = sub.add_parser("convert", help="pack PROOFS_DIR/<id>/{proof,public}.json into one file")
+    conv.add_argument("--proofs-dir", default=None)
+    conv.add_argument("--out", default=None)
+    info = sub.add_parser("info", help="print corpus summary")
+    info.add_argument("path", nargs="?", default=None)
+    args = parser.parse_args()
+
+    build_dir = os.getenv("BUILD_DIR") or "."
+    if args.cmd == "convert":
+        proofs_dir = args.proofs_dir or os.path.join(build_dir, "proofs")
+        out = args.out or default_corpus_path(build_dir)
+        n = convert_proof_dirs(proofs_dir, out)
+        print(f"Packed {n} proof(s) from {proofs_dir} :: {out} ({os.path.getsize(out)} bytes)")
+    else:
+        path = args.path or default_corpus_path(build_dir)
+        with ProofCorpus(path) as corpus:
+            if len(corpus) == 0:
+                print(f"{path} :: empty")
+                return
+            print(f"{path} :: {len(corpus)} proof(s), IDs {corpus.ids[0]}..{corpus.ids[-1]}, "
+                  f"{corpus.offsets[len(corpus)]} public signal(s)")
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+    load_dotenv("../.env")
+    main()
@@ -0,0 +1,239 @@
+"""Per-node ingress throughput and transaction propagation latency.
+
+While a run spreads transactions over several nodes (NodeRouter), a thread
+polls txpool_inspect on every node each `interval` seconds and records when
+each submitted (sender, nonce) first shows up in each node's pool. After the
+run the inclusion block of every transaction is fetched, and with a beacon
+URL the block's proposer node, giving:
+
+    propagation latency   first seen at a peer - accepted by the ingress node
+    full propagation      the same to the last node to see it
+    proposer margin       block timestamp - first seen at the proposing node
+                          (positive: it was there before the slot started)
+
+Times are resolved to the poll interval; submit times are per batch with
+the streaming pipeline and per node's share otherwise. Results are written to
+propagation.csv (per transaction) and propagation_nodes.csv (per node) in the
+run directory.
+"""
+import asyncio
+import csv
+import json
+import os
+import threading
+import time
+
+import aiohttp
+
+from percentiles import percentile
+from rpc_async import AsyncRpcClient
+
+TX_FIELDS = ["txHash", "sender", "nonce", "ingress", "submittedAt", "block", "blockTimestamp", "proposer",
+             "fullPropagationSec", "proposerMarginSec"]
+NODE_FIELDS = ["node", "url", "ingressTxns", "ingressRejected", "ingressPerSec", "seenTxns",
+               "propagationSecP50", "propagationSecP90", "proposedBlocks", "proposerMarginSecP50"]
+
+class Tracked:
+    __slots__ = ("tx_hash", "sender", "nonce", "ingress", "submitted_at", "seen", "block")
+
+    def __init__(self, tx_hash, sender, nonce, ingress, submitted_at, nodes):
+        self.tx_hash = tx_hash
+        self.sender = sender
+        self.nonce = nonce
+        self.ingress = ingress
+        self.submitted_at = submitted_at
+        self.seen = [None] * nodes
+        self.block = None
+
+class PropagationMonitor:
+    def __init__(self, urls, run_dir, interval=0.5, beacon_url=None):
+        self.urls = list(urls)
+        self.run_dir = run_dir
+        self.interval = interval
+        self.beacon_url = beacon_url
+        self.tracked = {}           # (sender, nonce) -> Tracked
+        self.rejected = [0] * len(self.urls)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=lambda: asyncio.run(self._loop()), daemon=True)
+        self._thread.start()
+        return self
+
+    def note_submitted(self, entries):
+        """Record accepted submissions as [(tx_hash, sender, nonce, ingress node)]."""
+        now = time.time()
+        with self._lock:
+            for tx_hash, sender, nonce, node in entries:
+                t = Tracked(bytes(tx_hash), sender.lower(), nonce, node, now, len(self.urls))
+                t.seen[node] = now
+                self.tracked[(t.sender, nonce)] = t
+
+    def note_rejected(self, node, count=1):
+        with self._lock:
+            self.rejected[node] += count
+
+    async def _loop(self):
+        clients = [AsyncRpcClient(url, pool_size=2) for url in self.urls]
+        for c in clients:
+            await c.__aenter__()
+        try:
+            while not self._stop.is_set():
+                started = time.time()
+                await asyncio.gather(*(self._sample(k, c) for k, c in enumerate(clients)))
+                await asyncio.sleep(max(0.0, self.interval - (time.time() - started)))
+        finally:
+            for c in clients:
+                await c.__aexit__(None, None, None)
+
+    async def _sample(self, node, client):
+        try:
+            pool = await client.call("txpool_inspect")
+        except Exception as e:
+            print(f"Propagation Sample Error :: node {node}: {e}")
+            return
+        t = time.time()
+        with self._lock:
+            for kind in ("pending", "queued"):
+                for sender, nonces in (pool.get(kind) or {}).items():
+                    sender = sender.lower()
+                    for n in nonces:
+                        tr = self.tracked.get((sender, int(n)))
+                        if tr is not None and tr.seen[node] is None:
+                            tr.seen[node] = t
+
+    def stop(self):
+        """Stop polling, resolve inclusion blocks and proposers, write the reports and return the summary."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        blocks = asyncio.run(self._resolve())
+        rows, nodes = self.tx_rows(blocks), self.node_rows(blocks)
+        summary = self.summary(rows)
+        os.makedirs(self.run_dir, exist_ok=True)
+        for name, fields, data in (("propagation.csv", TX_FIELDS, rows), ("propagation_nodes.csv", NODE_FIELDS, nodes)):
+            with open(os.path.join(self.run_dir, name), "w", newline="") as f:
+                writer = csv.DictWriter(f, fieldnames=fields)
+                writer.writeheader()
+                writer.writerows(data)
+        with open(os.path.join(self.run_dir, "propagation_summary.json"), "w") as f:
+            json.dump({"summary": summary, "nodes": nodes}, f, indent=2)
+        print_report(summary, nodes)
+        return summary
+
+    async def _resolve(self, batch_size=100):
+        """Fill in each transaction's block; returns {block: (timestamp, proposer node or None)}.
+
+        A batch that fails leaves its transactions' blocks (or timestamps) unknown.
+        """
+        tracked = list(self.tracked.values())
+        async with AsyncRpcClient(self.urls[0]) as client:
+            for k in range(0, len(tracked), batch_size):
+                chunk = tracked[k:k + batch_size]
+                try:
+                    results = await client.batch([("eth_getTransactionReceipt", ["0x" + t.tx_hash.hex()]) for t in chunk])
+                except Exception as e:
+                    # The run's metrics must survive; these transactions are reported with no block
+                    print(f"Propagation Resolve Error :: receipts: {e}")
+                    continue
+                for t, (rc, _) in zip(chunk, results):
+                    if rc is not None:
+                        t.block = int(rc["blockNumber"], 16)
+            numbers = sorted({t.block for t in tracked if t.block is not None})
+            timestamps = {}
+            for k in range(0, len(numbers), batch_size):
+                chunk = numbers[k:k + batch_size]
+                try:
+                    results = await client.batch([("eth_getBlockByNumber", [hex(n), False]) for n in chunk])
+                except Exception as e:
+                    print(f"Propagation Resolve Error :: blocks: {e}")
+                    continue
+                for n, (block, _) in zip(chunk, results):
+                    if block is not None:
+                        timestamps[n] = int(block["timestamp"], 16)
+        proposers = await self._proposers(timestamps) if self.beacon_url else {}
+        return {n: (ts, proposers.get(n)) for n, ts in timestamps.items()}
+
+    async def _proposers(self, timestamps):
+        """{block: proposer node} from the beacon headers of the blocks' slots."""
+        out = {}
+        try:
+            async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=30)) as session:
+                async def get(path):
+                    async with session.get(self.beacon_url + path) as resp:
+                        resp.raise_for_status()
+                        return (await resp.json())["data"]
+
+                genesis = int((await get("/eth/v1/beacon/genesis"))["genesis_time"])
+                seconds_per_slot = int((await get("/eth/v1/config/spec"))["SECONDS_PER_SLOT"])
+                for n, ts in timestamps.items():
+                    header = await get(f"/eth/v1/beacon/headers/{(ts - genesis) // seconds_per_slot}")
+                    proposer = int(header["header"]["message"]["proposer_index"])
+                    if proposer < len(self.urls):
+                        out[n] = proposer
+        except Exception as e:
+            print(f"Beacon API unavailable ({e}) :: proposer margin not reported")
+        return out
+
+    def tx_rows(self, blocks):
+        rows = []
+        for t in self.tracked.values():
+            ts, proposer = blocks.get(t.block, (None, None))
+            full = max(t.seen) - t.submitted_at if all(s is not None for s in t.seen) else None
+            margin = ts - t.seen[proposer] if proposer is not None and t.seen[proposer] is not None else None
+            rows.append({
+                "txHash": "0x" + t.tx_hash.hex(), "sender": t.sender, "nonce": t.nonce, "ingress": t.ingress,
+                "submittedAt": round(t.submitted_at, 3), "block": t.block, "blockTimestamp": ts,
+                "proposer": proposer, "fullPropagationSec": full, "proposerMarginSec": margin,
+            })
+        return rows
+
+    def node_rows(self, blocks):
+        rows = []
+        for k, url in enumerate(self.urls):
+            ingress = [t for t in self.tracked.values() if t.ingress == k]
+            times = [t.submitted_at for t in ingress]
+            span = max(times) - min(times) if len(times) > 1 else 0
+            # Latency of this node as a receiver of transactions that entered elsewhere
+            latency = [t.seen[k] - t.submitted_at for t in self.tracked.values()
+                       if t.ingress != k and t.seen[k] is not None]
+            proposed = {n for n, (_, p) in blocks.items() if p == k}
+            margins = [blocks[t.block][0] - t.seen[k] for t in self.tracked.values()
+                       if t.block in proposed and t.seen[k] is not None]
+            rows.append({
+                "node": k, "url": url, "ingressTxns": len(ingress), "ingressRejected": self.rejected[k],
+                "ingressPerSec": len(ingress) / span if span else None,
+                "seenTxns": sum(t.seen[k] is not None for t in self.tracked.values()),
+                "propagationSecP50": percentile(latency, 0.5), "propagationSecP90": percentile(latency, 0.9),
+                "proposedBlocks": len(proposed), "proposerMarginSecP50": percentile(margins, 0.5),
+            })
+        return rows
+
+    def summary(self, rows):
+        full = [r["fullPropagationSec"] for r in rows if r["fullPropagationSec"] is not None]
+        margins = [r["proposerMarginSec"] for r in rows if r["proposerMarginSec"] is not None]
+        return {
+            "nodes": len(self.urls),
+            "tracked": len(rows),
+            "seenEverywhere": len(full),
+            "fullPropagationSecP50": percentile(full, 0.5),
+            "fullPropagationSecP90": percentile(full, 0.9),
+            "proposerMarginSecP50": percentile(margins, 0.5),
+            # Included although the proposer was not seen holding it before its slot began
+            "lateAtProposer": sum(m < 0 for m in margins),
+        }
+
+def print_report(summary, nodes):
+    fmt = lambda v: "n/a" if v is None else (f"{v:.2f}" if isinstance(v, float) else str(v))
+    print("======== PROPAGATION ========")
+    print(f"Nodes: {summary['nodes']}, Tracked Txns: {summary['tracked']}, Seen on Every Node: {summary['seenEverywhere']}")
+    print(f"Full Propagation (sec): p50 {fmt(summary['fullPropagationSecP50'])}, p90 {fmt(summary['fullPropagationSecP90'])}")
+    print(f"Proposer Margin (sec): p50 {fmt(summary['proposerMarginSecP50'])}, late at proposer {summary['lateAtProposer']}")
+    for n in nodes:
+        print(f"Node {n['node']} ({n['url']}) :: Ingress {n['ingressTxns']} Txns at {fmt(n['ingressPerSec'])} per sec, "
+              f"{n['ingressRejected']} Rejected, Seen {n['seenTxns']}, "
+              f"Propagation p50/p90 {fmt(n['propagationSecP50'])}/{fmt(n['propagationSecP90'])} sec(s), "
+              f"Proposed {n['proposedBlocks']} Block(s)")
+    print("======== END ========")
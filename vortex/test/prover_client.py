@@ -0,0 +1,192 @@
+import asyncio
+import base64
+import itertools
+import json
+import os
+import subprocess
+import threading
+from concurrent.futures import Future
+
+DAEMON_SCRIPT = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "..", "scripts", "prover_daemon.js")
+)
+
+def daemon_command(build_dir, circuit_name, concurrency=1):
+    """Return the argv that starts prover_daemon.js for a built circuit."""
+    return [
+        "node",
+        DAEMON_SCRIPT,
+        os.path.join(build_dir, f"{circuit_name}_js", f"{circuit_name}.wasm"),
+        os.path.join(build_dir, f"{circuit_name}.zkey"),
+        str(concurrency),
+    ]
+
+def encode_request(req_id, inp=None, wtns=None):
+    req = {"id": req_id}
+    if wtns is not None:
+        req["wtns"] = base64.b64encode(wtns).decode()
+    else:
+        req["input"] = inp
+    return (json.dumps(req) + "\n").encode()
+
+def write_proof_files(dst, proof, public_signals):
+    """Write proof.json / public.json in the same layout as `snarkjs groth16 prove`."""
+    os.makedirs(dst, exist_ok=True)
+    with open(os.path.join(dst, "proof.json"), "w") as f:
+        json.dump(proof, f, indent=1)
+    with open(os.path.join(dst, "public.json"), "w") as f:
+        json.dump(public_signals, f, indent=1)
+
+class ProverError(Exception):
+    pass
+
+def decode_response(line):
+    """Parse one daemon stdout line; None for anything that is not a JSON object (stray output, a cut line)."""
+    try:
+        msg = json.loads(line)
+    except ValueError:
+        return None
+    return msg if isinstance(msg, dict) else None
+
+def resolve(fut, msg):
+    if "error" in msg:
+        fut.set_exception(ProverError(msg["error"]))
+    elif "proof" in msg and "publicSignals" in msg:
+        fut.set_result((msg["proof"], msg["publicSignals"]))
+    else:
+        fut.set_exception(ProverError(f"Malformed prover response: {sorted(msg)}"))
+
+class ProverClient:
+    """Synchronous client for prover_daemon.js over its stdin/stdout protocol.
+
+    Requests may be pipelined from any number of threads; each call gets a
+    Future that is resolved by a single reader thread as responses stream back.
+    """
+
+    def __init__(self, build_dir, circuit_name, concurrency=1):
+        self.proc = subprocess.Popen(
+            daemon_command(build_dir, circuit_name, concurrency),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+        )
+        ready = json.loads(self.proc.stdout.readline() or b"{}")
+        if not ready.get("ready"):
+            self.proc.kill()
+            raise ProverError("Prover daemon failed to start")
+        self._ids = itertools.count()
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._reader = threading.Thread(target=self._read_loop, daemon=True)
+        self._reader.start()
+
+    def _read_loop(self):
+        for line in self.proc.stdout:
+            msg = decode_response(line)
+            if msg is None:
+                continue
+            with self._lock:
+                fut = self._pending.pop(msg.get("id"), None)
+            if fut is None:
+                continue
+            resolve(fut, msg)
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        for fut in pending.values():
+            fut.set_exception(ProverError("Prover daemon exited"))
+
+    def submit(self, inp=None, wtns=None):
+        """Queue one proof and return a Future of (proof, publicSignals)."""
+        req_id = next(self._ids)
+        fut = Future()
+        with self._lock:
+            self._pending[req_id] = fut
+        with self._write_lock:
+            self.proc.stdin.write(encode_request(req_id, inp, wtns))
+            self.proc.stdin.flush()
+        return fut
+
+    def prove(self, inp=None, wtns=None):
+        return self.submit(inp, wtns).result()
+
+    def prove_many(self, inputs):
+        """Pipeline all inputs and yield (index, proof, publicSignals) in input order."""
+        futures = [self.submit(inp) for inp in inputs]
+        for idx, fut in enumerate(futures):
+            proof, public_signals = fut.result()
+            yield idx, proof, public_signals
+
+    def close(self):
+        if self.proc.poll() is None:
+            self.proc.stdin.close()
+            self.proc.wait()
+        self._reader.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class AsyncProverClient:
+    """asyncio client for prover_daemon.js; use `await AsyncProverClient.start(...)`."""
+
+    def __init__(self, proc):
+        self.proc = proc
+        self._ids = itertools.count()
+        self._pending = {}
+        self._reader = asyncio.ensure_future(self._read_loop())
+
+    @classmethod
+    async def start(cls, build_dir, circuit_name, concurrency=1):
+        proc = await asyncio.create_subprocess_exec(
+            *daemon_command(build_dir, circuit_name, concurrency),
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            limit=1 << 24,
+        )
+        ready = json.loads(await proc.stdout.readline() or b"{}")
+        if not ready.get("ready"):
+            proc.kill()
+            raise ProverError("Prover daemon failed to start")
+        return cls(proc)
+
+    async def _read_loop(self):
+        while True:
+            line = await self.proc.stdout.readline()
+            if not line:
+                break
+            msg = decode_response(line)
+            if msg is None:
+                continue
+            fut = self._pending.pop(msg.get("id"), None)
+            if fut is None or fut.done():
+                continue
+            resolve(fut, msg)
+        pending, self._pending = self._pending, {}
+        for fut in pending.values():
+            if not fut.done():
+                fut.set_exception(ProverError("Prover daemon exited"))
+
+    async def prove(self, inp=None, wtns=None):
+        req_id = next(self._ids)
+        fut = asyncio.get_running_loop().create_future()
+        self._pending[req_id] = fut
+        self.proc.stdin.write(encode_request(req_id, inp, wtns))
+        await self.proc.stdin.drain()
+        return await fut
+
+    async def prove_many(self, inputs):
+        return await asyncio.gather(*(self.prove(inp) for inp in inputs))
+
+    async def close(self):
+        if self.proc.returncode is None:
+            self.proc.stdin.close()
+            await self.proc.wait()
+        await self._reader
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
@@ -0,0 +1,179 @@
+"""Asyncio JSON-RPC client and raw-transaction submission engine.
+
+One event loop drives every request. HTTP goes through a single pooled,
+keep-alive aiohttp session; the WebSocket transport multiplexes requests on
+one connection by id. Either transport can pack several calls into one
+JSON-RPC batch array, so N transactions cost N / batch_size round trips.
+"""
+import asyncio
+import itertools
+import json
+
+import aiohttp
+
+class RpcError(Exception):
+    pass
+
+class HttpTransport:
+    def __init__(self, url, pool_size=64):
+        self.url = url
+        self.pool_size = pool_size
+        self.session = None
+
+    async def open(self):
+        connector = aiohttp.TCPConnector(limit=self.pool_size, keepalive_timeout=60)
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=120),
+            json_serialize=json.dumps,
+        )
+
+    async def send(self, payload):
+        async with self.session.post(self.url, json=payload) as resp:
+            resp.raise_for_status()
+            return await resp.json(content_type=None)
+
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
+
+def response_key(text):
+    """(request id, decoded frame); (None, None) for a frame that is not a JSON-RPC response."""
+    try:
+        data = json.loads(text)
+    except ValueError:
+        return None, None
+    # A batch is answered as an array; route it by its first id
+    first = data[0] if isinstance(data, list) and data else data
+    return (first.get("id"), data) if isinstance(first, dict) else (None, None)
+
+class WsTransport:
+    """JSON-RPC over one WebSocket; responses are routed back by request id."""
+
+    def __init__(self, url):
+        self.url = url
+        self.session = None
+        self.ws = None
+        self._pending = {}
+        self._reader = None
+
+    async def open(self):
+        self.session = aiohttp.ClientSession()
+        self.ws = await self.session.ws_connect(self.url, max_msg_size=0, heartbeat=30)
+        self._reader = asyncio.ensure_future(self._read_loop())
+
+    async def _read_loop(self):
+        try:
+            async for msg in self.ws:
+                if msg.type != aiohttp.WSMsgType.TEXT:
+                    continue
+                key, data = response_key(msg.data)
+                fut = self._pending.pop(key, None)
+                if fut is not None and not fut.done():
+                    fut.set_result(data)
+        finally:
+            for fut in self._pending.values():
+                if not fut.done():
+                    fut.set_exception(RpcError("WebSocket closed"))
+            self._pending.clear()
+
+    async def send(self, payload):
+        key = payload[0]["id"] if isinstance(payload, list) else payload["id"]
+        fut = asyncio.get_running_loop().create_future()
+        self._pending[key] = fut
+        await self.ws.send_str(json.dumps(payload))
+        return await fut
+
+    async def close(self):
+        if self.ws is not None:
+            await self.ws.close()
+        if self._reader is not None:
+            await self._reader
+        if self.session is not None:
+            await self.session.close()
+
+class AsyncRpcClient:
+    """Minimal JSON-RPC client over HttpTransport or WsTransport."""
+
+    def __init__(self, url, pool_size=64):
+        if url.startswith(("ws://", "wss://")):
+            self.transport = WsTransport(url)
+        else:
+            self.transport = HttpTransport(url, pool_size)
+        self._ids = itertools.count(1)
+
+    async def __aenter__(self):
+        await self.transport.open()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.transport.close()
+
+    def _request(self, method, params):
+        return {"jsonrpc": "2.0", "id": next(self._ids), "method": method, "params": params}
+
+    async def call(self, method, params=()):
+        resp = await self.transport.send(self._request(method, list(params)))
+        if "error" in resp:
+            raise RpcError(resp["error"].get("message", resp["error"]))
+        return resp["result"]
+
+    async def batch(self, calls):
+        """Send [(method, params)] as one batch; returns [(result, error)] in call order."""
+        reqs = [self._request(method, list(params)) for method, params in calls]
+        resp = await self.transport.send(reqs)
+        if isinstance(resp, dict):
+            # Whole batch rejected, e.g. geth's batch size limit
+            err = resp.get("error", {}).get("message", "batch rejected")
+            return [(None, err) for _ in reqs]
+        by_id = {r.get("id"): r for r in resp}
+        out = []
+        for req in reqs:
+            r = by_id.get(req["id"], {"error": {"message": "missing response"}})
+            if "error" in r:
+                out.append((None, r["error"].get("message", str(r["error"]))))
+            else:
+                out.append((r["result"], None))
+        return out
+
+async def send_raw_transactions(url, signed_txns, batch_size=1, concurrency=256, pool_size=64, on_result=None):
+    """Submit [(tag, raw_tx)] and return ([(tag, tx_hash)], [(tag, error)]).
+
+    Up to `concurrency` requests (single calls or batches of `batch_size`)
+    are in flight at once. `on_result(sent, failed)` is called as each
+    request completes, with that request's share of both lists.
+    """
+    sent, failed = [], []
+    sem = asyncio.Semaphore(concurrency)
+
+    async with AsyncRpcClient(url, pool_size) as client:
+        async def send_chunk(chunk):
+            calls = [("eth_sendRawTransaction", ["0x" + bytes(raw).hex()]) for _, raw in chunk]
+            async with sem:
+                try:
+                    if batch_size > 1:
+                        results = await client.batch(calls)
+                    else:
+                        results = [(await client.call(*calls[0]), None)]
+                except Exception as e:
+                    results = [(None, str(e))] * len(chunk)
+            chunk_sent, chunk_failed = [], []
+            for (tag, _), (result, err) in zip(chunk, results):
+                if err is None:
+                    chunk_sent.append((tag, bytes.fromhex(result[2:])))
+                else:
+                    chunk_failed.append((tag, err))
+            sent.extend(chunk_sent)
+            failed.extend(chunk_failed)
+            if on_result is not None:
+                on_result(chunk_sent, chunk_failed)
+
+        step = max(1, batch_size)
+        await asyncio.gather(*(
+            send_chunk(signed_txns[k:k + step]) for k in range(0, len(signed_txns), step)
+        ))
+    return sent, failed
+
+def submit_raw_transactions(url, signed_txns, batch_size=1, concurrency=256, pool_size=64, on_result=None):
+    """Blocking wrapper around send_raw_transactions for the stress scripts."""
+    return asyncio.run(send_raw_transactions(url, signed_txns, batch_size, concurrency, pool_size, on_result))
@@ -0,0 +1,228 @@
+"""Multi-account sender pool for the stress tests.
+
+Spreads load over N accounts so a run measures the node, not one account's
+txpool slot limits. Accounts come from a mnemonic (SENDER_MNEMONIC) or a
+keyfile (SENDER_KEYFILE, one hex key per line), are topped up from the
+genesis accounts at startup, and each gets its own NonceManager.
+"""
+import heapq
+import itertools
+
+from eth_account import Account
+from eth_utils import keccak
+
+from confirmation import ConfirmationTracker
+from tx_signing import sign_jobs, split_jobs
+
+def derive_keys(mnemonic, count, offset=0):
+    """Private keys m/44'/60'/0'/0/{offset..offset+count-1} of a BIP-39 mnemonic."""
+    Account.enable_unaudited_hdwallet_features()
+    return [
+        Account.from_mnemonic(mnemonic, account_path=f"m/44'/60'/0'/0/{i}").key.hex()
+        for i in range(offset, offset + count)
+    ]
+
+def read_keyfile(path, count=None):
+    with open(path) as f:
+        keys = [line.strip() for line in f if line.strip() and not line.startswith("#")]
+    return keys[:count] if count else keys
+
+def load_sender_keys(count, mnemonic=None, keyfile=None):
+    if keyfile:
+        keys = read_keyfile(keyfile, count)
+    elif mnemonic:
+        keys = derive_keys(mnemonic, count)
+    else:
+        raise ValueError("Sender pool needs SENDER_MNEMONIC or SENDER_KEYFILE")
+    if len(keys) < count:
+        raise ValueError(f"Only {len(keys)} sender key(s) available, {count} requested")
+    return keys
+
+def fund_accounts(w3, funder_keys, addresses, amount, max_fee, tip, workers=None):
+    """Top up every address below amount/2 to `amount` wei from the funder keys.
+
+    Transfers are signed offline in bulk, one contiguous nonce range per
+    funder, and confirmed by following blocks. Returns the number funded.
+    """
+    needy = [a for a in addresses if w3.eth.get_balance(a) < amount // 2]
+    if not needy:
+        return 0
+    chain_id = w3.eth.chain_id
+    per_funder = {k: [] for k in funder_keys}
+    for addr, key in zip(needy, itertools.cycle(funder_keys)):
+        per_funder[key].append(addr)
+
+    jobs = []
+    for key, targets in per_funder.items():
+        if not targets:
+            continue
+        base = w3.eth.get_transaction_count(Account.from_key(key).address, "pending")
+        for n, addr in enumerate(targets):
+            jobs += split_jobs(key, chain_id, addr, b"", [], [(addr, [], 21000, base + n)], max_fee, tip, amount, 1)
+    signed = sign_jobs(jobs, workers)
+
+    start_block = w3.eth.block_number + 1
+    tracker = ConfirmationTracker(w3)
+    for addr, raw in signed:
+        tracker.track(addr, w3.eth.send_raw_transaction(raw))
+    result = tracker.wait(start_block)
+    if result.pending or result.dropped:
+        raise RuntimeError(f"Funding failed for {len(result.pending) + len(result.dropped)} sender(s)")
+    return len(needy)
+
+def build_sender_pool(w3, count, funder_keys, policy="round_robin", mnemonic=None, keyfile=None,
+                      funding=0, max_fee=0, tip=0, workers=None):
+    """Load `count` sender keys, fund them from funder_keys and return a SenderPool."""
+    keys = load_sender_keys(count, mnemonic, keyfile)
+    if funding:
+        funded = fund_accounts(w3, funder_keys, [Account.from_key(k).address for k in keys],
+                               funding, max_fee, tip, workers)
+        print(f"Funded {funded} of {count} Sender(s)")
+    return SenderPool(w3, keys, policy)
+
+class NonceManager:
+    """Hands out nonces for one account and repairs gaps left by failed sends."""
+
+    def __init__(self, w3, address):
+        self.w3 = w3
+        self.address = address
+        self.sync()
+
+    def sync(self):
+        """Re-read the pending and mined nonce from the node and drop local state."""
+        self.next_nonce = self.w3.eth.get_transaction_count(self.address, "pending")
+        self.pending = self.next_nonce - self.w3.eth.get_transaction_count(self.address, "latest")
+        self.released = []
+
+    def reserve(self):
+        """Next nonce to use: the lowest released one first, so gaps get filled."""
+        self.pending += 1
+        if self.released:
+            return heapq.heappop(self.released)
+        nonce = self.next_nonce
+        self.next_nonce += 1
+        return nonce
+
+    def release(self, nonce):
+        """A send with `nonce` failed; reuse it before handing out new ones."""
+        self.pending -= 1
+        heapq.heappush(self.released, nonce)
+
+    def confirmed(self):
+        self.pending = max(0, self.pending - 1)
+
+    def handle_error(self, nonce, message):
+        """Classify a send error; returns "ok", "retry" or "bump".
+
+        ok    - the transaction (or one with this nonce) is already in the pool or mined
+        retry - send again with a freshly reserved nonce
+        bump  - same nonce is taken by another pending transaction; re-sign with a higher fee
+        """
+        msg = message.lower()
+        if "already known" in msg:
+            return "ok"
+        if "nonce too low" in msg:
+            # Someone else used this account; skip ahead to what the node has
+            self.pending -= 1
+            self.next_nonce = max(self.next_nonce, self.w3.eth.get_transaction_count(self.address, "pending"))
+            return "retry"
+        if "replacement transaction underpriced" in msg:
+            return "bump"
+        self.release(nonce)
+        return "retry"
+
+class SenderPool:
+    """N funded accounts with per-account nonces and a transaction assignment policy."""
+
+    POLICIES = ("round_robin", "least_pending")
+
+    def __init__(self, w3, keys, policy="round_robin"):
+        if policy not in self.POLICIES:
+            raise ValueError(f"Unknown sender policy {policy}")
+        self.w3 = w3
+        self.chain_id = w3.eth.chain_id
+        self.keys = list(keys)
+        self.addresses = [Account.from_key(k).address for k in self.keys]
+        self.nonces = [NonceManager(w3, a) for a in self.addresses]
+        self.policy = policy
+        self._rr = itertools.cycle(range(len(self.keys)))
+        self.assigned = {}  # tag -> (sender index, nonce, args, gas)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def pick(self):
+        if self.policy == "round_robin":
+            return next(self._rr)
+        return min(range(len(self.keys)), key=lambda k: self.nonces[k].pending)
+
+    def sign_calls(self, to, selector, types, items, max_fee, tip, value=0, workers=None):
+        """Assign [(tag, args, gas)] to senders, reserve nonces and sign across a process pool.
+
+        Returns [(tag, raw_tx)] in assignment order.
+        """
+        jobs = self.assign_jobs(to, selector, types, items, max_fee, tip, value, workers)
+        by_tag = dict(sign_jobs(jobs, workers))
+        return [(tag, by_tag[tag]) for tag, _, _ in items]
+
+    def assign_jobs(self, to, selector, types, items, max_fee, tip, value=0, workers=None, chunk_size=None):
+        """Assign [(tag, args, gas)] to senders, reserve their nonces and return signing jobs."""
+        per_sender = [[] for _ in self.keys]
+        for tag, args, gas in items:
+            k = self.pick()
+            nonce = self.nonces[k].reserve()
+            self.assigned[tag] = (k, nonce, args, gas)
+            per_sender[k].append((tag, args, gas, nonce))
+        jobs = []
+        for k, sender_items in enumerate(per_sender):
+            if sender_items:
+                jobs += split_jobs(self.keys[k], self.chain_id, to, selector, types,
+                                   sender_items, max_fee, tip, value, workers, chunk_size)
+        return jobs
+
+    def resign_failed(self, failed, to, selector, types, max_fee, tip, value=0, workers=None, raw_of=None):
+        """Turn [(tag, error)] from a submit round into ([(tag, raw_tx)] to retry, [(tag, tx_hash)] already known).
+
+        Every retry is re-signed on its own sender with a nonce reserved from
+        that sender, so the nonce released by the failure fills the gap.
+        Replacement conflicts are re-signed on the same nonce with a 12.5%
+        higher fee, the minimum geth accepts. Transactions the node already
+        holds are returned by hash, from `raw_of` (tag -> raw_tx as sent).
+        """
+        retry = [[] for _ in self.keys]
+        bumped, known = [], []
+        for tag, err in failed:
+            k, nonce, args, gas = self.assigned[tag]
+            action = self.nonces[k].handle_error(nonce, str(err))
+            if action == "retry":
+                retry[k].append((tag, args, gas))
+            elif action == "bump":
+                bumped.append((k, (tag, args, gas, nonce)))
+            elif raw_of is not None and tag in raw_of:
+                known.append((tag, keccak(raw_of[tag])))
+        jobs = []
+        for k, items in enumerate(retry):
+            sender_items = []
+            for tag, args, gas in items:
+                nonce = self.nonces[k].reserve()
+                self.assigned[tag] = (k, nonce, args, gas)
+                sender_items.append((tag, args, gas, nonce))
+            if sender_items:
+                jobs += split_jobs(self.keys[k], self.chain_id, to, selector, types,
+                                   sender_items, max_fee, tip, value, workers)
+        if bumped:
+            bump_fee, bump_tip = max_fee * 9 // 8 + 1, tip * 9 // 8 + 1
+            for k, item in bumped:
+                jobs += split_jobs(self.keys[k], self.chain_id, to, selector, types,
+                                   [item], bump_fee, bump_tip, value, 1)
+        return (sign_jobs(jobs, workers) if jobs else []), known
+
+    def unsent(self, tags):
+        """Give back the nonces of transactions that were signed but never sent."""
+        for tag in tags:
+            k, nonce, _, _ = self.assigned.pop(tag)
+            self.nonces[k].release(nonce)
+
+    def confirmed(self, tag):
+        k = self.assigned[tag][0]
+        self.nonces[k].confirmed()
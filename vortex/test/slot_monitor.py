@@ -0,0 +1,259 @@
+"""Consensus-side slot monitor for the testnet.sh beacon nodes.
+
+healthcheck.sh only checks that /eth/v2/beacon/blocks/head has a block
+number. During a run a thread polls /eth/v1/beacon/headers/head on every
+node's beacon gateway (PRYSM_BEACON_GRPC_GATEWAY_PORT + i) each `interval`
+seconds and records, per node, when each new head block was first seen and
+how many slots the node's head trails the best head among the nodes. After
+the run every slot in the window is resolved against the canonical chain:
+
+    seen delay   first / last node to report the block - slot start
+    missed       no canonical block in the slot (the expected proposer is
+                 taken from the proposer duties)
+    orphaned     heads seen during the run that did not stay canonical
+    payload      execution block number, gas used / limit and tx count
+
+Seen times are resolved to the poll interval. Results are written to
+slot_monitor.csv (per slot), slot_monitor_nodes.csv (per slot per node) and
+slot_monitor_summary.json in the run directory, so runs under on-chain and
+Vortex verification load can be compared slot by slot.
+
+Usage: python slot_monitor.py [--duration SECS] [--interval SECS] [--out-dir DIR]
+"""
+import argparse
+import asyncio
+import csv
+import json
+import os
+import threading
+import time
+
+import aiohttp
+
+from node_endpoints import beacon_urls
+from percentiles import percentile
+
+SLOT_FIELDS = ["slot", "slotStart", "proposer", "expectedProposer", "root", "unresolved", "missed", "orphaned",
+               "seenFirstSec", "seenLastSec", "blockNumber", "gasUsed", "gasLimit", "txCount", "headLagMax"]
+NODE_FIELDS = ["slot", "node", "seenSec", "headSlot", "headLag"]
+
+class SlotMonitor:
+    def __init__(self, urls, run_dir, interval=0.25):
+        self.urls = list(urls)
+        self.run_dir = run_dir
+        self.interval = interval
+        self.genesis = None
+        self.seconds_per_slot = None
+        self.slots_per_epoch = None
+        self.first_slot = None
+        self.seen = {}          # root -> (slot, {node: first seen})
+        self.heads = {}         # (wall slot, node) -> (head slot, max lag behind the best node)
+        self._down = set()
+        self._stop = threading.Event()
+        self._ready = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=lambda: asyncio.run(self._loop()), daemon=True)
+        self._thread.start()
+        self._ready.wait(30)
+        return self
+
+    async def _get(self, session, url, path):
+        async with session.get(url + path) as resp:
+            if resp.status == 404:
+                return None
+            resp.raise_for_status()
+            return (await resp.json())["data"]
+
+    async def _loop(self):
+        async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=5)) as session:
+            try:
+                self.genesis = int((await self._get(session, self.urls[0], "/eth/v1/beacon/genesis"))["genesis_time"])
+                spec = await self._get(session, self.urls[0], "/eth/v1/config/spec")
+                self.seconds_per_slot = int(spec["SECONDS_PER_SLOT"])
+                self.slots_per_epoch = int(spec["SLOTS_PER_EPOCH"])
+            except Exception as e:
+                print(f"Beacon API unavailable ({e}) :: slots not monitored")
+                return
+            finally:
+                self._ready.set()
+            self.first_slot = self.wall_slot(time.time())
+            print(f"Slot Monitor :: {len(self.urls)} beacon node(s) from slot {self.first_slot}")
+            while not self._stop.is_set():
+                started = time.time()
+                heads = await asyncio.gather(*(self._sample(session, k, url) for k, url in enumerate(self.urls)))
+                self._note_heads([h for h in heads if h is not None])
+                await asyncio.sleep(max(0.0, self.interval - (time.time() - started)))
+
+    def wall_slot(self, t):
+        return int(t - self.genesis) // self.seconds_per_slot
+
+    async def _sample(self, session, node, url):
+        try:
+            head = await self._get(session, url, "/eth/v1/beacon/headers/head")
+        except Exception as e:
+            if node not in self._down:
+                print(f"Slot Monitor Error :: node {node}: {e}")
+                self._down.add(node)
+            return
+        self._down.discard(node)
+        t = time.time()
+        slot = int(head["header"]["message"]["slot"])
+        _, seen = self.seen.setdefault(head["root"], (slot, {}))
+        seen.setdefault(node, t)
+        return node, slot, t
+
+    def _note_heads(self, heads):
+        # Lag is relative to the best head of the same round, so a missed slot is not lag
+        best = max((slot for _, slot, _ in heads), default=None)
+        for node, slot, t in heads:
+            wall = self.wall_slot(t)
+            _, worst = self.heads.get((wall, node), (slot, 0))
+            self.heads[(wall, node)] = (slot, max(worst, best - slot))
+
+    def stop(self):
+        """Stop polling, resolve the window against the canonical chain, write the reports and return the summary."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        if self.first_slot is None:
+            return {}
+        last_slot = self.wall_slot(time.time())
+        rows, node_rows = asyncio.run(self._resolve(self.first_slot, last_slot))
+        summary = self.summary(rows, node_rows)
+        os.makedirs(self.run_dir, exist_ok=True)
+        for name, fields, data in (("slot_monitor.csv", SLOT_FIELDS, rows), ("slot_monitor_nodes.csv", NODE_FIELDS, node_rows)):
+            with open(os.path.join(self.run_dir, name), "w", newline="") as f:
+                writer = csv.DictWriter(f, fieldnames=fields)
+                writer.writeheader()
+                writer.writerows(data)
+        with open(os.path.join(self.run_dir, "slot_monitor_summary.json"), "w") as f:
+            json.dump(summary, f, indent=2)
+        print_report(summary)
+        return summary
+
+    async def _resolve(self, first, last):
+        """Per-slot and per-slot-per-node rows for slots first..last (the last one may still be in progress).
+
+        A slot whose beacon lookups fail is kept as an unresolved row rather than ending the run.
+        """
+        by_slot = {}
+        for root, (slot, seen) in self.seen.items():
+            by_slot.setdefault(slot, []).append((root, seen))
+        rows, node_rows = [], []
+        async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=30)) as session:
+            get = lambda path: self._get(session, self.urls[0], path)
+            duties = {}
+            for epoch in range(first // self.slots_per_epoch, last // self.slots_per_epoch + 1):
+                try:
+                    for d in await get(f"/eth/v1/validator/duties/proposer/{epoch}") or []:
+                        duties[int(d["slot"])] = int(d["validator_index"])
+                except Exception:
+                    pass
+            for slot in range(first, last + 1):
+                start = self.genesis + slot * self.seconds_per_slot
+                row = {"slot": slot, "slotStart": start, "expectedProposer": duties.get(slot)}
+                try:
+                    row.update(await self._slot_block(get, slot))
+                except Exception as e:
+                    print(f"Slot Monitor Error :: slot {slot} unresolved: {e}")
+                    row.update({"root": None, "unresolved": True, "missed": None, "orphaned": None})
+                root = row["root"]
+                if not row["unresolved"]:
+                    row["orphaned"] = sum(r != root for r, _ in by_slot.get(slot, []))
+                seen = dict(by_slot.get(slot, [])).get(root, {})
+                row["seenFirstSec"] = round(min(seen.values()) - start, 3) if seen else None
+                row["seenLastSec"] = round(max(seen.values()) - start, 3) if len(seen) == len(self.urls) else None
+                lags = []
+                for node in range(len(self.urls)):
+                    head_slot, lag = self.heads.get((slot, node), (None, None))
+                    node_rows.append({"slot": slot, "node": node, "seenSec": round(seen[node] - start, 3) if node in seen else None,
+                                      "headSlot": head_slot, "headLag": lag})
+                    if lag is not None:
+                        lags.append(lag)
+                row["headLagMax"] = max(lags, default=None)
+                rows.append(row)
+        return rows, node_rows
+
+    async def _slot_block(self, get, slot):
+        """Canonical block fields of `slot` from the beacon API."""
+        header = await get(f"/eth/v1/beacon/headers/{slot}")
+        # The endpoint returns the last block at or before an empty slot on some clients
+        if header is not None and int(header["header"]["message"]["slot"]) != slot:
+            header = None
+        out = {"root": header["root"] if header is not None else None, "unresolved": False, "missed": header is None,
+               "proposer": int(header["header"]["message"]["proposer_index"]) if header else None}
+        if header is not None:
+            block = await get(f"/eth/v2/beacon/blocks/{header['root']}")
+            payload = (block or {}).get("message", {}).get("body", {}).get("execution_payload")
+            if payload:
+                out.update({"blockNumber": int(payload["block_number"]), "gasUsed": int(payload["gas_used"]),
+                            "gasLimit": int(payload["gas_limit"]), "txCount": len(payload["transactions"])})
+        return out
+
+    def summary(self, rows, node_rows):
+        # The slot in progress when monitoring stopped is not judged
+        done = rows[:-1]
+        first = [r["seenFirstSec"] for r in done if r["seenFirstSec"] is not None]
+        last = [r["seenLastSec"] for r in done if r["seenLastSec"] is not None]
+        nodes = {}
+        for r in node_rows:
+            if r["headLag"] is not None:
+                nodes.setdefault(r["node"], []).append(r["headLag"])
+        return {
+            "slots": len(done),
+            "unresolvedSlots": sum(r["unresolved"] for r in done),
+            "missedSlots": sum(r["missed"] is True for r in done),
+            "missedByProposer": _count(r["expectedProposer"] for r in done if r["missed"]),
+            "orphanedBlocks": sum(r["orphaned"] or 0 for r in done),
+            "blockSeenSecP50": percentile(first, 0.5),
+            "blockSeenSecP90": percentile(first, 0.9),
+            "blockSeenAllSecP90": percentile(last, 0.9),
+            "blockSeenSecMax": max(first, default=None),
+            "headLagSlotsMax": max((max(v) for v in nodes.values()), default=None),
+            "headLagSlotsMean": {str(k): sum(v) / len(v) for k, v in sorted(nodes.items())},
+            "payloadGasUsed": sum(r.get("gasUsed") or 0 for r in done),
+            "payloadTxns": sum(r.get("txCount") or 0 for r in done),
+        }
+
+def _count(values):
+    out = {}
+    for v in values:
+        out[str(v)] = out.get(str(v), 0) + 1
+    return out
+
+def print_report(s):
+    fmt = lambda v: "n/a" if v is None else f"{v:.2f}"
+    print("======== SLOT MONITOR ========")
+    print(f"Slots: {s['slots']}, Missed: {s['missedSlots']}, Orphaned Blocks: {s['orphanedBlocks']}"
+          + (f", Unresolved: {s['unresolvedSlots']}" if s["unresolvedSlots"] else ""))
+    if s["missedByProposer"]:
+        print("Missed by Proposer :: " + ", ".join(f"{k} x{v}" for k, v in s["missedByProposer"].items()))
+    print(f"Block Seen After Slot Start (sec): p50 {fmt(s['blockSeenSecP50'])}, p90 {fmt(s['blockSeenSecP90'])}, "
+          f"max {fmt(s['blockSeenSecMax'])}, on every node p90 {fmt(s['blockSeenAllSecP90'])}")
+    print(f"Head Lag (slots): max {s['headLagSlotsMax']}, mean per node "
+          + ", ".join(f"{k}: {v:.2f}" for k, v in s["headLagSlotsMean"].items()))
+    print(f"Payloads: {s['payloadTxns']} Txns, {s['payloadGasUsed']} Gas")
+    print("======== END ========")
+
+def main():
+    parser = argparse.ArgumentParser(description="Monitor slots, block arrival and head lag on the beacon nodes")
+    parser.add_argument("--duration", type=float, default=60, help="seconds to monitor")
+    parser.add_argument("--interval", type=float, default=0.25, help="head poll interval")
+    parser.add_argument("--nodes", type=int, default=0, help="beacon nodes (default NUM_NODES, or BEACON_URLS)")
+    parser.add_argument("--out-dir", default=None, help="default READINGS_DIR")
+    args = parser.parse_args()
+
+    monitor = SlotMonitor(beacon_urls(args.nodes or None), args.out_dir or os.getenv("READINGS_DIR") or ".",
+                          args.interval).start()
+    try:
+        time.sleep(args.duration)
+    except KeyboardInterrupt:
+        pass
+    monitor.stop()
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+    load_dotenv("../.env")
+    main()
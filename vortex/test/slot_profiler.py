@@ -0,0 +1,194 @@
+"""Per-slot rolling CPU profiles of the profiling node.
+
+Instead of one cpu.prof for the whole run, the geth CPU profile is rotated
+every N slots over a single persistent IPC connection (no `geth attach` per
+command). Rotations happen mid-slot on the grid of block timestamps, so each
+block's execution lands in exactly one segment, and every segment is tagged
+with the blocks that appeared while it was recording. The segments are then
+turned into a per-block execution CPU series next to gasUsed and txCount.
+"""
+import csv
+import os
+import threading
+import time
+from dataclasses import dataclass
+
+from web3 import Web3
+
+from pprof_profile import PATTERNS, Profile
+
+SEGMENT_FIELDS = ["segment", "start", "end", "firstBlock", "lastBlock", "sampledSec", "execCpuSec", "path"]
+
+class DebugIpc:
+    """Persistent IPC connection to geth for the debug and eth calls the profiler needs."""
+
+    def __init__(self, ipc_path):
+        self.w3 = Web3(Web3.IPCProvider(ipc_path))
+
+    def call(self, method, params=()):
+        resp = self.w3.provider.make_request(method, list(params))
+        if resp.get("error"):
+            raise RuntimeError(f"{method}: {resp['error'].get('message', resp['error'])}")
+        return resp.get("result")
+
+    def start_cpu_profile(self, path):
+        self.call("debug_startCPUProfile", [path])
+
+    def stop_cpu_profile(self):
+        self.call("debug_stopCPUProfile")
+
+    def head(self):
+        """(number, timestamp) of the latest block."""
+        block = self.call("eth_getBlockByNumber", ["latest", False])
+        return int(block["number"], 16), int(block["timestamp"], 16)
+
+@dataclass
+class Segment:
+    index: int
+    path: str
+    start: float
+    end: float
+    first_block: int    # first block that appeared while recording
+    last_block: int     # last one; first_block > last_block means no block
+
+    @property
+    def blocks(self):
+        return range(self.first_block, self.last_block + 1)
+
+class RunProfiler:
+    """One CPU profile for the whole run, over the same persistent IPC connection."""
+
+    def __init__(self, ipc_path, path):
+        self.ipc = DebugIpc(ipc_path)
+        self.path = os.path.abspath(path)
+        self.start_time = 0.0
+        self.first_block = 0
+
+    def start(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        try:
+            self.ipc.stop_cpu_profile()
+        except RuntimeError:
+            pass
+        self.first_block = self.ipc.head()[0] + 1
+        self.ipc.start_cpu_profile(self.path)
+        self.start_time = time.time()
+
+    def stop(self):
+        """Stop profiling; returns the run as a single Segment."""
+        self.ipc.stop_cpu_profile()
+        last, _ = self.ipc.head()
+        return [Segment(0, self.path, self.start_time, time.time(), self.first_block, last)]
+
+class SlotProfiler:
+    """Rotate the node's CPU profile every `slots` slots in a background thread."""
+
+    def __init__(self, ipc_path, out_dir, slot_duration, slots=1, offset=0.5):
+        self.ipc = DebugIpc(ipc_path)
+        self.out_dir = out_dir
+        self.period = slot_duration * slots
+        self.slot_duration = slot_duration
+        self.offset = offset
+        self.segments = []
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _next_rotation(self):
+        _, ts = self.ipc.head()
+        at = ts + self.offset * self.slot_duration
+        now = time.time()
+        while at <= now:
+            at += self.period
+        return at
+
+    def _record(self, index):
+        path = os.path.abspath(os.path.join(self.out_dir, f"cpu_slot_{index:05d}.prof"))
+        first, _ = self.ipc.head()
+        self.ipc.start_cpu_profile(path)
+        start = time.time()
+        self._stop.wait(max(0.0, self._next_rotation() - start))
+        self.ipc.stop_cpu_profile()
+        last, _ = self.ipc.head()
+        self.segments.append(Segment(index, path, start, time.time(), first + 1, last))
+
+    def _run(self):
+        index = 0
+        while not self._stop.is_set():
+            self._record(index)
+            index += 1
+
+    def start(self):
+        os.makedirs(self.out_dir, exist_ok=True)
+        try:
+            self.ipc.stop_cpu_profile()     # a profile left running by an earlier run
+        except RuntimeError:
+            pass
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Close the current segment and return every segment recorded."""
+        self._stop.set()
+        self._thread.join()
+        return self.segments
+
+def merge_profiles(segments):
+    """One Profile with the stacks of every segment, for whole-run totals and folded output."""
+    merged = None
+    for seg in segments:
+        prof = Profile.load(seg.path)
+        if merged is None:
+            merged = prof
+        else:
+            merged.add(prof)
+    return merged
+
+def block_series(segments, block_rows, slot_duration, patterns=None):
+    """Per-block execution CPU from rolling segments.
+
+    A segment's StateProcessor.Process time is split over the blocks it
+    covers in proportion to their gasUsed (evenly if none used gas);
+    execCpuShare is that time as a fraction of one slot.
+    Returns (segment rows, block rows).
+    """
+    patterns = patterns or PATTERNS
+    by_number = {b["blockNumber"]: b for b in block_rows}
+    seg_rows, rows = [], []
+    for seg in segments:
+        prof = Profile.load(seg.path)
+        times = {name: cum for name, (_, cum) in prof.breakdown(patterns).items()}
+        exec_cpu = times.get("StateProcessor.Process", 0.0)
+        seg_rows.append({
+            "segment": seg.index, "start": round(seg.start, 3), "end": round(seg.end, 3),
+            "firstBlock": seg.first_block, "lastBlock": seg.last_block,
+            "sampledSec": prof.total / 1e9, "execCpuSec": exec_cpu, "path": seg.path,
+        })
+        blocks = [by_number[n] for n in seg.blocks if n in by_number]
+        gas = sum(b["gasUsed"] for b in blocks)
+        for b in blocks:
+            share = b["gasUsed"] / gas if gas else 1 / len(blocks)
+            row = {
+                "blockNumber": b["blockNumber"], "segment": seg.index,
+                "gasUsed": b["gasUsed"], "txCount": b["txCount"],
+                "execCpuSec": exec_cpu * share,
+                "execCpuShare": exec_cpu * share / slot_duration,
+            }
+            for name, cum in times.items():
+                if name != "StateProcessor.Process":
+                    row[f"{name}Sec"] = cum * share
+            rows.append(row)
+    return seg_rows, rows
+
+def write_block_series(readings_dir, segments, block_rows, slot_duration, patterns=None):
+    """Write cpu_segments.csv and cpu_per_block.csv; returns the per-block rows."""
+    seg_rows, rows = block_series(segments, block_rows, slot_duration, patterns)
+    with open(os.path.join(readings_dir, "cpu_segments.csv"), "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=SEGMENT_FIELDS)
+        writer.writeheader()
+        writer.writerows(seg_rows)
+    if rows:
+        with open(os.path.join(readings_dir, "cpu_per_block.csv"), "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
+            writer.writeheader()
+            writer.writerows(rows)
+    return rows
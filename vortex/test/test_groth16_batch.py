@@ -0,0 +1,71 @@
+"""groth16_batch must accept valid batches and bisect to exactly the bad proof.
+
+The verification key is built from known trapdoor scalars, so valid proofs
+can be simulated without a circuit: A = r*G1, B = s*G2 and
+C = (r*s - alpha*beta - x*gamma) / delta * G1, where x*G1 is vk_x.
+
+Run from vortex/test: python -m pytest -q test_groth16_batch.py
+"""
+import random
+
+import pytest
+from py_ecc.optimized_bn128 import G1, G2, curve_order, field_modulus, multiply, normalize
+
+from groth16_batch import VerifyingKey
+
+N_PUBLIC = 2
+N_PROOFS = 4
+
+def g1_json(p):
+    x, y = normalize(p)
+    return [str(x.n), str(y.n), "1"]
+
+def g2_json(p):
+    x, y = normalize(p)
+    return [[str(c) for c in x.coeffs], [str(c) for c in y.coeffs], ["1", "0"]]
+
+@pytest.fixture(scope="module")
+def setup():
+    rng = random.Random(7)
+    scalar = lambda: rng.randrange(1, curve_order)
+    alpha, beta, gamma, delta = scalar(), scalar(), scalar(), scalar()
+    ic = [scalar() for _ in range(N_PUBLIC + 1)]
+    key = VerifyingKey({
+        "vk_alpha_1": g1_json(multiply(G1, alpha)),
+        "vk_beta_2": g2_json(multiply(G2, beta)),
+        "vk_gamma_2": g2_json(multiply(G2, gamma)),
+        "vk_delta_2": g2_json(multiply(G2, delta)),
+        "IC": [g1_json(multiply(G1, u)) for u in ic],
+    })
+
+    def prove(public):
+        r, s = scalar(), scalar()
+        x = (ic[0] + sum(int(v) * u for v, u in zip(public, ic[1:]))) % curve_order
+        c = (r * s - alpha * beta - x * gamma) * pow(delta, -1, curve_order) % curve_order
+        return g1_json(multiply(G1, r)), g2_json(multiply(G2, s)), g1_json(multiply(G1, c)), public
+
+    proofs = [prove([str(rng.randrange(curve_order)) for _ in range(N_PUBLIC)]) for _ in range(N_PROOFS)]
+    return key, proofs
+
+def test_valid_batch(setup):
+    key, proofs = setup
+    assert key.check([key.prepare(*p) for p in proofs])
+    assert key.verify_batch(proofs) == [True] * N_PROOFS
+
+def flip_pi_c(proof):
+    pi_a, pi_b, (x, y, z), public = proof
+    # -C is still on the curve, so only the pairing check can reject it
+    return pi_a, pi_b, [x, str(field_modulus - int(y)), z], public
+
+def bump_public(proof):
+    pi_a, pi_b, pi_c, public = proof
+    return pi_a, pi_b, pi_c, [str((int(public[0]) + 1) % curve_order)] + public[1:]
+
+@pytest.mark.parametrize("tamper", [flip_pi_c, bump_public])
+@pytest.mark.parametrize("bad", [0, N_PROOFS - 1])
+def test_bad_proof_is_isolated(setup, tamper, bad):
+    key, proofs = setup
+    proofs = list(proofs)
+    proofs[bad] = tamper(proofs[bad])
+    assert not key.check([key.prepare(*p) for p in proofs])
+    assert key.verify_batch(proofs) == [k != bad for k in range(N_PROOFS)]
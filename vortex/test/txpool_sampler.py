@@ -0,0 +1,237 @@
+"""Background txpool telemetry for a stress run.
+
+A thread polls the node every `interval` seconds with one JSON-RPC batch:
+txpool_status, the head block, the mined nonce of every watched sender and
+(every `inspect_every` samples) txpool_inspect. Each sample becomes a row of
+txpool_series.csv next to block_details.csv, aligned with the runner's
+submit progress.
+
+Submitted transactions are watched by (sender, nonce). A watched
+transaction is mined once its sender's chain nonce passes it, in the pool
+while txpool_inspect lists it, and missing otherwise; one that was seen in
+the pool and then goes missing for two inspections in a row counts as an
+eviction. txpool_summary.json condenses the run into peak/mean pool depth,
+evictions, submit and drain time and a bottleneck verdict (gasLimit,
+evictions or submission).
+
+The geth nodes need `txpool` in --http.api (see testnet.sh); without it the
+sampler logs once and keeps recording the head block only.
+"""
+import asyncio
+import csv
+import json
+import os
+import threading
+import time
+
+from rpc_async import AsyncRpcClient
+
+SERIES_FIELDS = [
+    "t", "block", "blockGasUsed", "blockGasLimit", "blockTxCount", "pending", "queued",
+    "submitted", "watchedInPool", "watchedMined", "watchedMissing", "senders", "maxSenderPending",
+]
+FULL_BLOCK = 0.95      # gasUsed / gasLimit at which a block counts as full
+MISSING_SAMPLES = 2    # consecutive inspections a watched tx must be absent to count as evicted
+
+class Watched:
+    __slots__ = ("tx_hash", "sender", "nonce", "state", "seen", "absent")
+
+    def __init__(self, tx_hash, sender, nonce):
+        self.tx_hash = tx_hash
+        self.sender = sender
+        self.nonce = nonce
+        self.state = "submitted"    # submitted, pool, mined, missing
+        self.seen = False
+        self.absent = 0
+
+class TxpoolSampler:
+    def __init__(self, url, run_dir, interval=1.0, inspect_every=1):
+        self.url = url
+        self.run_dir = run_dir
+        self.interval = interval
+        self.inspect_every = inspect_every
+        self.rows = []
+        self.watched = {}           # (sender, nonce) -> Watched
+        self.submitted = 0
+        self.first_submit = None
+        self.last_submit = None
+        self.evictions = 0
+        self.drained_at = None
+        self._txpool_api = True
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._t0 = None
+
+    def start(self):
+        self._t0 = time.time()
+        self._thread = threading.Thread(target=lambda: asyncio.run(self._loop()), daemon=True)
+        self._thread.start()
+        return self
+
+    def note_submitted(self, entries):
+        """Record accepted submissions as [(tx_hash, sender, nonce)]."""
+        now = time.time()
+        with self._lock:
+            for tx_hash, sender, nonce in entries:
+                self.watched[(sender.lower(), nonce)] = Watched(tx_hash, sender.lower(), nonce)
+            self.submitted += len(entries)
+            self.first_submit = self.first_submit or now
+            self.last_submit = now
+            # The pool emptying between submissions is not the drain
+            self.drained_at = None
+
+    async def _loop(self):
+        async with AsyncRpcClient(self.url, pool_size=2) as client:
+            k = 0
+            while not self._stop.is_set():
+                started = time.time()
+                try:
+                    await self._sample(client, k % self.inspect_every == 0)
+                except Exception as e:
+                    print(f"Txpool Sample Error :: {e}")
+                k += 1
+                await asyncio.sleep(max(0.0, self.interval - (time.time() - started)))
+            # One last look so the end of the run is in the series
+            try:
+                await self._sample(client, True)
+            except Exception:
+                pass
+
+    async def _sample(self, client, inspect):
+        with self._lock:
+            senders = sorted({w.sender for w in self.watched.values() if w.state != "mined"})
+        calls = [("eth_getBlockByNumber", ["latest", False])]
+        calls += [("eth_getTransactionCount", [s, "latest"]) for s in senders]
+        if self._txpool_api:
+            calls.append(("txpool_status", []))
+            if inspect:
+                calls.append(("txpool_inspect", []))
+        results = await client.batch(calls)
+        t = time.time()
+        block = results[0][0] or {}
+        chain_nonce = {s: int(r, 16) for s, (r, _) in zip(senders, results[1:1 + len(senders)]) if r}
+        status, pool = None, None
+        if self._txpool_api:
+            status, err = results[1 + len(senders)]
+            if err is not None:
+                print(f"txpool API unavailable ({err}) :: add txpool to --http.api to sample the pool")
+                self._txpool_api = False
+                status = None
+            elif inspect:
+                pool = results[2 + len(senders)][0]
+
+        per_sender = {}
+        if pool is not None:
+            for kind in ("pending", "queued"):
+                for sender, nonces in (pool.get(kind) or {}).items():
+                    counts = per_sender.setdefault(sender.lower(), [0, 0, set()])
+                    counts[0 if kind == "pending" else 1] += len(nonces)
+                    counts[2].update(int(n) for n in nonces)
+
+        in_pool = mined = missing = 0
+        with self._lock:
+            for w in self.watched.values():
+                if w.state != "mined" and w.nonce < chain_nonce.get(w.sender, -1):
+                    w.state = "mined"
+                elif w.state != "mined" and pool is not None:
+                    if w.nonce in per_sender.get(w.sender, (0, 0, ()))[2]:
+                        w.state, w.seen, w.absent = "pool", True, 0
+                    else:
+                        w.absent += 1
+                        if w.absent == MISSING_SAMPLES and w.seen:
+                            self.evictions += 1
+                        if w.absent >= MISSING_SAMPLES:
+                            w.state = "missing"
+                in_pool += w.state == "pool"
+                mined += w.state == "mined"
+                missing += w.state == "missing"
+            submitted = self.submitted
+            if self.last_submit and self.drained_at is None and pool is not None and in_pool == 0 \
+                    and self.submitted and mined + missing == len(self.watched):
+                self.drained_at = t
+
+        self.rows.append({
+            "t": round(t - self._t0, 3),
+            "block": int(block["number"], 16) if block.get("number") else None,
+            "blockGasUsed": int(block["gasUsed"], 16) if block.get("gasUsed") else None,
+            "blockGasLimit": int(block["gasLimit"], 16) if block.get("gasLimit") else None,
+            "blockTxCount": len(block.get("transactions") or []),
+            "pending": int(status["pending"], 16) if status else None,
+            "queued": int(status["queued"], 16) if status else None,
+            "submitted": submitted,
+            "watchedInPool": in_pool,
+            "watchedMined": mined,
+            "watchedMissing": missing,
+            "senders": len(per_sender) if pool is not None else None,
+            "maxSenderPending": max((c[0] for c in per_sender.values()), default=0) if pool is not None else None,
+        })
+
+    def stop(self):
+        """Stop sampling, write txpool_series.csv / txpool_summary.json and return the summary."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        summary = self.summary()
+        os.makedirs(self.run_dir, exist_ok=True)
+        with open(os.path.join(self.run_dir, "txpool_series.csv"), "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=SERIES_FIELDS)
+            writer.writeheader()
+            writer.writerows(self.rows)
+        with open(os.path.join(self.run_dir, "txpool_summary.json"), "w") as f:
+            json.dump(summary, f, indent=2)
+        print_summary(summary)
+        return summary
+
+    def summary(self):
+        pending = [r["pending"] for r in self.rows if r["pending"] is not None]
+        queued = [r["queued"] for r in self.rows if r["queued"] is not None]
+        # Block fullness only counts while our transactions were waiting in the pool
+        blocks = {}
+        for r in self.rows:
+            if r["block"] is not None and r["blockGasLimit"] and r["watchedInPool"]:
+                blocks[r["block"]] = r["blockGasUsed"] / r["blockGasLimit"]
+        full_share = sum(u >= FULL_BLOCK for u in blocks.values()) / len(blocks) if blocks else None
+        states = [w.state for w in self.watched.values()]
+        missing = states.count("missing")
+        never_seen = sum(1 for w in self.watched.values() if w.state == "missing" and not w.seen)
+        peak_pending = max(pending, default=None)
+        mean_pending = sum(pending) / len(pending) if pending else None
+
+        if self.evictions or missing:
+            bottleneck = "evictions"
+        elif full_share is not None and full_share >= 0.5:
+            bottleneck = "gasLimit"
+        elif mean_pending is not None and mean_pending < 1:
+            bottleneck = "submission"
+        else:
+            bottleneck = "none"
+        return {
+            "samples": len(self.rows),
+            "durationSec": self.rows[-1]["t"] if self.rows else 0,
+            "peakPending": peak_pending,
+            "meanPending": mean_pending,
+            "peakQueued": max(queued, default=None),
+            "watched": len(states),
+            "mined": states.count("mined"),
+            "evictions": self.evictions,
+            "missing": missing,
+            "neverSeen": never_seen,
+            "submitSec": self.last_submit - self.first_submit if self.first_submit else None,
+            "drainSec": self.drained_at - self.last_submit if self.drained_at and self.last_submit else None,
+            "fullBlockShare": full_share,
+            "bottleneck": bottleneck,
+        }
+
+def print_summary(s):
+    fmt = lambda v: "n/a" if v is None else (f"{v:.2f}" if isinstance(v, float) else str(v))
+    pct = lambda v: "n/a" if v is None else f"{v * 100:.2f}%"
+    print("======== TXPOOL ========")
+    print(f"Samples: {s['samples']} over {fmt(s['durationSec'])} sec(s)")
+    print(f"Pool Pending: peak {fmt(s['peakPending'])}, mean {fmt(s['meanPending'])}; Queued: peak {fmt(s['peakQueued'])}")
+    print(f"Watched Txns: {s['watched']}, Mined {s['mined']}, Evicted {s['evictions']}, "
+          f"Missing {s['missing']} ({s['neverSeen']} never seen in pool)")
+    print(f"Submit Time: {fmt(s['submitSec'])} sec(s), Drain After Last Submit: {fmt(s['drainSec'])} sec(s)")
+    print(f"Full Blocks: {pct(s['fullBlockShare'])}")
+    print(f"Bottleneck: {s['bottleneck']}")
+    print("======== END ========")
@@ -0,0 +1,206 @@
+"""Vortex end-to-end report: announce-to-finalization latency, delay-window
+misses, verifier backlog and the gas of announce + submit against verifyProof.
+
+validator.js submits a proof's state while the head is announce + DELAY_BLOCKS - 1,
+so a StateSubmitted landing after announce + DELAY_BLOCKS is late and a proof
+without one by the end of the observed range is missed (expired), unless its
+window is still open at that point.
+
+Usage: python vortex_report.py [--from-block N] [--to-block M] [--sync] [--out-dir DIR]
+
+The standalone form reads proofs from the event index (event_indexer.py);
+the vortex benchmark scenario calls report() with the events of its run.
+"""
+import argparse
+import asyncio
+import csv
+import os
+
+from block_scanner import scan_range
+from percentiles import percentile
+from rpc_async import AsyncRpcClient
+
+# Blocks validator.js waits after ProofAnnounced before submitState (DELAY_BLOCKS)
+DELAY_BLOCKS = 3
+
+LATENCY_FIELDS = ["proofId", "announceBlock", "submitBlock", "latencyBlocks", "latencySec", "outcome"]
+BACKLOG_FIELDS = ["blockNumber", "timestamp", "announced", "submitted", "backlog", "expired"]
+
+def proof_rows(proofs, block_ts, delay_blocks=DELAY_BLOCKS, end_block=None):
+    """Per-proof latency rows; `proofs` are dicts with proof_id, announce_block, submit_block.
+
+    A proof without a submit whose window has not closed by end_block is "open", not missed.
+    """
+    rows = []
+    for p in sorted(proofs, key=lambda p: (p["announce_block"], p["proof_id"])):
+        announce, submit = p["announce_block"], p.get("submit_block")
+        still_open = end_block is not None and announce + delay_blocks >= end_block
+        row = {"proofId": p["proof_id"], "announceBlock": announce, "submitBlock": submit,
+               "latencyBlocks": None, "latencySec": None, "outcome": "open" if still_open else "missed"}
+        if submit is not None:
+            row["latencyBlocks"] = submit - announce
+            if announce in block_ts and submit in block_ts:
+                row["latencySec"] = block_ts[submit] - block_ts[announce]
+            row["outcome"] = "inWindow" if submit <= announce + delay_blocks else "late"
+        rows.append(row)
+    return rows
+
+def backlog_series(rows, blocks, delay_blocks=DELAY_BLOCKS):
+    """Per block: cumulative announced/submitted, proofs awaiting a submit, and proofs past their window."""
+    announced = sorted(r["announceBlock"] for r in rows)
+    submitted = sorted(r["submitBlock"] for r in rows if r["submitBlock"] is not None)
+    # A proof expires at announce + delay + 1 unless it was submitted by then
+    expiries = sorted(r["announceBlock"] + delay_blocks + 1 for r in rows
+                      if r["submitBlock"] is None or r["submitBlock"] > r["announceBlock"] + delay_blocks)
+    series, a, s, e = [], 0, 0, 0
+    for b in blocks:
+        n = b["number"]
+        while a < len(announced) and announced[a] <= n:
+            a += 1
+        while s < len(submitted) and submitted[s] <= n:
+            s += 1
+        while e < len(expiries) and expiries[e] <= n:
+            e += 1
+        series.append({"blockNumber": n, "timestamp": b["timestamp"], "announced": a,
+                       "submitted": s, "backlog": a - s, "expired": e})
+    return series
+
+def summarize_latency(rows, series):
+    blocks = [r["latencyBlocks"] for r in rows if r["latencyBlocks"] is not None]
+    secs = [r["latencySec"] for r in rows if r["latencySec"] is not None]
+    outcomes = {k: sum(r["outcome"] == k for r in rows) for k in ("inWindow", "late", "missed", "open")}
+    # Proofs whose window is still open have no outcome yet
+    decided = len(rows) - outcomes["open"]
+    return {
+        "proofs": len(rows),
+        "inWindow": outcomes["inWindow"],
+        "late": outcomes["late"],
+        "missed": outcomes["missed"],
+        "open": outcomes["open"],
+        "missRate": (outcomes["late"] + outcomes["missed"]) / decided if decided else None,
+        "latencyBlocksP50": percentile(blocks, 0.5),
+        "latencyBlocksMax": max(blocks, default=None),
+        "latencySecMean": sum(secs) / len(secs) if secs else None,
+        "latencySecP50": percentile(secs, 0.5),
+        "latencySecP90": percentile(secs, 0.9),
+        "latencySecP99": percentile(secs, 0.99),
+        "latencySecMax": max(secs, default=None),
+        "maxBacklog": max((p["backlog"] for p in series), default=0),
+    }
+
+async def _receipt_gas(url, tx_hashes, batch_size=100):
+    out = {}
+    async with AsyncRpcClient(url) as client:
+        for k in range(0, len(tx_hashes), batch_size):
+            chunk = tx_hashes[k:k + batch_size]
+            results = await client.batch([("eth_getTransactionReceipt", [h]) for h in chunk])
+            for h, (rc, _) in zip(chunk, results):
+                if rc is not None:
+                    out[h] = int(rc["gasUsed"], 16)
+    return out
+
+def receipt_gas(url, tx_hashes):
+    """{tx_hash: gasUsed} for the given hashes, fetched in JSON-RPC batches."""
+    return asyncio.run(_receipt_gas(url, sorted(set(tx_hashes))))
+
+def gas_summary(proofs, gas_by_tx, verify_gas=None):
+    """Announce + submit gas of one proof, against verifyProof gas when known.
+
+    gasPerProof is the mean announce gas plus the mean submitState gas, so
+    missed proofs do not make the pair look cheaper or dearer. Several
+    proofs can share a transaction, so gas is summed per distinct tx.
+    """
+    announce = sum(gas_by_tx.get(h, 0) for h in {p["announce_tx"] for p in proofs})
+    submit_txs = {p["submit_tx"] for p in proofs if p.get("submit_tx")}
+    submit = sum(gas_by_tx.get(h, 0) for h in submit_txs)
+    finalized = sum(p.get("submit_block") is not None for p in proofs)
+    out = {
+        "announceGas": announce,
+        "submitStateGas": submit,
+        "gasPerProof": announce / len(proofs) + submit / finalized if finalized else None,
+        "verifyProofGas": verify_gas,
+    }
+    if verify_gas and out["gasPerProof"]:
+        out["gasVsVerifyProof"] = out["gasPerProof"] / verify_gas
+    return out
+
+def write_csv(path, fields, rows):
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=fields)
+        writer.writeheader()
+        writer.writerows(rows)
+
+def print_report(summary, delay_blocks=DELAY_BLOCKS):
+    fmt = lambda v, spec=".2f": "n/a" if v is None else format(v, spec)
+    print("======== VORTEX REPORT ========")
+    print(f"Proofs Announced: {summary['proofs']}")
+    print(f"State Submitted in Window (<= {delay_blocks} blocks): {summary['inWindow']}, "
+          f"Late: {summary['late']}, Missed: {summary['missed']}, Miss Rate: "
+          + ("n/a" if summary["missRate"] is None else f"{summary['missRate'] * 100:.2f}%"))
+    if summary["open"]:
+        print(f"Window Still Open at the Last Block: {summary['open']} (not counted)")
+    print(f"Latency (blocks): p50 {fmt(summary['latencyBlocksP50'], 'd')}, max {fmt(summary['latencyBlocksMax'], 'd')}")
+    print(f"Latency (sec): mean {fmt(summary['latencySecMean'])}, p50 {fmt(summary['latencySecP50'])}, "
+          f"p90 {fmt(summary['latencySecP90'])}, p99 {fmt(summary['latencySecP99'])}, max {fmt(summary['latencySecMax'])}")
+    print(f"Max Verifier Backlog: {summary['maxBacklog']} proof(s)")
+    print(f"Gas: announce {summary['announceGas']}, submitState {summary['submitStateGas']}, "
+          f"per proof (announce + submit) {fmt(summary['gasPerProof'], '.0f')}")
+    if summary.get("verifyProofGas"):
+        print(f"Gas per Proof vs verifyProof ({summary['verifyProofGas']}): {fmt(summary.get('gasVsVerifyProof'))}x")
+    print("======== END ========")
+
+def report(url, proofs, start_block, end_block, out_dir, cache_path=None, verify_gas=None, delay_blocks=DELAY_BLOCKS):
+    """Write vortex_latency.csv / vortex_backlog.csv to out_dir, print and return the summary.
+
+    `proofs` are dicts with proof_id, announce_block, announce_tx, submit_block
+    and submit_tx (submit_* None when no StateSubmitted was seen).
+    """
+    blocks, _ = scan_range(url, start_block, end_block, cache_path)
+    block_ts = {b["number"]: b["timestamp"] for b in blocks}
+    rows = proof_rows(proofs, block_ts, delay_blocks, end_block)
+    series = backlog_series(rows, blocks, delay_blocks)
+    summary = summarize_latency(rows, series)
+    tx_hashes = [p["announce_tx"] for p in proofs] + [p["submit_tx"] for p in proofs if p.get("submit_tx")]
+    summary.update(gas_summary(proofs, receipt_gas(url, tx_hashes), verify_gas))
+    os.makedirs(out_dir, exist_ok=True)
+    write_csv(os.path.join(out_dir, "vortex_latency.csv"), LATENCY_FIELDS, rows)
+    write_csv(os.path.join(out_dir, "vortex_backlog.csv"), BACKLOG_FIELDS, series)
+    print_report(summary, delay_blocks)
+    return summary
+
+def main():
+    parser = argparse.ArgumentParser(description="Vortex announce-to-finalization report from the event index")
+    parser.add_argument("--db", default=None, help="event index (default EVENT_DB or READINGS_DIR/events.db)")
+    parser.add_argument("--from-block", type=int, default=None, help="first announce block (default: oldest indexed)")
+    parser.add_argument("--to-block", type=int, default=None, help="last block observed (default: index cursor)")
+    parser.add_argument("--sync", action="store_true", help="bring the index up to the head first")
+    parser.add_argument("--delay-blocks", type=int, default=DELAY_BLOCKS)
+    parser.add_argument("--verify-gas", type=int, default=None, help="verifyProof gas to compare against")
+    parser.add_argument("--out-dir", default=None)
+    args = parser.parse_args()
+
+    from event_indexer import EventIndex, Indexer, default_db_path
+    readings_dir = os.getenv("READINGS_DIR") or "."
+    url = os.getenv("RPC_URL")
+    with EventIndex(args.db or default_db_path(readings_dir)) as index:
+        if args.sync:
+            Indexer(index, url, os.getenv("VORTEX_CONTRACT_ADDRESS"),
+                    int(os.getenv("EVENT_START_BLOCK") or 0)).sync()
+        cursor = index.cursor()
+        if cursor is None:
+            raise SystemExit("Event index is empty; run event_indexer.py sync first")
+        end = args.to_block if args.to_block is not None else cursor[0]
+        proofs = [p for p in index.proofs(from_block=args.from_block)
+                  if p["announce_block"] is not None and p["announce_block"] <= end]
+    if not proofs:
+        raise SystemExit("No announced proofs in range")
+    for p in proofs:
+        if p["submit_block"] is not None and p["submit_block"] > end:
+            p["submit_block"] = p["submit_tx"] = None
+    start = proofs[0]["announce_block"]
+    report(url, proofs, start, end, args.out_dir or readings_dir, None, args.verify_gas, args.delay_blocks)
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+    load_dotenv("../.env")
+    main()
@@ -0,0 +1,216 @@
+"""In-process witness calculation for circom 2 circuits.
+
+Python port of the `witness_calculator.js` that circom emits next to every
+`{CIRCUIT_NAME}_js/{CIRCUIT_NAME}.wasm`. The wasm module is compiled and
+instantiated once through wasmtime and then reused for every input, so no
+`node` process, `input.json` or `witness.wtns` file is needed per proof.
+"""
+import struct
+
+try:
+    import wasmtime
+except ImportError:  # pragma: no cover - optional dependency
+    wasmtime = None
+
+FNV_OFFSET = 0xCBF29CE484222325
+FNV_PRIME = 0x100000001B3
+MASK64 = (1 << 64) - 1
+
+EXCEPTIONS = {
+    1: "Signal not found.",
+    2: "Too many signals set.",
+    3: "Signal already set.",
+    4: "Assert Failed.",
+    5: "Not enough memory.",
+    6: "Input signal array access exceeds the size.",
+}
+
+class WitnessError(Exception):
+    pass
+
+def fnv_hash(name):
+    """64-bit FNV-1a of a signal name, split into the (msb, lsb) words circom expects."""
+    h = FNV_OFFSET
+    for ch in name:
+        h ^= ord(ch)
+        h = (h * FNV_PRIME) & MASK64
+    return h >> 32, h & 0xFFFFFFFF
+
+def to_i32(v):
+    """Reinterpret an unsigned 32-bit word as the signed i32 wasm expects."""
+    return v - (1 << 32) if v & 0x80000000 else v
+
+def to_int(v):
+    if isinstance(v, bool):
+        return int(v)
+    if isinstance(v, int):
+        return v
+    s = str(v).strip()
+    if s.lower().startswith(("0x", "-0x")):
+        return int(s, 16)
+    return int(s)
+
+def flatten(v):
+    if isinstance(v, (list, tuple)):
+        out = []
+        for x in v:
+            out.extend(flatten(x))
+        return out
+    return [v]
+
+def qualify_input(inp, prefix=""):
+    """Flatten nested input objects into {"a.b.c": values} like witness_calculator.js."""
+    out = {}
+    for k, v in inp.items():
+        name = f"{prefix}.{k}" if prefix else k
+        if isinstance(v, dict):
+            out.update(qualify_input(v, name))
+        else:
+            out[name] = v
+    return out
+
+class WitnessCalculator:
+    """Compute witnesses for one circuit wasm; build once, call many times."""
+
+    def __init__(self, wasm_path, sanity_check=False):
+        if wasmtime is None:
+            raise WitnessError("wasmtime is required for in-process witness calculation (pip install wasmtime)")
+        self.sanity_check = sanity_check
+        self._error = None
+        self._messages = []
+        engine = wasmtime.Engine()
+        self.store = wasmtime.Store(engine)
+        with open(wasm_path, "rb") as f:
+            module = wasmtime.Module(engine, f.read())
+
+        handlers = {
+            "exceptionHandler": self._exception_handler,
+            "printErrorMessage": self._print_error_message,
+            "writeBufferMessage": self._write_buffer_message,
+            "showSharedRWMemory": lambda *args: None,
+        }
+        imports = []
+        for imp in module.imports:
+            if isinstance(imp.type, wasmtime.MemoryType):
+                imports.append(wasmtime.Memory(self.store, imp.type))
+                continue
+            handler = handlers.get(imp.name, lambda *args: None)
+            imports.append(wasmtime.Func(self.store, imp.type, handler))
+        instance = wasmtime.Instance(self.store, module, imports)
+        exports = instance.exports(self.store)
+        self._fn = {
+            name: exports[name]
+            for name in (
+                "getVersion", "getFieldNumLen32", "getRawPrime", "readSharedRWMemory",
+                "writeSharedRWMemory", "getWitnessSize", "getInputSize", "init",
+                "getInputSignalSize", "setInputSignal", "getWitness", "getMessageChar",
+            )
+        }
+
+        self.version = self._call("getVersion")
+        self.n32 = self._call("getFieldNumLen32")
+        self._call("getRawPrime")
+        self.prime = self._read_shared()
+        self.witness_size = self._call("getWitnessSize")
+        self.input_size = self._call("getInputSize")
+        self._signal_cache = {}
+
+    # ─── wasm plumbing ──────────────────────────────────────────────────────
+    def _call(self, name, *args):
+        try:
+            return self._fn[name](self.store, *args)
+        except Exception as e:
+            err, self._error = self._error, None
+            raise WitnessError(err or str(e)) from None
+
+    def _message(self):
+        chars = []
+        c = self._call("getMessageChar")
+        while c != 0:
+            chars.append(chr(c))
+            c = self._call("getMessageChar")
+        return "".join(chars)
+
+    def _exception_handler(self, code):
+        self._error = EXCEPTIONS.get(code, "Unknown error.") + "\n" + "".join(self._messages)
+        raise RuntimeError(self._error)
+
+    def _print_error_message(self):
+        self._messages.append(self._message() + "\n")
+
+    def _write_buffer_message(self):
+        msg = self._message()
+        if msg:
+            print(msg)
+
+    def _read_shared(self):
+        read = self._fn["readSharedRWMemory"]
+        v = 0
+        for j in reversed(range(self.n32)):
+            v = (v << 32) | (read(self.store, j) & 0xFFFFFFFF)
+        return v
+
+    def _write_shared(self, v):
+        write = self._fn["writeSharedRWMemory"]
+        for j in range(self.n32):
+            write(self.store, j, to_i32((v >> (32 * j)) & 0xFFFFFFFF))
+
+    # ─── witness calculation ────────────────────────────────────────────────
+    def _signal(self, name):
+        sig = self._signal_cache.get(name)
+        if sig is None:
+            msb, lsb = (to_i32(w) for w in fnv_hash(name))
+            size = self._call("getInputSignalSize", msb, lsb)
+            if size < 0:
+                raise WitnessError(f"Signal {name} not found")
+            sig = self._signal_cache[name] = (msb, lsb, size)
+        return sig
+
+    def _set_inputs(self, inp):
+        self._messages = []
+        self._call("init", 1 if self.sanity_check else 0)
+        count = 0
+        for name, value in qualify_input(inp).items():
+            msb, lsb, size = self._signal(name)
+            values = flatten(value)
+            if len(values) < size:
+                raise WitnessError(f"Not enough values for input signal {name}")
+            if len(values) > size:
+                raise WitnessError(f"Too many values for input signal {name}")
+            for i, v in enumerate(values):
+                self._write_shared(to_int(v) % self.prime)
+                self._call("setInputSignal", msb, lsb, i)
+                count += 1
+        if count < self.input_size:
+            raise WitnessError(f"Not all inputs have been set. Only {count} out of {self.input_size}")
+
+    def calculate_witness(self, inp):
+        """Return the full witness for one input as a list of field elements."""
+        self._set_inputs(inp)
+        out = []
+        for i in range(self.witness_size):
+            self._call("getWitness", i)
+            out.append(self._read_shared())
+        return out
+
+    def calculate_wtns_bin(self, inp):
+        """Return the witness for one input as the bytes of a snarkjs `.wtns` file."""
+        self._set_inputs(inp)
+        n8 = self.n32 * 4
+        read = self._fn["readSharedRWMemory"]
+        buff = bytearray()
+        buff += b"wtns"
+        buff += struct.pack("<II", 2, 2)                    # version, number of sections
+        buff += struct.pack("<IQ", 1, 8 + n8)               # section 1: header
+        buff += struct.pack("<I", n8) + self.prime.to_bytes(n8, "little")
+        buff += struct.pack("<I", self.witness_size)
+        buff += struct.pack("<IQ", 2, n8 * self.witness_size)  # section 2: witness
+        words = struct.Struct(f"<{self.n32}I")
+        for i in range(self.witness_size):
+            self._call("getWitness", i)
+            buff += words.pack(*(read(self.store, j) & 0xFFFFFFFF for j in range(self.n32)))
+        return bytes(buff)
+
+    def calculate_wtns_batch(self, inputs):
+        """Return `.wtns` bytes for each input, reusing the same wasm instance."""
+        return [self.calculate_wtns_bin(inp) for inp in inputs]